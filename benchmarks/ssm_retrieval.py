@@ -0,0 +1,124 @@
+"""
+SSM retrieval benchmark against a stubbed client.
+
+Compares the original describe + one `get_parameter` per key loop with the
+`batch` and `path` strategies of `list_parameters`, reporting API calls and
+wall time for a simulated per-call latency.
+
+    python benchmarks/ssm_retrieval.py --parameters 80 --latency-ms 30
+"""
+
+import argparse
+import threading
+import time
+from collections import Counter
+
+from infrazeus.parameters.list import list_parameters
+from infrazeus.schema import Service
+
+
+class StubSSM:
+    def __init__(self, parameters: dict[str, str], latency: float):
+        self.parameters = parameters
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _call(self, operation: str):
+        with self._lock:
+            self.calls[operation] += 1
+        time.sleep(self.latency)
+
+    @staticmethod
+    def _page(items: list, token: str | None, size: int):
+        start = int(token or 0)
+        end = start + size
+        return items[start:end], (str(end) if end < len(items) else None)
+
+    def _matching(self, prefix: str) -> list[str]:
+        return [name for name in self.parameters if name.startswith(prefix)]
+
+    def describe_parameters(self, ParameterFilters, MaxResults=50, NextToken=None):
+        self._call("describe_parameters")
+        prefix = ParameterFilters[0]["Values"][0]
+        names, token = self._page(self._matching(prefix), NextToken, MaxResults)
+        page = {"Parameters": [{"Name": name} for name in names]}
+        if token:
+            page["NextToken"] = token
+        return page
+
+    def get_parameter(self, Name, WithDecryption=False):
+        self._call("get_parameter")
+        return {"Parameter": {"Name": Name, "Value": self.parameters[Name]}}
+
+    def get_parameters(self, Names, WithDecryption=False):
+        self._call("get_parameters")
+        assert len(Names) <= 10
+        return {"Parameters": [{"Name": n, "Value": self.parameters[n]} for n in Names]}
+
+    def get_parameters_by_path(
+        self, Path, Recursive=False, WithDecryption=False, NextToken=None
+    ):
+        self._call("get_parameters_by_path")
+        names, token = self._page(self._matching(Path), NextToken, 10)
+        page = {"Parameters": [{"Name": n, "Value": self.parameters[n]} for n in names]}
+        if token:
+            page["NextToken"] = token
+        return page
+
+
+def legacy_list_parameters(client, prefix: str) -> dict[str, str]:
+    # Behaviour of list_parameters before the batched retrieval
+    content = {}
+    kwargs = {
+        "ParameterFilters": [
+            {"Key": "Name", "Option": "BeginsWith", "Values": [prefix]}
+        ]
+    }
+    while True:
+        page = client.describe_parameters(**kwargs)
+        for param in page["Parameters"]:
+            _, _, key = param["Name"].rpartition("/")
+            response = client.get_parameter(Name=param["Name"], WithDecryption=True)
+            content[key] = response["Parameter"]["Value"]
+        if not page.get("NextToken"):
+            return content
+        kwargs["NextToken"] = page["NextToken"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--parameters", type=int, default=80)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    opts = parser.parse_args()
+
+    service = Service(
+        account_id="000000000000",
+        region="us-east-1",
+        service_name="benchmark",
+        environment="beta",
+    )
+    prefix = f"/{service.environment}/{service.normalized_name}/"
+    parameters = {f"{prefix}VAR_{i}": f"value-{i}" for i in range(opts.parameters)}
+    latency = opts.latency_ms / 1000
+
+    runs = {
+        "legacy": lambda client: legacy_list_parameters(client, prefix),
+        "batch": lambda client: list_parameters(service, client=client),
+        "path": lambda client: list_parameters(service, strategy="path", client=client),
+    }
+    expected = None
+    print(f"{'strategy':<10}{'calls':>8}{'wall ms':>10}  breakdown")
+    for name, run in runs.items():
+        client = StubSSM(parameters, latency)
+        start = time.perf_counter()
+        result = run(client)
+        wall_ms = (time.perf_counter() - start) * 1000
+        expected = expected or result
+        assert result == expected, f"{name} returned a different result"
+        calls = sum(client.calls.values())
+        print(f"{name:<10}{calls:>8}{wall_ms:>10.1f}  {dict(client.calls)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Startup benchmark for the infrazeus CLI.
+
+Runs each subcommand's `--help` in a fresh interpreter with `-X importtime` and
+reports the wall time, the cumulative import time and whether boto3 got loaded.
+
+    python benchmarks/startup.py --runs 5 --budget-ms 400
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = [
+    [],
+    ["ecr"],
+    ["ecr", "create"],
+    ["ecr", "configure"],
+    ["ecr", "list"],
+    ["ecr", "check"],
+    ["ecs"],
+    ["ecs", "create"],
+    ["ecs", "update"],
+    ["ecs", "prune"],
+    ["alb"],
+    ["alb", "create"],
+    ["parameters"],
+    ["parameters", "create"],
+    ["parameters", "sync"],
+    ["fleet"],
+    ["fleet", "deploy"],
+    ["cache"],
+    ["cache", "refresh"],
+    ["cache", "stats"],
+    ["cache", "clear"],
+    ["workflow"],
+]
+
+# `import time: self [us] | cumulative | imported package`
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S+)")
+
+
+def measure(args: list[str]) -> tuple[float, float, bool]:
+    cmd = [sys.executable, "-X", "importtime", "-m", "infrazeus", *args, "--help"]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{proc.stderr[-2000:]}")
+
+    import_us = 0
+    boto3_loaded = False
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, package = match.group(2), match.group(3), match.group(4)
+        # Only top-level imports, nested ones are included in their cumulative time
+        if not indent:
+            import_us += int(cumulative)
+        if package == "boto3":
+            boto3_loaded = True
+    return wall_ms, import_us / 1000, boto3_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail if the median wall time of any subcommand exceeds this budget",
+    )
+    opts = parser.parse_args()
+
+    failed = False
+    print(f"{'command':<28}{'wall ms':>10}{'import ms':>12}  boto3")
+    for args in COMMANDS:
+        samples = [measure(args) for _ in range(opts.runs)]
+        wall = statistics.median(s[0] for s in samples)
+        imports = statistics.median(s[1] for s in samples)
+        boto3_loaded = any(s[2] for s in samples)
+        label = " ".join(["infrazeus", *args])
+        print(f"{label:<28}{wall:>10.1f}{imports:>12.1f}  {boto3_loaded}")
+        if boto3_loaded:
+            failed = True
+        if opts.budget_ms is not None and wall > opts.budget_ms:
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
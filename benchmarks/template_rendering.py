@@ -0,0 +1,100 @@
+"""
+Bulk ECS template rendering benchmark.
+
+Renders the BOTH build (head, task definition and ECS service) of many services
+in one process. It compares the legacy dict merging, which has to deep copy
+ECS_TEMPLATE to stay safe, with the template builder, which shares a frozen base.
+Each template is also fingerprinted, as create/update do.
+
+    python benchmarks/template_rendering.py --services 500 --variables 40
+"""
+
+import argparse
+import copy
+import time
+
+from infrazeus.aws.fingerprint import template_fingerprint
+from infrazeus.ecs import templates as t
+from infrazeus.schema import ECSService
+from infrazeus.template_builder import Template, thaw
+
+LEGACY_ECS_TEMPLATE = thaw(t.ECS_TEMPLATE)
+
+
+def service_inputs(count: int, variables: int) -> list[tuple]:
+    inputs = []
+    for i in range(count):
+        service = ECSService(
+            account_id="000000000000",
+            region="us-east-1",
+            service_name=f"service-{i}",
+            environment="beta",
+            cluster="benchmark",
+            vpc="vpc-0123456789",
+            domain=f"https://service-{i}.example.com",
+            port=443,
+            protocol="HTTPS",
+            container_port=80,
+            memory=1024,
+            cpu=512,
+        )
+        parameters = {f"VAR_{j}": f"value-{i}-{j}" for j in range(variables)}
+        secrets = {f"SECRET_{j}": "" for j in range(variables // 4)}
+        inputs.append((service, parameters, secrets))
+    return inputs
+
+
+def head(service: ECSService) -> dict:
+    return t.get_template_head(
+        service=service,
+        target_group_arn="arn:aws:elasticloadbalancing:tg",
+        security_group_ids=["sg-0123"],
+        subnets=["subnet-a", "subnet-b"],
+        ecr_image_arn=service.ecr_image_path,
+    )
+
+
+def render_legacy(service, parameters, secrets) -> dict:
+    template = head(service)
+    task_definition = t.get_task_definition_template(service, secrets, parameters)
+    ecs_template = copy.deepcopy(LEGACY_ECS_TEMPLATE)
+    template["Resources"] = task_definition["Resources"]
+    template["Resources"].update(ecs_template["Resources"])
+    template["Outputs"] = task_definition["Outputs"]
+    template["Outputs"].update(ecs_template["Outputs"])
+    return template
+
+
+BASE = Template().add(t.ECS_TEMPLATE)
+
+
+def render_builder(service, parameters, secrets) -> dict:
+    task_definition = t.get_task_definition_template(service, secrets, parameters)
+    return BASE.add(head(service)).add(task_definition).render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--services", type=int, default=500)
+    parser.add_argument("--variables", type=int, default=40)
+    opts = parser.parse_args()
+
+    inputs = service_inputs(opts.services, opts.variables)
+    runs = {"legacy": render_legacy, "builder": render_builder}
+    fingerprints = {}
+    print(f"{'strategy':<10}{'render ms':>11}{'+hash ms':>10}{'per tpl ms':>12}")
+    for name, render in runs.items():
+        start = time.perf_counter()
+        templates = [render(*args) for args in inputs]
+        render_ms = (time.perf_counter() - start) * 1000
+        fingerprints[name] = [template_fingerprint(tpl) for tpl in templates]
+        total_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"{name:<10}{render_ms:>11.1f}{total_ms:>10.1f}"
+            f"{total_ms / len(inputs):>12.3f}"
+        )
+    assert fingerprints["legacy"] == fingerprints["builder"], "Templates differ"
+
+
+if __name__ == "__main__":
+    main()
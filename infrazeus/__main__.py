@@ -1,29 +1,131 @@
+import sys
+import time
 from pathlib import Path
+from typing import NoReturn, Optional
 
 import rich
 import typer
 from loguru import logger
 
-from .alb.controller import create_alb, reuse_alb
-from .aws.helper import list_stack, subnet_ids_for_vpc
-from .cli_out import lightning_decorator, print_stack_outputs
-from .ecr.controller import create_ecr, list_ecr
-from .ecs import create
-from .ecs.create import ECSBuilds
-from .parameters.create import create_parameters, create_secret, detect_secrets_with_ai
-from .parameters.env_handler import load_env_to_dict
-from .parameters.list import list_parameters, list_secrets
-from .schema import ALBService, ECSService, Service
+from .cli_out import (
+    lightning_decorator,
+    print_aws_stats,
+    print_change_set,
+    print_fleet_summary,
+    print_stack_event,
+    print_stack_outputs,
+    print_stack_wait_report,
+)
+from .ecs.builds import ECSBuilds
+from .output import OutputFormat, configure_output, emit, get_writer
+
+# Controllers (and boto3 through them) are imported inside each command so that
+# `infrazeus --help` and friends only pay for what they actually run.
 
 logger.level("INFO")
 
-# Apply the decorator to the rich.print method of the rich console
-rich.print = lightning_decorator(n=1)(rich.print)
-
-rich.print("Welcome to Infrazeus!")
+_rich_print = rich.print
 
 app = typer.Typer()
 
+WAIT_HELP = "Wait for the stack to finish, streaming its events"
+IMAGE_CHECK_HELP = "Do not check that the docker_tag image exists in ECR first"
+
+
+def show_templates() -> bool:
+    # Templates are part of the JSON/YAML results, rich would only slow them down
+    writer = get_writer()
+    return not (writer.machine or writer.quiet)
+
+
+def stack_result(stack_name: str, response: Optional[dict], dry_run: bool) -> dict:
+    response = response or {}
+    status = "created"
+    if dry_run:
+        status = "dry-run"
+    elif response.get("Unchanged"):
+        status = "unchanged"
+    return {
+        "stack_name": stack_name,
+        "stack_id": response.get("StackId"),
+        "status": status,
+        "template": response.get("Template"),
+    }
+
+
+def fail(command: str, error: str, **result) -> NoReturn:
+    """
+    Log the error, emit the command's `ok: false` envelope and exit with code 1.
+    """
+    logger.error(error)
+    emit(command, {**result, "error": error}, ok=False)
+    raise typer.Exit(code=1)
+
+
+def wait_for_stack_ids(stack_ids: list[str], last_event_ids: Optional[dict] = None):
+    from .aws.waiter import StackWatch, wait_for_stacks
+
+    last_event_ids = last_event_ids or {}
+    results = wait_for_stacks(
+        [
+            StackWatch(stack_id, last_event_id=last_event_ids.get(stack_id))
+            for stack_id in stack_ids
+        ],
+        on_event=print_stack_event,
+    )
+    print_stack_wait_report(results)
+    succeeded = all(result.succeeded for result in results)
+    emit("stack wait", results, ok=succeeded)
+    if not succeeded:
+        raise typer.Exit(code=1)
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    aws_stats: bool = typer.Option(
+        False, "--aws-stats", help="Print AWS client/connection counters on exit"
+    ),
+    inventory: bool = typer.Option(
+        False,
+        "--inventory",
+        envvar="INFRAZEUS_INVENTORY",
+        help="Serve AWS lookups from the local inventory cache while fresh",
+    ),
+    output: OutputFormat = typer.Option(
+        OutputFormat.TEXT.value, "--output", help="Format of the command results"
+    ),
+    out_file: Path = typer.Option(
+        None, "--out-file", help="Write the command results to this file"
+    ),
+    quiet: bool = typer.Option(
+        False, "--quiet", "-q", help="Only write the command results, without rich"
+    ),
+):
+    writer = configure_output(output, out_file, quiet)
+    ctx.call_on_close(writer.close)
+
+    if quiet:
+        rich.print = lambda *args, **kwargs: None
+    elif writer.machine and writer.to_stdout:
+        # Keep stdout for the results
+        rich.print = lightning_decorator(n=1)(
+            lambda *args, **kwargs: _rich_print(*args, file=sys.stderr, **kwargs)
+        )
+    else:
+        # Apply the decorator to the rich.print method of the rich console
+        rich.print = lightning_decorator(n=1)(_rich_print)
+    rich.print("Welcome to Infrazeus!")
+
+    if aws_stats:
+        ctx.call_on_close(print_aws_stats)
+
+    if inventory:
+        from .inventory import enable_inventory
+
+        enable_inventory()
+
+
 ecr_app = typer.Typer()
 app.add_typer(ecr_app, name="ecr")
 
@@ -33,9 +135,64 @@ def ecr_create(file: str = typer.Option(..., "--file", "-f", help="Path to the f
     """
     Create an ECR repository from a file specification.
     """
+    from botocore.exceptions import ClientError
+
+    from .ecr.controller import create_ecr
+    from .ecr.policies import configure_ecr
+    from .schema import Service
+
     rich.print(f"ECR create with file: {file}")
     service = Service.from_path(file)
-    create_ecr(service)  # Assuming create_ecr is defined elsewhere
+    response = create_ecr(service)  # Assuming create_ecr is defined elsewhere
+    settings = None
+    try:
+        # Also brings an already existing repository up to the spec
+        settings = configure_ecr(service)
+    except ClientError as e:
+        logger.error(f"Could not apply the ECR settings: {e}")
+    status = "failed"
+    if response is not None:
+        status = "exists" if response.get("AlreadyExists") else "created"
+    emit(
+        "ecr create",
+        {
+            "repository_name": service.canonical_name,
+            "status": status,
+            "repository": (response or {}).get("repository"),
+            "settings": settings,
+        },
+        ok=response is not None and settings is not None,
+    )
+
+
+@ecr_app.command("configure")
+def ecr_configure(
+    file: str = typer.Option(..., "--file", "-f", help="Path to the file")
+):
+    """
+    Apply the replication, lifecycle and scan on push settings of the spec.
+    """
+    from botocore.exceptions import ClientError
+
+    from .ecr.policies import configure_ecr
+    from .schema import Service
+
+    service = Service.from_path(file)
+    try:
+        settings = configure_ecr(service)
+    except ClientError as e:
+        fail(
+            "ecr configure",
+            f"Could not apply the ECR settings: {e}",
+            repository=service.canonical_name,
+        )
+
+    rich.print(
+        f"{settings.repository}: scan on push {settings.scan_on_push}, "
+        f"lifecycle policy {settings.lifecycle_policy}, "
+        f"replication {settings.replication}"
+    )
+    emit("ecr configure", settings)
 
 
 @ecr_app.command("list")
@@ -48,6 +205,9 @@ def ecr_list(
     """
     List all ECR repositories.
     """
+    from .ecr.controller import list_ecr
+    from .schema import Service
+
     repos = []
     if file:
         service = Service.from_path(file)
@@ -58,6 +218,36 @@ def ecr_list(
         repos = list_ecr(name_contains=name_contains)
 
     rich.print("Repos found:", repos)
+    emit("ecr list", repos)
+
+
+@ecr_app.command("check")
+def ecr_check(
+    target: str = typer.Argument(
+        ..., help="Directory of service specs, a glob or a single spec file"
+    ),
+):
+    """
+    Check that the docker_tag image of every service exists in ECR.
+    """
+    from .ecr.images import check_image_tags
+    from .fleet import find_specs, load_fleet
+
+    loaded, failures = load_fleet(find_specs(target))
+    for failure in failures:
+        logger.error(f"Skipping {failure.spec}: {failure.error}")
+    if not loaded:
+        fail("ecr check", f"No service specs found for: {target}")
+
+    checks = check_image_tags([service for _, service in loaded])
+    for check in checks:
+        style = "green" if check.ok else "red"
+        rich.print(f"{check.image}: [{style}]{check.status}[/{style}]")
+
+    check_failed = bool(failures) or not all(check.ok for check in checks)
+    emit("ecr check", checks, ok=not check_failed)
+    if check_failed:
+        raise typer.Exit(code=1)
 
 
 ecs_app = typer.Typer()
@@ -81,26 +271,46 @@ def ecs_create(
         "-s",
         help="Suffix to concat to the auto stack name",
     ),
+    wait: bool = typer.Option(False, "--wait", "-w", help=WAIT_HELP),
+    skip_image_check: bool = typer.Option(
+        False, "--skip-image-check", help=IMAGE_CHECK_HELP
+    ),
 ):
     """
     Create ECS command.
     """
+    from .aws.template_delivery import TemplateTooLargeError
+    from .ecs import create
+    from .schema import ECSService
 
     service = ECSService.from_path(file)
     rich.print(service)
     rich.print(build)
-    create.main_create_ens(
-        service=service,
-        alb_name=alb_name,
-        build=build,
-        verbose=verbose,
-        dry_run=dry_run,
-        stack_sufix=stack_suffix,
-    )
+    try:
+        response = create.main_create_ens(
+            service=service,
+            alb_name=alb_name,
+            build=build,
+            verbose=verbose,
+            dry_run=dry_run,
+            stack_sufix=stack_suffix,
+            show_template=show_templates(),
+            check_image=not skip_image_check,
+        )
+    except (create.ECSDeployError, TemplateTooLargeError) as e:
+        fail("ecs create", str(e), stack_name=service.stack_name(suffix=stack_suffix))
 
     rich.print(
         f"ECS create with file: {file}, build: {build}, alb_name: {alb_name}, dry_run: {dry_run}"
     )
+    emit(
+        "ecs create",
+        stack_result(service.stack_name(suffix=stack_suffix), response, dry_run),
+    )
+    if response and response.get("Unchanged"):
+        rich.print("Stack is up to date (same template), nothing to deploy")
+    elif wait and response:
+        wait_for_stack_ids([response["StackId"]])
 
 
 @ecs_app.command("describe_stack")
@@ -117,19 +327,154 @@ def ecs_describe_stack(
     """
     Create ECS command.
     """
+    from .aws.helper import list_stack
+    from .schema import ECSService
+
     service = ECSService.from_path(file)
     stack_name = service.stack_name(suffix=stack_suffix)
     rich.print(f"Describe stack: {stack_name}")
     stack_out = list_stack(stack_name)
     print_stack_outputs(stack_out, verbose)
+    emit("ecs describe_stack", stack_out.get("Stacks", []))
 
 
 @ecs_app.command("update")
-def ecs_update(file: str = typer.Option(..., "--file", "-f", help="Path to the file")):
+def ecs_update(
+    file: str = typer.Option(..., "--file", "-f", help="Path to the file"),
+    build: ECSBuilds = typer.Option(
+        ECSBuilds.BOTH.value, "--build", "-b", help="Specify the build process"
+    ),
+    alb_name: str = typer.Option(None, "--alb-name", "-a", help="Specify the ALB name"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only show the changes, without executing them"
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    stack_suffix: str = typer.Option(
+        None,
+        "--stack-name-suffix",
+        "-s",
+        help="Suffix to concat to the auto stack name",
+    ),
+    wait: bool = typer.Option(False, "--wait", "-w", help=WAIT_HELP),
+    skip_image_check: bool = typer.Option(
+        False, "--skip-image-check", help=IMAGE_CHECK_HELP
+    ),
+):
+    """
+    Update ECS command: apply a change set, skipped when nothing changed.
+    """
+    from .aws.changesets import ChangeSetError
+    from .aws.template_delivery import TemplateTooLargeError
+    from .ecs import create
+    from .schema import ECSService
+
+    service = ECSService.from_path(file)
+    stack_name = service.stack_name(suffix=stack_suffix)
+    last_event_id = None
+
+    try:
+        if wait and not dry_run:
+            from botocore.exceptions import ClientError
+
+            from .aws.waiter import latest_event_id
+
+            try:
+                last_event_id = latest_event_id(stack_name)
+            except ClientError as e:
+                raise ChangeSetError(
+                    f"Could not read the events of {stack_name}: {e}"
+                ) from e
+
+        result = create.main_update_ens(
+            service=service,
+            alb_name=alb_name,
+            build=build,
+            verbose=verbose,
+            dry_run=dry_run,
+            stack_sufix=stack_suffix,
+            check_image=not skip_image_check,
+        )
+    except (create.ECSDeployError, ChangeSetError, TemplateTooLargeError) as e:
+        fail("ecs update", str(e), stack_name=stack_name)
+
+    print_change_set(result)
+    emit("ecs update", result)
+    if result.executed:
+        rich.print(f"Executing change set {result.change_set_name} on {stack_name}")
+        if wait:
+            wait_for_stack_ids(
+                [result.stack_id or stack_name],
+                {result.stack_id or stack_name: last_event_id},
+            )
+
+
+@ecs_app.command("prune")
+def ecs_prune(
+    file: str = typer.Option(None, "--file", "-f", help="Path to the file"),
+    fleet: str = typer.Option(
+        None,
+        "--fleet",
+        help="Prune every service of a directory of specs, a glob or a spec file",
+    ),
+    keep: int = typer.Option(
+        None, "--keep", "-k", help="Newest revisions to keep per family"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Only list the revisions that would be deregistered"
+    ),
+    tps: float = typer.Option(
+        None, "--tps", help="Maximum DeregisterTaskDefinition calls per second"
+    ),
+    concurrency: int = typer.Option(
+        8, "--concurrency", "-c", help="Maximum number of calls in flight"
+    ),
+    clusters: list[str] = typer.Option(
+        None,
+        "--cluster",
+        help="Also keep the revisions used by services of this cluster",
+    ),
+    all_clusters: bool = typer.Option(
+        False,
+        "--all-clusters",
+        help="Keep the revisions used by services of every cluster in the region",
+    ),
+):
     """
-    Update ECS command.
+    Deregister old task definition revisions, keeping the newest and those in use.
     """
-    rich.print("No supported yet. Sorry.")
+    from .cli_out import print_prune_summary
+    from .ecs.prune import DEFAULT_KEEP, ECS_DEREGISTER_TPS, prune_task_definitions
+    from .fleet import find_specs, load_fleet
+    from .schema import ECSService
+
+    if bool(file) == bool(fleet):
+        fail("ecs prune", "Inform either `--file` or `--fleet`")
+
+    if file:
+        services = [ECSService.from_path(file)]
+    else:
+        loaded, failures = load_fleet(find_specs(fleet))
+        for failure in failures:
+            logger.error(f"Skipping {failure.spec}: {failure.error}")
+        services = [service for _, service in loaded]
+    if not services:
+        fail("ecs prune", f"No service specs found for: {file or fleet}")
+
+    reports = prune_task_definitions(
+        services,
+        keep=keep or DEFAULT_KEEP,
+        dry_run=dry_run,
+        tps=tps or ECS_DEREGISTER_TPS,
+        max_workers=concurrency,
+        clusters=clusters,
+        all_clusters=all_clusters,
+    )
+    print_prune_summary(reports)
+
+    prune_failed = any(report.error or report.failed for report in reports)
+    emit("ecs prune", reports, ok=not prune_failed)
+    if prune_failed:
+        raise typer.Exit(code=1)
 
 
 alb_app = typer.Typer()
@@ -149,10 +494,17 @@ def alb_create(
         False, "--dry-run", help="Perform a dry run without applying changes"
     ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    wait: bool = typer.Option(False, "--wait", "-w", help=WAIT_HELP),
 ):
     """
     Create ALB command.
     """
+    from .alb.controller import create_alb
+    from .aws.certificates import CertificateNotFoundError
+    from .aws.helper import subnet_ids_for_vpc
+    from .aws.template_delivery import TemplateTooLargeError
+    from .schema import ALBService
+
     service = ALBService.from_path(file)
     subnets = subnet_ids_for_vpc(service.vpc, unique_availability_zones=True)
 
@@ -160,20 +512,29 @@ def alb_create(
     rich.print(f"Subnets available: {subnets}")
 
     if not subnets or len(subnets) < 2:
-        rich.print(
-            "ALB requires at least 2 subnets in different availability zones for VPC:",
-            service.vpc,
+        fail(
+            "alb create",
+            "ALB requires at least 2 subnets in different availability zones for "
+            f"VPC: {service.vpc}",
+            stack_name=service.stack_name(suffix),
         )
-        raise typer.Exit(code=1)
 
-    response = create_alb(
-        dry_run=dry_run,
-        subnets=subnets,
-        service=service,
-        stack_suffix=suffix,
-        verbose=verbose,
-    )
+    try:
+        response = create_alb(
+            dry_run=dry_run,
+            subnets=subnets,
+            service=service,
+            stack_suffix=suffix,
+            verbose=verbose,
+        )
+    except (CertificateNotFoundError, TemplateTooLargeError) as e:
+        fail("alb create", str(e), stack_name=service.stack_name(suffix))
     rich.print(f"Stack response: {response}")
+    emit("alb create", stack_result(service.stack_name(suffix), response, dry_run))
+    if response and response.get("Unchanged"):
+        rich.print("Stack is up to date (same template), nothing to deploy")
+    elif wait and response:
+        wait_for_stack_ids([response["StackId"]])
 
 
 @alb_app.command("reuse")
@@ -183,16 +544,31 @@ def alb_reuse(
     dry_run: bool = typer.Option(
         False, "--dry-run", help="Perform a dry run without applying changes"
     ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """
     Reuse ALB command.
     """
+    from .alb.controller import reuse_alb, reuse_stack_name
+    from .alb.resolver import ALBNotFoundError
+    from .aws.certificates import CertificateNotFoundError
+    from .aws.template_delivery import TemplateTooLargeError
+    from .schema import ALBService
+
     rich.print(f"ALB reuse with file: {file}, alb_name: {alb_name}, dry_run: {dry_run}")
     service = ALBService.from_path(file)
-    reuse_alb(
-        alb_name=alb_name,
-        dry_run=dry_run,
-        service=service,
+    try:
+        response = reuse_alb(
+            alb_name=alb_name,
+            dry_run=dry_run,
+            service=service,
+            verbose=verbose,
+        )
+    except (ALBNotFoundError, CertificateNotFoundError, TemplateTooLargeError) as e:
+        fail("alb reuse", str(e), stack_name=reuse_stack_name(service, alb_name))
+    emit(
+        "alb reuse",
+        stack_result(reuse_stack_name(service, alb_name), response, dry_run),
     )
 
 
@@ -212,11 +588,15 @@ def alb_describe_stack(
     """
     Reuse ALB command.
     """
+    from .aws.helper import list_stack
+    from .schema import ALBService
+
     service = ALBService.from_path(file)
     stack_name = service.stack_name(suffix=stack_suffix)
     rich.print(f"Describe stack: {stack_name}")
     stack_out = list_stack(stack_name)
     print_stack_outputs(stack_out, verbose)
+    emit("alb describe_stack", stack_out.get("Stacks", []))
 
 
 params_app = typer.Typer()
@@ -232,11 +612,25 @@ def parameters_create(
     secrets: list[str] = typer.Option(
         None, "--secrets", "-s", help="List of secret variables"
     ),
+    tps: float = typer.Option(
+        None, "--tps", help="Maximum SSM writes per second (defaults to the SSM quota)"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    explain: bool = typer.Option(
+        False, "--explain", help="Show why each variable is treated as a secret"
+    ),
 ):
     """
     Create parameters command.
     """
+    from .parameters.create import (
+        SSM_PUT_TPS,
+        create_parameters,
+        create_secret,
+        split_secret_vars,
+    )
+    from .parameters.env_handler import load_env_to_dict
+    from .schema import ECSService
 
     rich.print(
         f"Parameters create with file: {file}, env: {env} and secrets: {secrets}"
@@ -245,18 +639,10 @@ def parameters_create(
     service = ECSService.from_path(file)
     evn_vars = load_env_to_dict(env)
 
-    if not secrets or secrets is None:
-        secret_vars = detect_secrets_with_ai(evn_vars)
+    secret_vars, not_secret_vars = split_secret_vars(evn_vars, secrets)
+    if not secrets:
         rich.print(f"Auto secrets: {secret_vars}")
-    else:
-        secret_vars = {
-            secret: f"{evn_vars[secret]}" for secret in secrets if secret in evn_vars
-        }
-        missing_secrets = set(secrets) - set(secret_vars)
-        if missing_secrets:
-            logger.warning(f"Secrets informed not found in env vars: {missing_secrets}")
-
-    not_secret_vars = {var: evn_vars[var] for var in evn_vars if var not in secret_vars}
+    classification = explain_secrets(evn_vars, secret_vars) if explain else None
 
     if verbose:
         rich.print(f"Storing secrets: {secret_vars.keys()}")
@@ -265,23 +651,43 @@ def parameters_create(
     all_var_values = {**secret_vars, **not_secret_vars}
 
     if not any(str(service.container_port) in f"{x}" for x in all_var_values.values()):
-        rich.print(
+        fail(
+            "parameters create",
             f"Container port: {service.container_port} not found in any environment "
-            "variables. Please add it to the `.env` file."
+            "variables. Please add it to the `.env` file.",
         )
-        raise typer.Exit(code=1)
 
     if secret_vars:
         secret_return = create_secret(service=service, service_variables=secret_vars)
         if verbose:
             rich.print(f"Secret return: {secret_return}")
 
+    report = None
     if not_secret_vars:
-        param_return = create_parameters(
-            service=service, service_variables=not_secret_vars
+        report = create_parameters(
+            service=service, service_variables=not_secret_vars, tps=tps or SSM_PUT_TPS
         )
         if verbose:
-            rich.print(f"Parameters return: {param_return}")
+            rich.print(f"Parameters return: {report.results}")
+        rich.print(
+            f"Parameters written: {len(report.written)}, "
+            f"failed: {len(report.failed)} in {report.elapsed:.1f}s"
+        )
+        for result in report.failed:
+            rich.print(f"Could not write {result.name}: {result.error}")
+
+    failed = bool(report and report.failed)
+    emit(
+        "parameters create",
+        {
+            "secrets": sorted(secret_vars),
+            "parameters": report,
+            "classification": classification,
+        },
+        ok=not failed,
+    )
+    if failed:
+        raise typer.Exit(code=1)
 
 
 @params_app.command("list")
@@ -292,6 +698,8 @@ def parameters_list(
     """
     Create parameters command.
     """
+    from .parameters.list import list_parameters, list_secrets
+    from .schema import Service
 
     service = Service.from_path(file)
 
@@ -302,6 +710,215 @@ def parameters_list(
 
     rich.print(f"Parameters: {param_keys}")
     rich.print(f"Secrets: {secret_keys}")
+    emit("parameters list", {"parameters": param_keys, "secrets": secret_keys})
+
+
+def explain_secrets(env_vars: dict[str, str], secret_keys) -> list:
+    from .cli_out import print_secret_report
+    from .parameters.classifier import get_classifier
+
+    verdicts = get_classifier().classify(env_vars)
+    print_secret_report(verdicts, list(secret_keys))
+    return verdicts
+
+
+def print_key_diff(title: str, diff):
+    rich.print(
+        f"{title}: {len(diff.added)} added, {len(diff.changed)} changed, "
+        f"{len(diff.removed)} removed, {len(diff.unchanged)} unchanged"
+    )
+    for key in diff.added:
+        rich.print(f"  + {key}")
+    for key in diff.changed:
+        rich.print(f"  ~ {key}")
+    for key in diff.removed:
+        rich.print(f"  - {key}")
+
+
+@params_app.command("sync")
+def parameters_sync(
+    file: str = typer.Option(..., "--file", "-f", help="Path to the file"),
+    env: Path = typer.Option(
+        ..., "--env", "-e", help="Environment file (`.env` or `.json`)."
+    ),
+    secrets: list[str] = typer.Option(
+        None, "--secrets", "-s", help="List of secret variables"
+    ),
+    plan: bool = typer.Option(
+        False, "--plan", help="Only print the diff, without writing to AWS"
+    ),
+    tps: float = typer.Option(
+        None, "--tps", help="Maximum SSM writes per second (defaults to the SSM quota)"
+    ),
+    explain: bool = typer.Option(
+        False, "--explain", help="Show why each variable is treated as a secret"
+    ),
+):
+    """
+    Sync parameters command: only write the keys that changed.
+    """
+    from .parameters.create import SSM_PUT_TPS
+    from .parameters.env_handler import load_env_vars
+    from .parameters.sync import SyncError, apply_sync, plan_sync
+    from .schema import ECSService
+
+    service = ECSService.from_path(file)
+    env_vars = load_env_vars(env)
+
+    try:
+        sync_plan = plan_sync(service, env_vars, secrets)
+    except SyncError as e:
+        fail("parameters sync", str(e))
+    print_key_diff("Parameters", sync_plan.parameters)
+    print_key_diff("Secrets", sync_plan.secrets)
+
+    # Only key names: the plan also holds the desired (secret) values
+    diff = {"parameters": sync_plan.parameters, "secrets": sync_plan.secrets}
+    if explain:
+        diff["classification"] = explain_secrets(env_vars, sync_plan.desired_secrets)
+    if plan or not sync_plan.has_changes:
+        emit("parameters sync", {**diff, "applied": None})
+        return
+
+    result = apply_sync(service, sync_plan, tps=tps or SSM_PUT_TPS)
+    failed = list(result.failed_deletes)
+    written = 0
+    if result.parameters:
+        failed += [r.key for r in result.parameters.failed]
+        written = len(result.parameters.written)
+    rich.print(
+        f"Parameters written: {written}, "
+        f"deleted: {len(result.deleted_parameters)}, "
+        f"secret updated: {result.secret_written}"
+    )
+    sync_failed = failed or (
+        sync_plan.secrets.has_changes and not result.secret_written
+    )
+    emit("parameters sync", {**diff, "applied": result}, ok=not sync_failed)
+    if sync_failed:
+        rich.print(f"Sync failed for: {failed or ['secret']}")
+        raise typer.Exit(code=1)
+
+
+fleet_app = typer.Typer()
+app.add_typer(fleet_app, name="fleet")
+
+
+@fleet_app.command("deploy")
+def fleet_deploy(
+    target: str = typer.Argument(
+        ..., help="Directory of service specs, a glob or a single spec file"
+    ),
+    build: ECSBuilds = typer.Option(
+        ECSBuilds.BOTH.value, "--build", "-b", help="Specify the build process"
+    ),
+    concurrency: int = typer.Option(
+        8, "--concurrency", "-c", help="Maximum number of stacks deployed at once"
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Perform a dry run without applying changes"
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    stack_suffix: str = typer.Option(
+        None,
+        "--stack-name-suffix",
+        "-s",
+        help="Suffix to concat to the auto stack name",
+    ),
+    wait: bool = typer.Option(
+        False, "--wait", "-w", help="Wait for every stack to finish"
+    ),
+    skip_image_check: bool = typer.Option(
+        False, "--skip-image-check", help=IMAGE_CHECK_HELP
+    ),
+):
+    """
+    Deploy the ECS stacks of every service spec concurrently.
+    """
+    from .fleet import deploy_fleet, find_specs, load_fleet
+
+    paths = find_specs(target)
+    if not paths:
+        fail("fleet deploy", f"No service specs found for: {target}")
+
+    services, results = load_fleet(paths)
+    rich.print(f"Deploying {len(services)} services, {concurrency} at a time")
+    start = time.perf_counter()
+    results += deploy_fleet(
+        services,
+        build=build,
+        concurrency=concurrency,
+        dry_run=dry_run,
+        stack_suffix=stack_suffix,
+        verbose=verbose,
+        wait=wait,
+        on_event=print_stack_event if verbose else None,
+        check_images=not skip_image_check,
+    )
+    print_fleet_summary(results)
+    rich.print(f"Fleet finished in {time.perf_counter() - start:.1f}s")
+
+    fleet_failed = any(result.status == "failed" for result in results)
+    emit("fleet deploy", results, ok=not fleet_failed)
+    if fleet_failed:
+        raise typer.Exit(code=1)
+
+
+cache_app = typer.Typer()
+app.add_typer(cache_app, name="cache")
+
+
+@cache_app.command("refresh")
+def cache_refresh(
+    kinds: list[str] = typer.Option(
+        None, "--kind", "-k", help="Resource types to refresh (all if not informed)"
+    ),
+    all_entries: bool = typer.Option(
+        False, "--all", help="Refresh fresh entries too, not only the expired ones"
+    ),
+):
+    """
+    Reload the inventoried AWS lookups.
+    """
+    from .inventory import refresh_inventory
+
+    refreshed = refresh_inventory(kinds or None, only_stale=not all_entries)
+    rich.print(f"Refreshed entries: {refreshed}")
+    emit("cache refresh", refreshed)
+
+
+@cache_app.command("stats")
+def cache_stats():
+    """
+    Show the inventory entries per resource type.
+    """
+    from .inventory import get_inventory, inventory_exists
+
+    inventory = get_inventory()
+    # Reading the stats of a missing inventory would create it
+    all_stats = inventory.stats() if inventory_exists() else {}
+    rich.print(f"Inventory: {inventory.path}")
+    for kind, stats in all_stats.items():
+        rich.print(
+            f"{kind}: {stats['entries']} entries, {stats['stale']} stale, "
+            f"oldest {stats['oldest_seconds']:.0f}s (ttl {inventory.ttl(kind)}s)"
+        )
+    emit("cache stats", {"path": str(inventory.path), "kinds": all_stats})
+
+
+@cache_app.command("clear")
+def cache_clear(
+    kind: str = typer.Option(None, "--kind", "-k", help="Resource type to clear"),
+):
+    """
+    Drop the inventory entries (of one resource type or all).
+    """
+    from .inventory import get_inventory, inventory_exists
+
+    if inventory_exists():
+        get_inventory().invalidate(kind)
+    rich.print(f"Cleared inventory entries: {kind or 'all'}")
+    emit("cache clear", {"kind": kind})
 
 
 workflow_app = typer.Typer()
@@ -1,77 +1,62 @@
-import sys
 from typing import Optional
 
-import boto3
 import rich
 from botocore.exceptions import ClientError
 from loguru import logger
 
-from ..aws.helper import create_stack, list_certificates
+from ..aws.certificates import resolve_certificate
+from ..aws.helper import create_stack
 from ..schema import ALBService
+from ..template_builder import compose
 from . import templates as t
+from .resolver import ALBNotFoundError, resolve_alb
 
 
 def get_alb_resources(alb_name):
-    # Create an ELBV2 client
-    elbv2_client = boto3.client("elbv2")
-
-    # Initialize the dictionary to store ALB resources
-    dict_alb_resources = {}
-
-    # Get the load balancer information
-    load_balancers = elbv2_client.describe_load_balancers(Names=[alb_name])
-    if load_balancers["LoadBalancers"]:
-        load_balancer = load_balancers["LoadBalancers"][0]
-        dict_alb_resources["LoadBalancerArn"] = load_balancer["LoadBalancerArn"]
-        dict_alb_resources["SecurityGroupId"] = load_balancer["SecurityGroups"]
-
-    # Get the target groups associated with the load balancer
-    target_groups = elbv2_client.describe_target_groups(
-        LoadBalancerArn=dict_alb_resources["LoadBalancerArn"]
-    )
-    if target_groups["TargetGroups"]:
-        target_group = target_groups["TargetGroups"][0]
-        dict_alb_resources["TargetGroupArn"] = target_group["TargetGroupArn"]
+    alb = resolve_alb(alb_name)
+
+    # Same keys as the outputs of the ALB stacks created by infrazeus
+    dict_alb_resources = {
+        "LoadBalancerArn": alb.arn,
+        "SecurityGroupId": alb.security_groups,
+    }
+    if alb.target_groups:
+        dict_alb_resources["TargetGroupArn"] = alb.target_groups[0]
 
     return dict_alb_resources
 
 
 def get_alb_arn_by_name(alb_name):
-    # Create an ELBv2 client
-    client = boto3.client("elbv2")
-
     try:
-        # Retrieve all load balancers
-        response = client.describe_load_balancers()
-
-        # Look for the ALB with the specified name and return its ARN
-        for load_balancer in response["LoadBalancers"]:
-            if load_balancer["LoadBalancerName"] == alb_name:
-                return load_balancer["LoadBalancerArn"]
-
+        return resolve_alb(alb_name).arn
+    except ALBNotFoundError as e:
         # If the ALB is not found, return a message indicating it
-        return f"ALB named '{alb_name}' not found."
-
+        return str(e)
     except ClientError as e:
         # If there's an error from AWS, return the message
         return f"An error occurred: {e}"
 
 
+def reuse_stack_name(service: ALBService, alb_name: str) -> str:
+    return f"{service.service_name}-{service.environment}-alb-reuse-{alb_name}-stack-1"
+
+
 def reuse_alb(
     alb_name: str,
     service: ALBService,
     dry_run: bool = False,
+    verbose: bool = False,
 ):
 
-    cert = list_certificates(service.domain)
-    logger.debug(f"All cert: {cert}")
+    # The listener certificate must live in the ALB region
+    cert = resolve_certificate(service.domain, region=service.region)
 
-    cert_arn = cert[0]["CertificateArn"]
+    cert_arn = cert["CertificateArn"]
     logger.info(f"Selected cert: {cert}")
 
     provided_alb_name = alb_name
     logger.debug(f"ALB name: {provided_alb_name}")
-    alb_arn = get_alb_arn_by_name(provided_alb_name)
+    alb_arn = resolve_alb(provided_alb_name).arn
     logger.debug(f"ALB ARN: {alb_arn}")
     sg = t.get_security_group_template(service)
     logger.debug(f"SG: {sg}")
@@ -85,28 +70,24 @@ def reuse_alb(
     )
     logger.debug(f"listener: {listen}")
 
-    template = {
-        "AWSTemplateFormatVersion": "2010-09-09",
-        "Description": (
+    template = compose(
+        sg,
+        tg,
+        listen,
+        description=(
             f"CloudFormation template for {service.normalized_name} "
-            "based on existing {provided_alb_name} ALB"
+            f"based on existing {provided_alb_name} ALB"
         ),
-        "Resources": {},
-        "Outputs": {},
-    }
-    template["Resources"].update(sg["Resources"])
-    template["Resources"].update(tg["Resources"])
-    template["Resources"].update(listen["Resources"])
-    template["Outputs"].update(sg["Outputs"])
-    template["Outputs"].update(tg["Outputs"])
+    ).render()
 
-    rich.print("Creation template:")
-    rich.print(template)
+    if verbose:
+        rich.print("Creation template:")
+        rich.print(template)
 
     if dry_run:
-        sys.exit(0)
+        return {"Template": template}
 
-    stack_name = f"{service.service_name}-{service.environment}-alb-reuse-{provided_alb_name}-stack-1"
+    stack_name = reuse_stack_name(service, provided_alb_name)
     response = create_stack(template, stack_name)
 
     return response
@@ -120,10 +101,10 @@ def create_alb(
     verbose: bool = False,
 ):
 
-    domain = ".".join(service.domain.split(".")[-2:])
-    cert = list_certificates(domain)
+    # Exact or wildcard certificate for the service domain, in the ALB region
+    cert = resolve_certificate(service.domain, region=service.region)
 
-    cert_arn = cert[0]["CertificateArn"]
+    cert_arn = cert["CertificateArn"]
     logger.info(f"Selected SSL certificate: {cert}")
 
     # Get the ARN of the ALB
@@ -146,22 +127,16 @@ def create_alb(
         rich.print("Subnets")
         rich.print(subnets)
 
-    template = {
-        "AWSTemplateFormatVersion": "2010-09-09",
-        "Description": (
+    template = compose(
+        alb_template,
+        sg,
+        tg,
+        listen,
+        description=(
             f"CloudFormation template for {service.normalized_name} "
             f"based on existing {provided_alb_name} ALB"
         ),
-        "Resources": {},
-        "Outputs": {},
-    }
-    template["Resources"].update(alb_template["Resources"])
-    template["Resources"].update(sg["Resources"])
-    template["Resources"].update(tg["Resources"])
-    template["Resources"].update(listen["Resources"])
-    template["Outputs"].update(alb_template["Outputs"])
-    template["Outputs"].update(sg["Outputs"])
-    template["Outputs"].update(tg["Outputs"])
+    ).render()
 
     if verbose:
         rich.print(template)
@@ -169,7 +144,7 @@ def create_alb(
     stack_name = service.stack_name(stack_suffix)
 
     if dry_run:
-        return None
+        return {"Template": template}
 
     response = create_stack(template, stack_name)
     return response
@@ -0,0 +1,93 @@
+import threading
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ..aws.clients import get_client, get_session
+from ..inventory import inventoried
+
+
+class ALBNotFoundError(LookupError):
+    pass
+
+
+class ALBResources(BaseModel):
+    name: str
+    arn: str
+    dns_name: Optional[str] = None
+    vpc_id: Optional[str] = None
+    security_groups: list[str] = []
+    subnets: list[str] = []
+    availability_zones: list[str] = []
+    target_groups: list[str] = []
+
+
+_lock = threading.Lock()
+_key_locks: dict[tuple[str, Optional[str]], threading.Lock] = {}
+_resolved: dict[tuple[str, Optional[str]], ALBResources] = {}
+
+
+@inventoried("load_balancers")
+def describe_alb(name: str, region: Optional[str] = None) -> dict:
+    client = get_client("elbv2", region=region)
+
+    # Server-side filtering by name, paginated in case of unexpected extra pages
+    load_balancer = None
+    try:
+        paginator = client.get_paginator("describe_load_balancers")
+        load_balancer = next(
+            (
+                candidate
+                for page in paginator.paginate(Names=[name])
+                for candidate in page["LoadBalancers"]
+                if candidate["LoadBalancerName"] == name
+            ),
+            None,
+        )
+    except client.exceptions.LoadBalancerNotFoundException:
+        pass
+    if load_balancer is None:
+        raise ALBNotFoundError(f"ALB named '{name}' not found.")
+
+    target_groups = []
+    paginator = client.get_paginator("describe_target_groups")
+    for page in paginator.paginate(LoadBalancerArn=load_balancer["LoadBalancerArn"]):
+        target_groups += [tg["TargetGroupArn"] for tg in page["TargetGroups"]]
+
+    availability_zones = load_balancer.get("AvailabilityZones", [])
+    return dict(
+        name=name,
+        arn=load_balancer["LoadBalancerArn"],
+        dns_name=load_balancer.get("DNSName"),
+        vpc_id=load_balancer.get("VpcId"),
+        security_groups=load_balancer.get("SecurityGroups", []),
+        subnets=[az["SubnetId"] for az in availability_zones],
+        availability_zones=[az["ZoneName"] for az in availability_zones],
+        target_groups=target_groups,
+    )
+
+
+def resolve_alb(
+    name: str, region: Optional[str] = None, refresh: bool = False
+) -> ALBResources:
+    """
+    ARN, security groups, subnets and target groups of the ALB called `name`.
+
+    The lookup is memoized per (name, region); concurrent callers asking for the
+    same ALB wait for a single describe instead of issuing their own.
+    """
+    region = region or get_session().region_name
+    key = (name, region)
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        if refresh or key not in _resolved:
+            _resolved[key] = ALBResources(**describe_alb(name, region))
+        return _resolved[key]
+
+
+def forget_alb(name: Optional[str] = None):
+    with _lock:
+        for key in [key for key in _resolved if name in (None, key[0])]:
+            del _resolved[key]
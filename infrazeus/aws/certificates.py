@@ -0,0 +1,138 @@
+import threading
+from datetime import datetime
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit
+
+from ..inventory import inventory_enabled
+from .clients import get_client
+from .helper import CERTIFICATE_KEY_TYPES, list_certificates
+
+
+class CertificateNotFoundError(LookupError):
+    pass
+
+
+def normalize_domain(domain: str) -> str:
+    """
+    `https://api.example.com:443/path` -> `api.example.com`
+    """
+    if "://" not in domain:
+        domain = f"//{domain}"
+    return (urlsplit(domain).hostname or "").rstrip(".").lower()
+
+
+def _timestamp(value: Any) -> float:
+    # Datetimes, or strings in inventory entries stored by older versions
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def _rank(certificate: dict[str, Any], exact: bool) -> tuple:
+    issued = certificate.get("Status", "ISSUED") == "ISSUED"
+    return (issued, exact, _timestamp(certificate.get("NotAfter")))
+
+
+class CertificateIndex:
+    """
+    ACM certificates of a region indexed by domain name and SANs.
+
+    Pages are only fetched until an ISSUED certificate for the exact domain shows
+    up; wildcard matches (`*.example.com` for `api.example.com`) require the whole
+    listing. Resolved domains are memoized.
+    """
+
+    def __init__(self, region: str):
+        self.region = region
+        self._exact: dict[str, list[dict]] = {}
+        self._wildcard: dict[str, list[dict]] = {}
+        self._resolved: dict[str, Optional[dict]] = {}
+        self._summaries: Optional[Iterator[dict]] = None
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    def _iter_summaries(self) -> Iterator[dict]:
+        if inventory_enabled():
+            # Whole listing (same key types), served from the inventory while fresh
+            yield from list_certificates("", region=self.region)
+            return
+
+        acm_client = get_client("acm", region=self.region)
+        paginator = acm_client.get_paginator("list_certificates")
+        for page in paginator.paginate(Includes={"keyTypes": CERTIFICATE_KEY_TYPES}):
+            yield from page["CertificateSummaryList"]
+
+    def _add(self, certificate: dict[str, Any]) -> set[str]:
+        names = {certificate["DomainName"].lower()}
+        names.update(
+            name.lower()
+            for name in certificate.get("SubjectAlternativeNameSummaries", [])
+        )
+        for name in names:
+            if name.startswith("*."):
+                self._wildcard.setdefault(name[2:], []).append(certificate)
+            else:
+                self._exact.setdefault(name, []).append(certificate)
+        return names
+
+    def _best(self, domain: str) -> Optional[dict]:
+        candidates = [(_rank(c, True), c) for c in self._exact.get(domain, [])]
+        _, _, parent = domain.partition(".")
+        candidates += [(_rank(c, False), c) for c in self._wildcard.get(parent, [])]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda candidate: candidate[0])[1]
+
+    def _has_issued_exact(self, domain: str) -> bool:
+        return any(
+            c.get("Status", "ISSUED") == "ISSUED" for c in self._exact.get(domain, [])
+        )
+
+    def resolve(self, domain: str) -> Optional[dict[str, Any]]:
+        domain = normalize_domain(domain)
+        with self._lock:
+            if domain in self._resolved:
+                return self._resolved[domain]
+
+            if self._summaries is None:
+                self._summaries = self._iter_summaries()
+            while not self._exhausted and not self._has_issued_exact(domain):
+                certificate = next(self._summaries, None)
+                if certificate is None:
+                    self._exhausted = True
+                    break
+                self._add(certificate)
+
+            best = self._best(domain)
+            # Only cache misses once every certificate has been seen
+            if best is not None or self._exhausted:
+                self._resolved[domain] = best
+            return best
+
+
+_indexes: dict[str, CertificateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_certificate_index(region: str) -> CertificateIndex:
+    with _indexes_lock:
+        if region not in _indexes:
+            _indexes[region] = CertificateIndex(region)
+        return _indexes[region]
+
+
+def resolve_certificate(domain: str, region: str = "us-east-1") -> dict[str, Any]:
+    """
+    Best certificate for `domain`: ISSUED first, exact over wildcard, longest validity.
+    """
+    certificate = get_certificate_index(region).resolve(domain)
+    if certificate is None:
+        raise CertificateNotFoundError(
+            f"No ACM certificate in {region} covers {normalize_domain(domain)}"
+        )
+    return certificate
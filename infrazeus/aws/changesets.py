@@ -0,0 +1,159 @@
+import time
+from typing import Any, Optional
+
+from botocore.exceptions import ClientError
+from loguru import logger
+from pydantic import BaseModel
+
+from ..inventory import invalidate_inventory
+from .clients import get_client
+from .fingerprint import (
+    describe_stack,
+    fingerprint_tags,
+    is_up_to_date,
+    template_fingerprint,
+)
+from .template_delivery import template_source
+
+CHANGE_SET_PREFIX = "infrazeus"
+
+# Reasons CloudFormation gives when a change set has nothing to do
+NO_CHANGES_REASONS = (
+    "didn't contain changes",
+    "No updates are to be performed",
+)
+
+
+class ChangeSetError(RuntimeError):
+    pass
+
+
+class ChangeSetResult(BaseModel):
+    stack_name: str
+    stack_id: Optional[str] = None
+    change_set_name: Optional[str] = None
+    change_set_id: Optional[str] = None
+    changes: list[dict[str, Any]] = []
+    executed: bool = False
+    # The stack already carries the fingerprint of this template
+    up_to_date: bool = False
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changes)
+
+
+def _wait_change_set(
+    cf_client, stack_name: str, change_set_name: str, timeout: float = 300
+) -> dict[str, Any]:
+    delay, deadline = 1.0, time.monotonic() + timeout
+    while True:
+        change_set = cf_client.describe_change_set(
+            StackName=stack_name, ChangeSetName=change_set_name
+        )
+        if change_set["Status"] in ("CREATE_COMPLETE", "FAILED"):
+            return change_set
+        if time.monotonic() > deadline:
+            raise TimeoutError(
+                f"Change set {change_set_name} still {change_set['Status']} "
+                f"after {timeout}s"
+            )
+        time.sleep(delay)
+        delay = min(delay * 1.5, 10.0)
+
+
+def _all_changes(cf_client, change_set: dict[str, Any]) -> list[dict[str, Any]]:
+    changes = list(change_set.get("Changes", []))
+    next_token = change_set.get("NextToken")
+    while next_token:
+        page = cf_client.describe_change_set(
+            ChangeSetName=change_set["ChangeSetId"], NextToken=next_token
+        )
+        changes += page.get("Changes", [])
+        next_token = page.get("NextToken")
+    return changes
+
+
+def _discard_change_set(cf_client, stack_name: str, change_set_name: str):
+    # Best effort: the change set may not exist, or the error may be the reason
+    try:
+        cf_client.delete_change_set(StackName=stack_name, ChangeSetName=change_set_name)
+    except ClientError as e:
+        logger.warning(f"Could not delete change set {change_set_name}: {e}")
+
+
+def update_stack(
+    template: dict[str, Any], stack_name: str, execute: bool = True
+) -> ChangeSetResult:
+    """
+    Create an UPDATE change set for `stack_name` and execute it if it changes
+    anything. Empty change sets are deleted so they don't pile up on the stack.
+
+    Nothing is sent to CloudFormation when the stack fingerprint tag matches the
+    template. CloudFormation errors (a stack still updating, in ROLLBACK_COMPLETE...)
+    and change sets that never finish are raised as `ChangeSetError`, after
+    deleting the pending change set.
+    """
+    fingerprint = template_fingerprint(template)
+    try:
+        stack = describe_stack(stack_name)
+    except ClientError as e:
+        raise ChangeSetError(f"Could not describe stack {stack_name}: {e}") from e
+    if stack is None:
+        raise ChangeSetError(f"Stack {stack_name} does not exist, create it first")
+    if is_up_to_date(stack, fingerprint):
+        return ChangeSetResult(
+            stack_name=stack_name, stack_id=stack["StackId"], up_to_date=True
+        )
+
+    cf_client = get_client("cloudformation")
+    change_set_name = f"{CHANGE_SET_PREFIX}-{int(time.time() * 1000)}"
+    try:
+        response = cf_client.create_change_set(
+            StackName=stack_name,
+            ChangeSetName=change_set_name,
+            ChangeSetType="UPDATE",
+            Parameters=[],
+            Tags=fingerprint_tags(fingerprint, stack),
+            **template_source(template),
+        )
+    except ClientError as e:
+        raise ChangeSetError(
+            f"Could not create a change set for {stack_name}: {e}"
+        ) from e
+    try:
+        change_set = _wait_change_set(cf_client, stack_name, change_set_name)
+    except (ClientError, TimeoutError) as e:
+        _discard_change_set(cf_client, stack_name, change_set_name)
+        raise ChangeSetError(f"Change set {change_set_name} failed: {e}") from e
+    result = ChangeSetResult(
+        stack_name=stack_name,
+        stack_id=response.get("StackId"),
+        change_set_name=change_set_name,
+        change_set_id=response.get("Id"),
+    )
+
+    if change_set["Status"] == "FAILED":
+        reason = change_set.get("StatusReason", "")
+        if not any(no_changes in reason for no_changes in NO_CHANGES_REASONS):
+            _discard_change_set(cf_client, stack_name, change_set_name)
+            raise ChangeSetError(f"Change set {change_set_name} failed: {reason}")
+    else:
+        result.changes = _all_changes(cf_client, change_set)
+
+    if not result.has_changes or not execute:
+        _discard_change_set(cf_client, stack_name, change_set_name)
+        return result
+
+    try:
+        cf_client.execute_change_set(
+            StackName=stack_name, ChangeSetName=change_set_name
+        )
+    except ClientError as e:
+        _discard_change_set(cf_client, stack_name, change_set_name)
+        raise ChangeSetError(
+            f"Could not execute change set {change_set_name}: {e}"
+        ) from e
+    invalidate_inventory("stacks")
+    result.executed = True
+    return result
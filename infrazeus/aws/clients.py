@@ -0,0 +1,175 @@
+import os
+import threading
+from collections import Counter
+from typing import Any, Optional
+
+# boto3/botocore are imported on first use so that importing this module (and every
+# controller that depends on it) stays cheap for the CLI.
+
+_lock = threading.RLock()
+_sessions: dict[Optional[str], Any] = {}
+_clients: dict[
+    tuple[str, Optional[str], Optional[str], Optional[str], Optional[int]], Any
+] = {}
+
+_stats: Counter = Counter()
+_api_calls: Counter = Counter()
+
+_settings = {
+    "max_pool_connections": int(os.getenv("INFRAZEUS_MAX_POOL_CONNECTIONS", "32")),
+    "max_attempts": int(os.getenv("INFRAZEUS_MAX_ATTEMPTS", "8")),
+    "retry_mode": os.getenv("INFRAZEUS_RETRY_MODE", "adaptive"),
+    "tcp_keepalive": os.getenv("INFRAZEUS_TCP_KEEPALIVE", "1") != "0",
+    "profile": os.getenv("AWS_PROFILE"),
+}
+
+
+def configure(
+    max_pool_connections: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    retry_mode: Optional[str] = None,
+    tcp_keepalive: Optional[bool] = None,
+    profile: Optional[str] = None,
+):
+    """
+    Override the connection settings used for clients created from now on.
+
+    Already created clients are dropped so the next `get_client` picks the new config.
+    """
+    overrides = {
+        "max_pool_connections": max_pool_connections,
+        "max_attempts": max_attempts,
+        "retry_mode": retry_mode,
+        "tcp_keepalive": tcp_keepalive,
+        "profile": profile,
+    }
+    with _lock:
+        _settings.update({k: v for k, v in overrides.items() if v is not None})
+        _clients.clear()
+
+
+def default_profile() -> Optional[str]:
+    return _settings["profile"]
+
+
+def get_session(profile: Optional[str] = None):
+    """
+    Return the process-wide boto3 session for `profile` (default profile if None).
+    """
+    import boto3
+
+    profile = profile or _settings["profile"]
+    with _lock:
+        session = _sessions.get(profile)
+        if session is None:
+            session = boto3.session.Session(profile_name=profile)
+            _sessions[profile] = session
+            _stats["sessions"] += 1
+        return session
+
+
+def _client_config(max_attempts: Optional[int] = None):
+    from botocore.config import Config
+
+    retries = {"mode": _settings["retry_mode"]}
+    if max_attempts is None:
+        retries["max_attempts"] = _settings["max_attempts"]
+    else:
+        # Total attempts, the first call included
+        retries["total_max_attempts"] = max_attempts
+    return Config(
+        max_pool_connections=_settings["max_pool_connections"],
+        tcp_keepalive=_settings["tcp_keepalive"],
+        retries=retries,
+    )
+
+
+def _count_call(service: str):
+    def handler(model, **kwargs):
+        _api_calls[f"{service}:{model.name}"] += 1
+
+    return handler
+
+
+def get_client(
+    service: str,
+    region: Optional[str] = None,
+    profile: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    max_attempts: Optional[int] = None,
+):
+    """
+    Return a shared low-level client for (service, region, profile, endpoint).
+
+    Clients are thread safe, so a single instance (and its connection pool) is
+    reused by every controller in the process. `max_attempts` caps the attempts
+    botocore makes for each call, the first one included (1 disables retries).
+    """
+    profile = profile or _settings["profile"]
+    session = get_session(profile)
+    key = (service, region or session.region_name, profile, endpoint_url, max_attempts)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = session.client(
+                service,
+                region_name=key[1],
+                endpoint_url=endpoint_url,
+                config=_client_config(max_attempts),
+            )
+            client.meta.events.register("before-call", _count_call(service))
+            _clients[key] = client
+            _stats[f"clients:{service}"] += 1
+        return client
+
+
+def _connections_opened(client) -> int:
+    # botocore does not expose its urllib3 pools, so this is best effort.
+    http_session = getattr(getattr(client, "_endpoint", None), "http_session", None)
+    managers = [getattr(http_session, "_manager", None)]
+    managers += list(getattr(http_session, "_proxy_managers", {}).values())
+    opened = 0
+    for manager in managers:
+        pools = getattr(manager, "pools", None)
+        if pools is None:
+            continue
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            opened += getattr(pool, "num_connections", 0) if pool else 0
+    return opened
+
+
+def client_stats() -> dict[str, Any]:
+    """
+    Counters of sessions, clients, connections and API calls made by this process.
+    """
+    with _lock:
+        clients = dict(_clients)
+        connections = Counter()
+        for (service, *_), client in clients.items():
+            connections[service] += _connections_opened(client)
+        return {
+            "sessions": _stats["sessions"],
+            "clients": {
+                key.split(":", 1)[1]: value
+                for key, value in _stats.items()
+                if key.startswith("clients:")
+            },
+            "connections": dict(connections),
+            "api_calls": dict(_api_calls),
+        }
+
+
+def reset():
+    """
+    Forget every cached session/client and zero the counters.
+    """
+    with _lock:
+        _sessions.clear()
+        _clients.clear()
+        _stats.clear()
+        _api_calls.clear()
@@ -0,0 +1,64 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_client
+from .waiter import is_failure_status
+
+FINGERPRINT_TAG = "infrazeus:template-sha256"
+
+
+def canonical_template(template: dict[str, Any]) -> str:
+    """
+    Template JSON with sorted keys and no whitespace: equal templates, equal text.
+    """
+    return json.dumps(template, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def template_fingerprint(template: dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_template(template).encode()).hexdigest()
+
+
+def fingerprint_tags(
+    fingerprint: str, stack: Optional[dict[str, Any]] = None
+) -> list[dict[str, str]]:
+    """
+    Tags of `stack` with the fingerprint tag set: passing `Tags` replaces the
+    whole tag set of a stack, so the ones it already has are kept.
+    """
+    tags = [
+        tag for tag in (stack or {}).get("Tags", []) if tag["Key"] != FINGERPRINT_TAG
+    ]
+    return [*tags, {"Key": FINGERPRINT_TAG, "Value": fingerprint}]
+
+
+def describe_stack(stack_name: str) -> Optional[dict[str, Any]]:
+    """
+    The stack as CloudFormation sees it right now, or None if it does not exist.
+    """
+    cf_client = get_client("cloudformation")
+    try:
+        stacks = cf_client.describe_stacks(StackName=stack_name)["Stacks"]
+    except ClientError as e:
+        if "does not exist" in str(e):
+            return None
+        raise
+    return stacks[0] if stacks else None
+
+
+def stack_fingerprint(stack: dict[str, Any]) -> Optional[str]:
+    for tag in stack.get("Tags", []):
+        if tag["Key"] == FINGERPRINT_TAG:
+            return tag["Value"]
+    return None
+
+
+def is_up_to_date(stack: Optional[dict[str, Any]], fingerprint: str) -> bool:
+    """
+    Whether `stack` was last deployed with this exact template (and did not fail).
+    """
+    if stack is None or is_failure_status(stack["StackStatus"]):
+        return False
+    return stack_fingerprint(stack) == fingerprint
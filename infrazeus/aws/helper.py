@@ -1,6 +1,15 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-import boto3
+from ..inventory import invalidate_inventory, inventoried
+from .clients import get_client
+from .fingerprint import (
+    describe_stack,
+    fingerprint_tags,
+    is_up_to_date,
+    template_fingerprint,
+)
+from .template_delivery import template_source
+from .vpc import get_vpc_topology
 
 
 def list_subnets(
@@ -10,46 +19,14 @@ def list_subnets(
     unique_availability_zones: bool = True,
     filter_public_subnets: bool = True,
 ) -> List[dict]:
-    # Describe subnets for the VPC, list all first
-    subnets = ec2_client.describe_subnets(
-        Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-    )["Subnets"]
-
-    # Describe route tables for the VPC
-    route_tables = ec2_client.describe_route_tables(
-        Filters=[{"Name": "vpc-id", "Values": [vpc_id]}]
-    )["RouteTables"]
-
-    # Find public subnets if required
-    public_subnet_ids = set()
-    if filter_public_subnets:
-        for rt in route_tables:
-            for r in rt["Routes"]:
-                if (
-                    r.get("GatewayId", "").startswith("igw-")
-                    and r.get("DestinationCidrBlock") == "0.0.0.0/0"
-                ):
-                    for assoc in rt.get("Associations", []):
-                        if assoc.get("SubnetId"):
-                            public_subnet_ids.add(assoc["SubnetId"])
-
-    filtered_subnets = []
-    seen_azs = set()
-    for subnet in subnets:
-        # Filter subnets based on the specified conditions
-        if (
-            (filter_available and subnet["State"] != "available")
-            or (unique_availability_zones and subnet["AvailabilityZone"] in seen_azs)
-            or (filter_public_subnets and subnet["SubnetId"] not in public_subnet_ids)
-        ):
-            continue
-
-        # The subnet satisfies all the filters, so we include it in the result
-        filtered_subnets.append(subnet)
-        # Keep track of seen availability zones
-        seen_azs.add(subnet["AvailabilityZone"])
-
-    return filtered_subnets
+    # Subnets come from the VPC topology snapshot, described once per VPC
+    topology = get_vpc_topology(vpc_id, region=ec2_client.meta.region_name)
+    subnets = topology.select(
+        filter_available=filter_available,
+        unique_availability_zones=unique_availability_zones,
+        filter_public_subnets=filter_public_subnets,
+    )
+    return [subnet.raw for subnet in subnets]
 
 
 def subnet_ids_for_vpc(
@@ -57,36 +34,42 @@ def subnet_ids_for_vpc(
     unique_availability_zones=False,
     minimal_ip_available: int = 8,
     num_subnets: int = 3,
+    region: Optional[str] = None,
 ) -> List[str]:
-    # Get a list of subnets with their details
-    ec2_client = boto3.client("ec2")
-    subnets = list_subnets(
-        ec2_client, vpc, unique_availability_zones=unique_availability_zones
+    # Public subnets with at least minimal_ip_available addresses left, up to 3
+    subnets = get_vpc_topology(vpc, region=region).select(
+        unique_availability_zones=unique_availability_zones,
+        minimal_ip_available=minimal_ip_available,
     )
 
-    # Filter subnets with at least minimal_ip_available addresses left and choose up to 3
-    qualified_subnets = [
-        subnet["SubnetId"]
-        for subnet in subnets
-        if subnet["AvailableIpAddressCount"] >= minimal_ip_available
-    ]
+    return [subnet.subnet_id for subnet in subnets][:num_subnets]
+
 
-    return qualified_subnets[:num_subnets]  # Return a maximum of 3 subnets
+# ListCertificates only returns RSA_2048 certificates unless asked otherwise
+CERTIFICATE_KEY_TYPES = [
+    "RSA_1024",
+    "RSA_2048",
+    "RSA_3072",
+    "RSA_4096",
+    "EC_prime256v1",
+    "EC_secp384r1",
+    "EC_secp521r1",
+]
 
 
+@inventoried("certificates")
 def list_certificates(search_string, region: str = "us-east-1"):
-    # Initialize the Boto3 ACM client
     if search_string.startswith("https:"):
         search_string = search_string[8:]
 
-    acm_client = boto3.client("acm", region_name=region)
+    acm_client = get_client("acm", region=region)
 
     # Initialize a variable to hold the certificates
     certificates_containing_string = []
 
     # Retrieve the list of certificates
     paginator = acm_client.get_paginator("list_certificates")
-    for page in paginator.paginate():
+    for page in paginator.paginate(Includes={"keyTypes": CERTIFICATE_KEY_TYPES}):
         for certificate in page["CertificateSummaryList"]:
             # Check if the certificate's domain name contains the search string
             if search_string in certificate["DomainName"]:
@@ -96,20 +79,26 @@ def list_certificates(search_string, region: str = "us-east-1"):
 
 
 def create_stack(template: dict[str, Any], stack_name: str) -> dict[str, Any]:
-    import json
+    # Same template as the deployed stack: skip the CloudFormation round trip
+    fingerprint = template_fingerprint(template)
+    stack = describe_stack(stack_name)
+    if is_up_to_date(stack, fingerprint):
+        return {"StackId": stack["StackId"], "Unchanged": True}
 
-    template_json = json.dumps(template)
-    cf_client = boto3.client("cloudformation")
+    cf_client = get_client("cloudformation")
     response = cf_client.create_stack(
         StackName=stack_name,
-        TemplateBody=template_json,
         Parameters=[],
+        Tags=fingerprint_tags(fingerprint, stack),
+        **template_source(template),
     )
+    invalidate_inventory("stacks")
 
     return response
 
 
+@inventoried("stacks")
 def list_stack(stack_name: str):
-    cf_client = boto3.client("cloudformation")
+    cf_client = get_client("cloudformation")
     stacks = cf_client.describe_stacks(StackName=stack_name)
     return stacks
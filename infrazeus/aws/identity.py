@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from ..paths import user_cache_dir
+from .clients import default_profile, get_client, get_session
+
+IDENTITY_TTL = int(os.getenv("INFRAZEUS_IDENTITY_TTL", str(12 * 60 * 60)))
+IDENTITY_FILE = "identity.json"
+
+_lock = threading.Lock()
+_memo: dict[str, "Identity"] = {}
+
+
+class Identity(BaseModel):
+    account_id: str
+    region: str
+    arn: str
+    resolved_at: float
+
+    def expired(self, ttl: int = IDENTITY_TTL) -> bool:
+        return time.time() - self.resolved_at > ttl
+
+
+def default_region(profile: Optional[str] = None) -> str:
+    return get_session(profile).region_name or "us-east-1"
+
+
+def credential_fingerprint(profile: Optional[str] = None) -> Optional[str]:
+    """
+    Hash identifying the credentials currently in use, without any network call.
+
+    It changes whenever the profile, credential source, access key or region
+    changes, which invalidates the cached identity.
+    """
+    profile = profile or default_profile()
+    credentials = get_session(profile).get_credentials()
+    if credentials is None:
+        return None
+    source = f"{profile}|{credentials.method}|{credentials.access_key}"
+    source = f"{source}|{default_region(profile)}"
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _read_cache() -> dict[str, dict]:
+    path = user_cache_dir() / IDENTITY_FILE
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _parse(entry) -> Optional[Identity]:
+    try:
+        return Identity(**entry)
+    except (TypeError, ValidationError):
+        return None
+
+
+def _write_cache(entries: dict[str, dict]):
+    path = user_cache_dir() / IDENTITY_FILE
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(entries), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _fetch_identity(profile: Optional[str]) -> Identity:
+    caller = get_client("sts", profile=profile).get_caller_identity()
+    return Identity(
+        account_id=caller["Account"],
+        region=default_region(profile),
+        arn=caller["Arn"],
+        resolved_at=time.time(),
+    )
+
+
+def resolve_identity(profile: Optional[str] = None, refresh: bool = False) -> Identity:
+    """
+    Account id, region and caller ARN for the current credentials.
+
+    Results are memoized in-process and persisted under the user cache dir, keyed
+    by `credential_fingerprint`, so only the first call per TTL hits STS.
+    """
+    fingerprint = credential_fingerprint(profile)
+    if fingerprint is None:
+        # No credentials to key on: let STS raise the usual botocore error
+        return _fetch_identity(profile)
+
+    with _lock:
+        identity = _memo.get(fingerprint)
+        if identity and not identity.expired() and not refresh:
+            return identity
+
+        entries = _read_cache()
+        identity = _parse(entries.get(fingerprint))
+        if identity and not identity.expired() and not refresh:
+            _memo[fingerprint] = identity
+            return identity
+
+        identity = _fetch_identity(profile)
+        logger.debug(f"Resolved AWS identity: {identity.arn}")
+        entries = {
+            key: value
+            for key, value in entries.items()
+            if (cached := _parse(value)) and not cached.expired()
+        }
+        entries[fingerprint] = identity.model_dump()
+        try:
+            _write_cache(entries)
+        except OSError as e:
+            logger.warning(f"Could not persist identity cache: {e}")
+        _memo[fingerprint] = identity
+        return identity
+
+
+def clear_identity_cache():
+    with _lock:
+        _memo.clear()
+        (user_cache_dir() / IDENTITY_FILE).unlink(missing_ok=True)
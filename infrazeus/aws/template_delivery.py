@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+from typing import Any, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_client
+from .fingerprint import canonical_template
+
+# CloudFormation rejects a TemplateBody larger than this; bigger templates must be
+# passed as a TemplateURL pointing at S3 (up to 1 MB)
+TEMPLATE_BODY_LIMIT = 51_200
+
+TEMPLATE_BUCKET = os.getenv("INFRAZEUS_TEMPLATE_BUCKET")
+TEMPLATE_PREFIX = os.getenv("INFRAZEUS_TEMPLATE_PREFIX", "infrazeus/templates/")
+# e.g. `http://localhost:5000` to upload to a local S3 stand-in
+S3_ENDPOINT_URL = os.getenv("INFRAZEUS_S3_ENDPOINT_URL")
+
+_uploaded_lock = threading.Lock()
+_uploaded: set[tuple[str, str]] = set()
+
+
+class TemplateTooLargeError(ValueError):
+    pass
+
+
+def _object_exists(s3_client, bucket: str, key: str) -> bool:
+    try:
+        s3_client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return False
+        raise
+    return True
+
+
+def upload_template(
+    body: str,
+    bucket: str,
+    prefix: str = TEMPLATE_PREFIX,
+    endpoint_url: Optional[str] = S3_ENDPOINT_URL,
+) -> str:
+    """
+    Store the template under its sha256 and return its URL.
+
+    Objects are content-addressed, so a template already in the bucket (checked
+    with `head_object`) is not uploaded again.
+    """
+    key = f"{prefix}{hashlib.sha256(body.encode()).hexdigest()}.json"
+    s3_client = get_client("s3", endpoint_url=endpoint_url)
+
+    with _uploaded_lock:
+        known = (bucket, key) in _uploaded
+    if not known and not _object_exists(s3_client, bucket, key):
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=body.encode(),
+            ContentType="application/json",
+        )
+    with _uploaded_lock:
+        _uploaded.add((bucket, key))
+
+    # Path-style URL, valid for every region and for custom endpoints
+    return f"{s3_client.meta.endpoint_url.rstrip('/')}/{bucket}/{key}"
+
+
+def template_source(
+    template: dict[str, Any], bucket: Optional[str] = None
+) -> dict[str, str]:
+    """
+    `TemplateBody` or `TemplateURL` argument for CloudFormation calls.
+
+    The template is minified; when it is still over the inline limit it is
+    uploaded to `bucket` (INFRAZEUS_TEMPLATE_BUCKET by default).
+    """
+    body = canonical_template(template)
+    size = len(body.encode())
+    if size <= TEMPLATE_BODY_LIMIT:
+        return {"TemplateBody": body}
+
+    bucket = bucket or TEMPLATE_BUCKET
+    if not bucket:
+        raise TemplateTooLargeError(
+            f"Template has {size} bytes, over the {TEMPLATE_BODY_LIMIT} bytes "
+            "CloudFormation accepts inline. Set INFRAZEUS_TEMPLATE_BUCKET to an S3 "
+            "bucket to upload it to."
+        )
+    return {"TemplateURL": upload_template(body, bucket)}
@@ -0,0 +1,95 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from botocore.exceptions import ClientError
+
+from .clients import get_client
+
+THROTTLING_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "TooManyRequestsException",
+    "TooManyUpdates",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "ProvisionedThroughputExceededException",
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `acquire` blocks until a call is allowed.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in THROTTLING_ERROR_CODES
+
+
+def throttled_client(service: str, region: Optional[str] = None):
+    """
+    Client for `call_with_retries`, with the botocore retries disabled.
+
+    `call_with_retries` is then the only retry layer: a throttled call is not
+    retried again by botocore on every attempt, and the attempts it reports are
+    the calls actually sent to AWS.
+    """
+    return get_client(service, region=region, max_attempts=1)
+
+
+def call_with_retries(
+    func: Callable[..., Any],
+    *args,
+    limiter: Optional[TokenBucket] = None,
+    max_attempts: int = 6,
+    base_delay: float = 0.5,
+    max_delay: float = 20.0,
+    **kwargs,
+) -> tuple[Any, int]:
+    """
+    Call `func` under `limiter`, retrying throttling errors with full-jitter backoff.
+
+    Returns the result and the number of attempts it took. Any other error, or a
+    throttling error on the last attempt, is raised. Use it with a
+    `throttled_client`, so botocore does not retry each attempt on its own.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if limiter:
+            limiter.acquire()
+        try:
+            return func(*args, **kwargs), attempt
+        except ClientError as e:
+            if not is_throttling_error(e) or attempt >= max_attempts:
+                raise
+            time.sleep(random.uniform(0, min(max_delay, base_delay * 2**attempt)))
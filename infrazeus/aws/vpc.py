@@ -0,0 +1,142 @@
+import threading
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from ..inventory import inventoried
+from .clients import get_client, get_session
+
+
+@inventoried("vpc_networks")
+def describe_vpc_network(vpc_id: str, region: Optional[str] = None) -> dict[str, list]:
+    ec2_client = get_client("ec2", region=region)
+    vpc_filter = [{"Name": "vpc-id", "Values": [vpc_id]}]
+    return {
+        "Subnets": ec2_client.describe_subnets(Filters=vpc_filter)["Subnets"],
+        "RouteTables": ec2_client.describe_route_tables(Filters=vpc_filter)[
+            "RouteTables"
+        ],
+    }
+
+
+def _default_route_targets(route_table: dict[str, Any]) -> tuple[bool, bool]:
+    internet, nat = False, False
+    for route in route_table.get("Routes", []):
+        if route.get("DestinationCidrBlock") != "0.0.0.0/0":
+            continue
+        internet = internet or route.get("GatewayId", "").startswith("igw-")
+        nat = nat or bool(route.get("NatGatewayId"))
+    return internet, nat
+
+
+class SubnetInfo(BaseModel):
+    subnet_id: str
+    availability_zone: str
+    cidr_block: Optional[str] = None
+    state: str
+    available_ips: int
+    route_table_id: Optional[str] = None
+    internet_gateway: bool = False
+    nat_gateway: bool = False
+    raw: dict[str, Any]
+
+
+class VpcTopology(BaseModel):
+    """
+    Subnets of a VPC with their AZ, free IPs and IGW/NAT reachability.
+
+    Built once from a single describe of subnets and route tables; subnets without
+    an explicit route table association use the VPC main route table.
+    """
+
+    vpc_id: str
+    region: Optional[str] = None
+    subnets: dict[str, SubnetInfo] = {}
+    subnets_by_az: dict[str, list[str]] = {}
+
+    @classmethod
+    def from_network(
+        cls, vpc_id: str, network: dict[str, list], region: Optional[str] = None
+    ) -> "VpcTopology":
+        main_targets = (False, False)
+        main_table_id = None
+        subnet_tables: dict[str, tuple[str, tuple[bool, bool]]] = {}
+        for route_table in network["RouteTables"]:
+            targets = _default_route_targets(route_table)
+            for association in route_table.get("Associations", []):
+                if association.get("Main"):
+                    main_table_id, main_targets = route_table["RouteTableId"], targets
+                elif association.get("SubnetId"):
+                    subnet_tables[association["SubnetId"]] = (
+                        route_table["RouteTableId"],
+                        targets,
+                    )
+
+        subnets: dict[str, SubnetInfo] = {}
+        subnets_by_az: dict[str, list[str]] = {}
+        for subnet in network["Subnets"]:
+            table_id, (internet, nat) = subnet_tables.get(
+                subnet["SubnetId"], (main_table_id, main_targets)
+            )
+            info = SubnetInfo(
+                subnet_id=subnet["SubnetId"],
+                availability_zone=subnet["AvailabilityZone"],
+                cidr_block=subnet.get("CidrBlock"),
+                state=subnet["State"],
+                available_ips=subnet["AvailableIpAddressCount"],
+                route_table_id=table_id,
+                internet_gateway=internet,
+                nat_gateway=nat,
+                raw=subnet,
+            )
+            subnets[info.subnet_id] = info
+            subnets_by_az.setdefault(info.availability_zone, []).append(info.subnet_id)
+
+        return cls(
+            vpc_id=vpc_id, region=region, subnets=subnets, subnets_by_az=subnets_by_az
+        )
+
+    @property
+    def public_subnet_ids(self) -> list[str]:
+        return [s.subnet_id for s in self.subnets.values() if s.internet_gateway]
+
+    def select(
+        self,
+        filter_available: bool = True,
+        unique_availability_zones: bool = True,
+        filter_public_subnets: bool = True,
+        minimal_ip_available: int = 0,
+    ) -> list[SubnetInfo]:
+        selected = []
+        seen_azs = set()
+        for subnet in self.subnets.values():
+            if (
+                (filter_available and subnet.state != "available")
+                or (filter_public_subnets and not subnet.internet_gateway)
+                or subnet.available_ips < minimal_ip_available
+                or (unique_availability_zones and subnet.availability_zone in seen_azs)
+            ):
+                continue
+            selected.append(subnet)
+            seen_azs.add(subnet.availability_zone)
+        return selected
+
+
+_lock = threading.Lock()
+_topologies: dict[tuple[str, Optional[str]], VpcTopology] = {}
+
+
+def get_vpc_topology(
+    vpc_id: str, region: Optional[str] = None, refresh: bool = False
+) -> VpcTopology:
+    """
+    Topology of `vpc_id`, built once per process (and served from the inventory
+    when it is enabled) so every service in the same VPC reuses it.
+    """
+    region = region or get_session().region_name
+    key = (vpc_id, region)
+    with _lock:
+        if refresh or key not in _topologies:
+            network = describe_vpc_network(vpc_id, region=region)
+            _topologies[key] = VpcTopology.from_network(vpc_id, network, region)
+        return _topologies[key]
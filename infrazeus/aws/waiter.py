@@ -0,0 +1,215 @@
+import os
+import random
+import time
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from botocore.exceptions import ClientError
+from pydantic import BaseModel
+
+from .clients import get_client
+from .throttle import is_throttling_error
+
+SUCCESS_STATUSES = {
+    "CREATE_COMPLETE",
+    "UPDATE_COMPLETE",
+    "IMPORT_COMPLETE",
+    "DELETE_COMPLETE",
+}
+
+# Seconds between describe_stack_events calls of one stack: reset to the minimum
+# whenever new events show up, stretched by BACKOFF on every quiet poll
+MIN_POLL_DELAY = float(os.getenv("INFRAZEUS_STACK_POLL_MIN", 2))
+MAX_POLL_DELAY = float(os.getenv("INFRAZEUS_STACK_POLL_MAX", 20))
+BACKOFF = 1.5
+STACK_WAIT_TIMEOUT = float(os.getenv("INFRAZEUS_STACK_WAIT_TIMEOUT", 60 * 60))
+
+
+def is_failure_status(status: str) -> bool:
+    return status.endswith("_FAILED") or "ROLLBACK" in status
+
+
+class ResourceTiming(BaseModel):
+    logical_id: str
+    resource_type: str
+    status: str
+    started: Optional[datetime] = None
+    finished: Optional[datetime] = None
+
+    @property
+    def seconds(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+        return (self.finished - self.started).total_seconds()
+
+
+class StackWaitResult(BaseModel):
+    stack_name: str
+    stack_id: str
+    status: str
+    succeeded: bool
+    seconds: float
+    failed_resource: Optional[str] = None
+    reason: Optional[str] = None
+    resources: list[ResourceTiming] = []
+
+
+class StackWatch:
+    """
+    Incremental reader of the events of one stack.
+
+    Each poll only pages through `describe_stack_events` until the last event
+    already seen, so long stack histories are not fetched again. Pass the id of
+    the latest event before an update as `last_event_id` to skip older history.
+    """
+
+    def __init__(
+        self,
+        stack_id: str,
+        last_event_id: Optional[str] = None,
+        region: Optional[str] = None,
+    ):
+        self.stack_id = stack_id
+        # arn:aws:cloudformation:<region>:<account>:stack/<name>/<uuid>
+        if stack_id.startswith("arn:"):
+            self.stack_name = stack_id.split("/")[1]
+            self.region = region or stack_id.split(":")[3]
+        else:
+            self.stack_name = stack_id
+            self.region = region
+        self.last_event_id = last_event_id
+        self.delay = MIN_POLL_DELAY
+        self.next_poll = 0.0
+        self.started = time.monotonic()
+        self.resources: dict[str, ResourceTiming] = {}
+        self.result: Optional[StackWaitResult] = None
+
+    def _events_since_last(self) -> Iterator[dict]:
+        client = get_client("cloudformation", region=self.region)
+        paginator = client.get_paginator("describe_stack_events")
+        # Events come newest first: stop at the first one already seen
+        for page in paginator.paginate(StackName=self.stack_id):
+            for event in page["StackEvents"]:
+                if event["EventId"] == self.last_event_id:
+                    return
+                yield event
+
+    def finish(
+        self,
+        status: str,
+        reason: Optional[str] = None,
+        failed_resource: Optional[str] = None,
+    ):
+        self.result = StackWaitResult(
+            stack_name=self.stack_name,
+            stack_id=self.stack_id,
+            status=status,
+            succeeded=status in SUCCESS_STATUSES,
+            seconds=time.monotonic() - self.started,
+            failed_resource=failed_resource,
+            reason=reason,
+            resources=list(self.resources.values()),
+        )
+
+    def _record(self, event: dict):
+        status = event["ResourceStatus"]
+        logical_id = event["LogicalResourceId"]
+        is_stack = (
+            event.get("ResourceType") == "AWS::CloudFormation::Stack"
+            and logical_id == self.stack_name
+        )
+
+        if not is_stack:
+            timing = self.resources.setdefault(
+                logical_id,
+                ResourceTiming(
+                    logical_id=logical_id,
+                    resource_type=event.get("ResourceType", ""),
+                    status=status,
+                ),
+            )
+            timing.status = status
+            if status.endswith("_IN_PROGRESS") and timing.started is None:
+                timing.started = event["Timestamp"]
+            elif not status.endswith("_IN_PROGRESS"):
+                timing.finished = event["Timestamp"]
+
+        if self.result is not None:
+            return
+        # Fail fast: the first failed resource is the root cause, no need to
+        # wait for the rollback to finish
+        if status.endswith("_FAILED") or (is_stack and is_failure_status(status)):
+            self.finish(
+                status,
+                reason=event.get("ResourceStatusReason"),
+                failed_resource=None if is_stack else logical_id,
+            )
+        elif is_stack and status in SUCCESS_STATUSES:
+            self.finish(status)
+
+    def poll(self) -> list[dict]:
+        """
+        New events since the last poll, oldest first. Sets `result` once the stack
+        reaches a final state and schedules the next poll otherwise.
+        """
+        try:
+            events = list(self._events_since_last())
+        except ClientError as e:
+            if not is_throttling_error(e):
+                self.finish("NOT_FOUND", reason=str(e))
+                return []
+            events = []
+            self.delay = MAX_POLL_DELAY
+
+        if events:
+            self.last_event_id = events[0]["EventId"]
+            self.delay = MIN_POLL_DELAY
+        else:
+            self.delay = min(MAX_POLL_DELAY, self.delay * BACKOFF)
+        self.next_poll = time.monotonic() + self.delay * random.uniform(0.8, 1.2)
+
+        events.reverse()
+        for event in events:
+            self._record(event)
+        return events
+
+
+def latest_event_id(stack_name: str, region: Optional[str] = None) -> Optional[str]:
+    """
+    Id of the newest event of the stack, to only watch what happens after it.
+    """
+    client = get_client("cloudformation", region=region)
+    events = client.describe_stack_events(StackName=stack_name)["StackEvents"]
+    return events[0]["EventId"] if events else None
+
+
+def wait_for_stacks(
+    watches: list[StackWatch],
+    timeout: float = STACK_WAIT_TIMEOUT,
+    on_event: Optional[Callable[[str, dict], None]] = None,
+) -> list[StackWaitResult]:
+    """
+    Poll every stack from a single loop until each one completes or fails.
+
+    Stacks are polled when their own (adaptive) delay is due; `on_event` is
+    called with the stack name and each new event as they arrive.
+    """
+    deadline = time.monotonic() + timeout
+    pending = list(watches)
+    while pending:
+        watch = min(pending, key=lambda w: w.next_poll)
+        wait = min(watch.next_poll, deadline) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        if time.monotonic() >= deadline:
+            for watch in pending:
+                watch.finish("TIMED_OUT", reason=f"Still running after {timeout}s")
+            break
+
+        for event in watch.poll():
+            if on_event:
+                on_event(watch.stack_name, event)
+        if watch.result is not None:
+            pending.remove(watch)
+
+    return [watch.result for watch in watches]
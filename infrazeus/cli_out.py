@@ -1,7 +1,7 @@
 import rich
-from rich.console import Console
+from rich.table import Table
 
-console = Console()
+from .output import get_writer
 
 
 def print_stack_outputs(stack_output: dict[str, list], verbose: bool = False):
@@ -21,6 +21,135 @@ def print_stack_outputs(stack_output: dict[str, list], verbose: bool = False):
             rich.print(f"{key}: {stack.get(key)}")
 
 
+def print_fleet_summary(results: list):
+    table = Table(title="Fleet deploy")
+    for column in ["Service", "Stack", "Status", "Seconds", "Detail"]:
+        table.add_column(column)
+    for result in results:
+        status_style = "red" if result.status == "failed" else "green"
+        table.add_row(
+            result.service or result.spec,
+            result.stack_name or "-",
+            f"[{status_style}]{result.status}[/{status_style}]",
+            f"{result.seconds:.1f}",
+            (result.error or "").split("\n")[0] or result.stack_id or "",
+        )
+    get_writer().console.print(table)
+
+
+def print_prune_summary(reports: list):
+    table = Table(title="Task definition prune")
+    for column in ["Family", "Kept", "In use", "Pruned", "Failed", "Detail"]:
+        table.add_column(column)
+    for report in reports:
+        # Deregistered, or that would be on a dry run
+        pruned = len(report.results) - len(report.failed)
+        failed_style = "red" if report.failed or report.error else "green"
+        detail = report.error or next((result.error for result in report.failed), "")
+        table.add_row(
+            report.family,
+            str(len(report.kept)),
+            str(len(report.in_use)),
+            str(pruned),
+            f"[{failed_style}]{len(report.failed)}[/{failed_style}]",
+            (detail or "").split("\n")[0],
+        )
+    get_writer().console.print(table)
+
+
+def print_stack_event(stack_name: str, event: dict):
+    status = event["ResourceStatus"]
+    style = "red" if "FAILED" in status or "ROLLBACK" in status else "green"
+    if status.endswith("_IN_PROGRESS"):
+        style = "yellow"
+    reason = event.get("ResourceStatusReason") or ""
+    get_writer().console.print(
+        f"{stack_name} {event['Timestamp']:%H:%M:%S} "
+        f"{event['LogicalResourceId']} ({event.get('ResourceType', '')}) "
+        f"[{style}]{status}[/{style}] {reason}".rstrip()
+    )
+
+
+def print_stack_wait_report(results: list):
+    for result in results:
+        style = "green" if result.succeeded else "red"
+        table = Table(
+            title=(
+                f"{result.stack_name}: [{style}]{result.status}[/{style}] "
+                f"in {result.seconds:.1f}s"
+            )
+        )
+        for column in ["Resource", "Type", "Status", "Seconds"]:
+            table.add_column(column)
+        resources = sorted(
+            result.resources, key=lambda resource: -(resource.seconds or 0)
+        )
+        for resource in resources:
+            seconds = resource.seconds
+            table.add_row(
+                resource.logical_id,
+                resource.resource_type,
+                resource.status,
+                "-" if seconds is None else f"{seconds:.1f}",
+            )
+        get_writer().console.print(table)
+        if not result.succeeded:
+            failed = f" ({result.failed_resource})" if result.failed_resource else ""
+            rich.print(f"Stack {result.stack_name} failed{failed}: {result.reason}")
+
+
+def print_secret_report(verdicts: list, secrets: list[str]):
+    """
+    Why each variable is (or is not) stored as a secret. `secrets` is the final
+    list, which may come from `--secrets` instead of the classifier.
+    """
+    table = Table(title="Secret classification")
+    for column in ["Variable", "Stored as", "Classifier", "Reasons", "Entropy"]:
+        table.add_column(column)
+    for verdict in verdicts:
+        stored = "secret" if verdict.key in secrets else "parameter"
+        style = "yellow" if stored == "secret" else "green"
+        table.add_row(
+            verdict.key,
+            f"[{style}]{stored}[/{style}]",
+            "secret" if verdict.secret else "-",
+            ", ".join(verdict.reasons),
+            f"{verdict.entropy:.2f}" if verdict.entropy else "",
+        )
+    get_writer().console.print(table)
+
+
+def print_change_set(result):
+    if result.up_to_date:
+        rich.print(f"Stack {result.stack_name} is up to date (same template)")
+        return
+    if not result.has_changes:
+        rich.print(f"No changes for stack {result.stack_name}")
+        return
+    table = Table(title=f"Change set {result.change_set_name}")
+    for column in ["Action", "Resource", "Type", "Replacement"]:
+        table.add_column(column)
+    for change in result.changes:
+        resource = change.get("ResourceChange", {})
+        table.add_row(
+            resource.get("Action", ""),
+            resource.get("LogicalResourceId", ""),
+            resource.get("ResourceType", ""),
+            resource.get("Replacement", "-"),
+        )
+    get_writer().console.print(table)
+
+
+def print_aws_stats():
+    from .aws.clients import client_stats
+
+    stats = client_stats()
+    rich.print(f"AWS sessions created: {stats['sessions']}")
+    rich.print(f"AWS clients created: {stats['clients']}")
+    rich.print(f"AWS connections opened: {stats['connections']}")
+    rich.print(f"AWS API calls: {stats['api_calls']}")
+
+
 def lightning_decorator(n=1):
     def decorator(func):
         def wrapper(*args, **kwargs):
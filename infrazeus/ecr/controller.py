@@ -1,51 +1,101 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-import boto3
 import rich
 from loguru import logger
 
+from ..aws.clients import get_client
+from ..inventory import invalidate_inventory, inventoried
 from ..schema import Service
 
 
 def create_ecr(service: Service) -> dict[str, Any] | None:
-    ecr_client = boto3.client("ecr", region_name=service.region)
+    """
+    Create the service repository. An already existing repository is returned
+    with `AlreadyExists` set; None means the repository could not be created.
+    """
+    ecr_client = get_client("ecr", region=service.region)
 
     logger.info(f"Creating ECR repo named: {service.canonical_name}")
     try:
-        response = ecr_client.create_repository(repositoryName=service.canonical_name)
+        kwargs = {}
+        if service.ecr_scan_on_push is not None:
+            kwargs["imageScanningConfiguration"] = {
+                "scanOnPush": service.ecr_scan_on_push
+            }
+        response = ecr_client.create_repository(
+            repositoryName=service.canonical_name, **kwargs
+        )
+        invalidate_inventory("ecr_repositories")
         return response
     except ecr_client.exceptions.RepositoryAlreadyExistsException:
         rich.print(f"Repository {service.canonical_name} already exists.")
+        repositories = describe_ecr([service.canonical_name], region=service.region)
+        return {"repository": repositories[0], "AlreadyExists": True}
     except Exception as e:
         rich.print(f"An error occurred: {str(e)}")
 
 
-def list_ecr(
-    name_contains: Optional[str] = None, name_equals: Optional[str] = None
-) -> list[dict[str, Any]]:
-    client = boto3.client("ecr")
+def iter_ecr(
+    name_contains: Optional[str] = None, region: Optional[str] = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield the repositories whose name contains `name_contains` (all without it).
 
-    # Initialize the response array
-    repositories: List[Dict[str, Any]] = []
-
-    # Handle pagination in case there are many repositories
+    ECR has no server-side substring filter, so every page is scanned; pages are
+    requested as the caller iterates and can be abandoned early.
+    """
+    client = get_client("ecr", region=region)
     paginator = client.get_paginator("describe_repositories")
     for page in paginator.paginate():
         for repo in page["repositories"]:
-            repo_name = repo["repositoryName"]
+            if not name_contains or name_contains in repo["repositoryName"]:
+                yield repo
 
-            # Filter logic: check if the name should contain a
-            # substring or be equal to a given string
-            if name_contains and name_contains in repo_name:
-                repositories.append(repo)
-            elif name_equals and name_equals == repo_name:
-                repositories.append(repo)
-            elif not name_contains and not name_equals:
-                repositories.append(repo)
 
+def describe_ecr(
+    repository_names: list[str],
+    region: Optional[str] = None,
+    registry_id: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Repositories with exactly these names, looked up server side; missing ones
+    are left out.
+    """
+    client = get_client("ecr", region=region)
+    kwargs = {"registryId": registry_id} if registry_id else {}
+    repositories: List[Dict[str, Any]] = []
+    # A single missing name fails the whole call, so names are described one by
+    # one only when needed
+    try:
+        response = client.describe_repositories(
+            repositoryNames=repository_names, **kwargs
+        )
+        return response["repositories"]
+    except client.exceptions.RepositoryNotFoundException:
+        if len(repository_names) == 1:
+            return []
+    for name in repository_names:
+        repositories.extend(describe_ecr([name], region, registry_id))
     return repositories
 
 
+@inventoried("ecr_repositories")
+def list_ecr(
+    name_contains: Optional[str] = None, name_equals: Optional[str] = None
+) -> list[dict[str, Any]]:
+    if name_equals and not name_contains:
+        # Exact names are resolved by ECR, without listing the account
+        return describe_ecr([name_equals])
+    if name_equals:
+        return [
+            repo
+            for repo in iter_ecr()
+            if name_contains in repo["repositoryName"]
+            or repo["repositoryName"] == name_equals
+        ]
+    return list(iter_ecr(name_contains))
+
+
 if __name__ == "__main__":
     service = Service(
         service_name="allai-chat-front",
@@ -0,0 +1,131 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+from ..aws.clients import get_client
+from ..schema import Service
+
+# batch_get_image accepts at most 100 image ids per call
+BATCH_GET_IMAGE_LIMIT = 100
+MANIFEST_MEDIA_TYPES = [
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+]
+
+
+class ImagePreflightError(RuntimeError):
+    pass
+
+
+class ImageCheck(BaseModel):
+    service: str
+    image: str
+    status: Literal["found", "missing", "no-repository", "no-tag", "failed"]
+    digest: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "found"
+
+
+def _check_repository(
+    registry_id: str, region: str, repository: str, tags: list[str]
+) -> dict[str, tuple[str, Optional[str], Optional[str]]]:
+    """
+    Status, digest and error of each tag of one repository.
+    """
+    ecr_client = get_client("ecr", region=region)
+    found: dict[str, tuple[str, Optional[str], Optional[str]]] = {}
+    for i in range(0, len(tags), BATCH_GET_IMAGE_LIMIT):
+        batch = tags[i : i + BATCH_GET_IMAGE_LIMIT]
+        try:
+            response = ecr_client.batch_get_image(
+                registryId=registry_id,
+                repositoryName=repository,
+                imageIds=[{"imageTag": tag} for tag in batch],
+                acceptedMediaTypes=MANIFEST_MEDIA_TYPES,
+            )
+        except ecr_client.exceptions.RepositoryNotFoundException as e:
+            return {tag: ("no-repository", None, str(e)) for tag in tags}
+
+        for image in response["images"]:
+            image_id = image["imageId"]
+            found[image_id["imageTag"]] = ("found", image_id.get("imageDigest"), None)
+        for failure in response["failures"]:
+            tag = failure["imageId"].get("imageTag")
+            if failure.get("failureCode") == "ImageNotFound":
+                found[tag] = ("missing", None, failure.get("failureReason"))
+            else:
+                found[tag] = ("failed", None, failure.get("failureReason"))
+    return found
+
+
+def check_image_tags(services: list[Service], max_workers: int = 8) -> list[ImageCheck]:
+    """
+    Check that the image of every service exists in ECR.
+
+    Tags are grouped by repository and fetched with one `batch_get_image` call per
+    repository (per 100 tags), the repositories concurrently. Results follow the
+    order of `services`.
+    """
+    repositories: dict[tuple[str, str, str], set[str]] = {}
+    for service in services:
+        if service.docker_tag:
+            key = (service.account_id, service.region, service.ecr_name)
+            repositories.setdefault(key, set()).add(service.docker_tag)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            key: executor.submit(_check_repository, *key, sorted(tags))
+            for key, tags in repositories.items()
+        }
+    statuses = {}
+    for key, future in futures.items():
+        try:
+            statuses[key] = future.result()
+        except Exception as e:
+            statuses[key] = {tag: ("failed", None, str(e)) for tag in repositories[key]}
+
+    checks = []
+    for service in services:
+        if not service.docker_tag:
+            checks.append(
+                ImageCheck(
+                    service=service.canonical_name,
+                    image=service.ecr_image_path,
+                    status="no-tag",
+                    error="The service spec has no docker_tag",
+                )
+            )
+            continue
+        key = (service.account_id, service.region, service.ecr_name)
+        status, digest, error = statuses[key].get(
+            service.docker_tag, ("missing", None, None)
+        )
+        checks.append(
+            ImageCheck(
+                service=service.canonical_name,
+                image=service.ecr_image_path,
+                status=status,
+                digest=digest,
+                error=error,
+            )
+        )
+    return checks
+
+
+def require_image(service: Service) -> ImageCheck:
+    """
+    Check the service image, raising `ImagePreflightError` when it is not usable.
+    """
+    check = check_image_tags([service])[0]
+    if not check.ok:
+        raise ImagePreflightError(
+            f"Image {check.image} is not available ({check.status})"
+            f"{f': {check.error}' if check.error else ''}"
+        )
+    return check
@@ -0,0 +1,197 @@
+import json
+from typing import Any, Literal, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from ..aws.clients import get_client
+from ..schema import Service
+from .controller import iter_ecr
+
+SettingStatus = Literal["updated", "unchanged", "unmanaged"]
+
+
+class ECRSettingsResult(BaseModel):
+    repository: str
+    scan_on_push: SettingStatus = "unmanaged"
+    lifecycle_policy: SettingStatus = "unmanaged"
+    replication: SettingStatus = "unmanaged"
+    # Other repositories matched by the replication prefix of this one
+    replicated_with: list[str] = []
+
+
+def lifecycle_policy(service: Service) -> Optional[dict[str, Any]]:
+    """
+    Lifecycle policy for the service repository, None when the spec sets none.
+    """
+    rules = []
+    if service.ecr_expire_untagged_days:
+        rules.append(
+            {
+                "description": (
+                    f"Expire untagged images after {service.ecr_expire_untagged_days}"
+                    " days"
+                ),
+                "selection": {
+                    "tagStatus": "untagged",
+                    "countType": "sinceImagePushed",
+                    "countUnit": "days",
+                    "countNumber": service.ecr_expire_untagged_days,
+                },
+                "action": {"type": "expire"},
+            }
+        )
+    if service.ecr_keep_tagged_images:
+        rules.append(
+            {
+                "description": (
+                    f"Keep the last {service.ecr_keep_tagged_images} tagged images"
+                ),
+                "selection": {
+                    "tagStatus": "tagged",
+                    "tagPatternList": ["*"],
+                    "countType": "imageCountMoreThan",
+                    "countNumber": service.ecr_keep_tagged_images,
+                },
+                "action": {"type": "expire"},
+            }
+        )
+    if not rules:
+        return None
+    for priority, rule in enumerate(rules, start=1):
+        rule["rulePriority"] = priority
+    return {"rules": rules}
+
+
+def apply_scan_on_push(ecr_client, service: Service) -> SettingStatus:
+    if service.ecr_scan_on_push is None:
+        return "unmanaged"
+    repository = ecr_client.describe_repositories(repositoryNames=[service.ecr_name])[
+        "repositories"
+    ][0]
+    current = repository.get("imageScanningConfiguration", {}).get("scanOnPush")
+    if current == service.ecr_scan_on_push:
+        return "unchanged"
+    ecr_client.put_image_scanning_configuration(
+        repositoryName=service.ecr_name,
+        imageScanningConfiguration={"scanOnPush": service.ecr_scan_on_push},
+    )
+    return "updated"
+
+
+def apply_lifecycle_policy(ecr_client, service: Service) -> SettingStatus:
+    policy = lifecycle_policy(service)
+    if policy is None:
+        return "unmanaged"
+    try:
+        current = json.loads(
+            ecr_client.get_lifecycle_policy(repositoryName=service.ecr_name)[
+                "lifecyclePolicyText"
+            ]
+        )
+    except ecr_client.exceptions.LifecyclePolicyNotFoundException:
+        current = None
+    if current == policy:
+        return "unchanged"
+    ecr_client.put_lifecycle_policy(
+        repositoryName=service.ecr_name, lifecyclePolicyText=json.dumps(policy)
+    )
+    return "updated"
+
+
+def _replication_filter(service: Service) -> list[dict[str, str]]:
+    # ECR only filters by prefix: `api-beta` also matches `api-beta-worker`
+    return [{"filter": service.ecr_name, "filterType": "PREFIX_MATCH"}]
+
+
+def replicated_with(service: Service) -> list[str]:
+    """
+    Other repositories whose names start with this one, and so are replicated by
+    its rule too.
+    """
+    return sorted(
+        repo["repositoryName"]
+        for repo in iter_ecr(service.ecr_name, region=service.region)
+        if repo["repositoryName"].startswith(service.ecr_name)
+        and repo["repositoryName"] != service.ecr_name
+    )
+
+
+def apply_replication(ecr_client, service: Service) -> SettingStatus:
+    """
+    Keep a replication rule for the repository with the spec regions.
+
+    Replication is configured for the whole registry, so only the rule matching
+    this repository is replaced; the rules of other repositories are kept. An
+    empty list of regions removes the rule. Rules match by name prefix, so
+    repositories named after this one plus a suffix are replicated as well.
+    """
+    if service.ecr_replication_regions is None:
+        return "unmanaged"
+
+    registry = ecr_client.describe_registry()
+    rules = registry.get("replicationConfiguration", {}).get("rules", [])
+    repository_filter = _replication_filter(service)
+    others = [
+        rule for rule in rules if rule.get("repositoryFilters") != repository_filter
+    ]
+    current = [
+        rule for rule in rules if rule.get("repositoryFilters") == repository_filter
+    ]
+
+    desired = []
+    if service.ecr_replication_regions:
+        desired = [
+            {
+                "destinations": [
+                    {"region": region, "registryId": registry["registryId"]}
+                    for region in sorted(set(service.ecr_replication_regions))
+                ],
+                "repositoryFilters": repository_filter,
+            }
+        ]
+
+    def destinations(rules: list[dict]) -> set[tuple[str, str]]:
+        return {
+            (destination["region"], destination["registryId"])
+            for rule in rules
+            for destination in rule["destinations"]
+        }
+
+    if len(current) == len(desired) and destinations(current) == destinations(desired):
+        return "unchanged"
+
+    ecr_client.put_replication_configuration(
+        replicationConfiguration={"rules": others + desired}
+    )
+    return "updated"
+
+
+def configure_ecr(service: Service) -> ECRSettingsResult:
+    """
+    Apply the ECR settings of the service spec to its repository.
+
+    Every setting is compared with what the repository has and only written when
+    it differs, so running it again changes nothing. Settings missing from the
+    spec are left as they are.
+    """
+    ecr_client = get_client("ecr", region=service.region)
+    result = ECRSettingsResult(
+        repository=service.ecr_name,
+        scan_on_push=apply_scan_on_push(ecr_client, service),
+        lifecycle_policy=apply_lifecycle_policy(ecr_client, service),
+        replication=apply_replication(ecr_client, service),
+    )
+    if service.ecr_replication_regions:
+        result.replicated_with = replicated_with(service)
+        if result.replicated_with:
+            logger.warning(
+                f"The replication rule of {service.ecr_name} also replicates "
+                f"{', '.join(result.replicated_with)}"
+            )
+    logger.info(
+        f"ECR settings of {service.ecr_name}: scan on push {result.scan_on_push}, "
+        f"lifecycle policy {result.lifecycle_policy}, "
+        f"replication {result.replication}"
+    )
+    return result
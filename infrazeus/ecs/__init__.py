@@ -1 +1,11 @@
-from . import create, list, templates
+import importlib
+
+# Submodules pull in boto3, so they are only imported when first accessed
+# (e.g. `infrazeus.ecs.create`), keeping `infrazeus.ecs.builds` cheap for the CLI.
+_SUBMODULES = ("builds", "create", "list", "templates")
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ECSBuilds(Enum):
+    ECS = "ecs"
+    TASK_DEFINITION = "task_definition"
+    BOTH = "both"
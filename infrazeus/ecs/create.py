@@ -1,70 +1,126 @@
-import sys
-from enum import Enum
 from typing import Any, Literal, Optional
 
-import boto3
 import rich
+from botocore.exceptions import ClientError
 from loguru import logger
 
-from infrazeus.aws.helper import create_stack
+from infrazeus.aws.helper import create_stack, list_stack
 
 from ..alb.controller import get_alb_resources
 from ..alb.helper import get_load_balancer_subnet_ids
-from ..parameters.list import list_parameters, list_secrets
+from ..aws.changesets import ChangeSetResult, update_stack
+from ..ecr.images import require_image
+from ..parameters.list import list_parameters, list_secrets, secret_locations
 from ..schema import ECSService
+from ..template_builder import Template
 from . import templates as t
-from .list import list_task_definition_by_name
+from .builds import ECSBuilds
+from .discovery import DiscoveryError, DiscoveryStep, run_discovery
+from .list import get_latest_task_definition
 
 
-class ECSBuilds(Enum):
-    ECS = "ecs"
-    TASK_DEFINITION = "task_definition"
-    BOTH = "both"
+class ECSDeployError(RuntimeError):
+    pass
 
 
-def main_create_ens(
+def get_alb_resources_from_stack(
+    service: ECSService, verbose: bool = False
+) -> dict[str, Any]:
+    # Try to get alb resources from stack created by infrazeus
+    alb_stack_name = f"{service.service_name}-{service.environment}-alb-stack"
+    try:
+        alb_stack_outputs = list_stack(alb_stack_name)
+    except ClientError as e:
+        raise LookupError(
+            f"Could not find stack: {alb_stack_name}. "
+            "Make sure you created the ALB via infrazeus, "
+            "or reuse an existing one by informing `--alb_name`"
+        ) from e
+    if verbose:
+        rich.print("ALB stack outputs:", alb_stack_outputs)
+
+    alb_resources = alb_stack_outputs["Stacks"][0]["Outputs"]
+    return {output["OutputKey"]: output["OutputValue"] for output in alb_resources}
+
+
+def discovery_steps(
+    service: ECSService,
+    alb_name: Optional[str],
+    build: ECSBuilds,
+    verbose: bool = False,
+    check_image: bool = True,
+) -> list[DiscoveryStep]:
+    """
+    Lookups needed to render the ECS template. Only `secret_names` waits for
+    another step.
+    """
+    if alb_name:
+        # Already existing ALB
+        alb_step = DiscoveryStep("alb", lambda: get_alb_resources(alb_name))
+    else:
+        alb_step = DiscoveryStep(
+            "alb", lambda: get_alb_resources_from_stack(service, verbose)
+        )
+
+    steps = [
+        alb_step,
+        DiscoveryStep(
+            "subnets",
+            lambda: get_load_balancer_subnet_ids(alb_name or service.alb_name),
+        ),
+        DiscoveryStep("parameters", lambda: list_parameters(service), required=False),
+        DiscoveryStep("secrets", lambda: list_secrets(service), required=False),
+        # After `secrets`, so the base secret comes from the secrets cache
+        DiscoveryStep(
+            "secret_names",
+            lambda secrets: secret_locations(service) if secrets else {},
+            requires=["secrets"],
+            required=False,
+        ),
+    ]
+    if build.value == ECSBuilds.ECS.value:
+        steps.append(
+            DiscoveryStep(
+                "task_definition",
+                lambda: get_latest_task_definition(
+                    service.canonical_name, region=service.region
+                ),
+            )
+        )
+    elif check_image:
+        # A missing tag would only show up as a rollout stuck pulling the image
+        steps.append(DiscoveryStep("image", lambda: require_image(service)))
+    return steps
+
+
+def build_ecs_template(
     service: ECSService,
     alb_name: Optional[str] = None,
     build: Literal[
         ECSBuilds.ECS, ECSBuilds.TASK_DEFINITION, ECSBuilds.BOTH
     ] = ECSBuilds.BOTH,
     verbose: bool = False,
-    dry_run: bool = False,
-    stack_sufix: Optional[str] = None,
+    check_image: bool = True,
 ) -> dict[str, Any]:
+    """
+    Discover the service resources and render its CloudFormation template.
 
-    cf_client = boto3.client("cloudformation")
+    Builds that register a task definition first check that the service image
+    tag exists in ECR, unless `check_image` is False.
+    """
+    try:
+        discovered, timings = run_discovery(
+            discovery_steps(service, alb_name, build, verbose, check_image)
+        )
+    except DiscoveryError as e:
+        raise ECSDeployError(str(e.cause)) from e
 
-    # Already existing ALB
-    if alb_name:
-        alb_resources = get_alb_resources(alb_name)
-        if verbose:
-            logger.info(
-                f"Using existing ALB: {alb_name}\nALB Resources: {alb_resources}"
-            )
+    for timing in timings:
+        logger.info(f"Discovery step {timing.name}: {timing.seconds:.2f}s")
 
-    # Try to get alb resources from stack created by infrazeus
-    else:
-        alb_stack_name = f"{service.service_name}-{service.environment}-alb-stack"
-        try:
-            alb_stack_outputs = cf_client.describe_stacks(StackName=alb_stack_name)
-        except cf_client.exceptions.ClientError:
-            logger.error(
-                (
-                    f"Could not find stack: {alb_stack_name}. "
-                    "Make sure you created the ALB via infrazeus, "
-                    "or reuse an existing one by informing `--alb_name`"
-                )
-            )
-            sys.exit(1)
-        if verbose:
-            rich.print("ALB stack outputs:", alb_stack_outputs)
-
-        alb_resources = alb_stack_outputs["Stacks"][0]["Outputs"]
-        alb_resources = {
-            output["OutputKey"]: output["OutputValue"] for output in alb_resources
-        }
-        alb_name = service.alb_name
+    alb_resources = discovered["alb"]
+    if verbose and alb_name:
+        logger.info(f"Using existing ALB: {alb_name}\nALB Resources: {alb_resources}")
 
     target_group_arn = alb_resources["TargetGroupArn"]
     security_group_id = alb_resources["SecurityGroupId"]
@@ -76,7 +132,7 @@ def main_create_ens(
 
     load_balancer_arn = alb_resources["LoadBalancerArn"]
 
-    subnets = get_load_balancer_subnet_ids(alb_name)
+    subnets = discovered["subnets"]
 
     ecr_path = service.ecr_image_path
 
@@ -90,8 +146,6 @@ def main_create_ens(
         rich.print(security_group_id)
         rich.print(load_balancer_arn)
 
-    cf_client = boto3.client("cloudformation")
-
     template_head = t.get_template_head(
         service=service,
         target_group_arn=target_group_arn,
@@ -102,59 +156,108 @@ def main_create_ens(
         cpu=service.cpu,
     )
 
-    task_parameters = list_parameters(service)
-    task_secrets = list_secrets(service)
+    task_parameters = discovered["parameters"]
+    task_secrets = discovered["secrets"]
 
     if not task_parameters:
         logger.warning("No parameters found for this service")
     if not task_secrets:
         logger.warning("No secrets found for this service")
 
+    template = Template().add(template_head)
     if build.value == ECSBuilds.TASK_DEFINITION.value:
-        task_definition_template = t.get_task_definition_template(
-            service=service,
-            parameters=task_parameters,
-            secrets=task_secrets,
+        template = template.add(
+            t.get_task_definition_template(
+                service=service,
+                parameters=task_parameters,
+                secrets=task_secrets,
+                secret_names=discovered["secret_names"],
+            )
         )
-        logger.info(template_head)
-        template_head["Resources"] = task_definition_template["Resources"]
-        template_head["Outputs"] = task_definition_template["Outputs"]
 
     elif build.value == ECSBuilds.ECS.value:
-        task_definition_arn = list_task_definition_by_name(service.canonical_name)
+        task_definition_arn = discovered["task_definition"]
         if not task_definition_arn:
-            logger.error(f"Could not find task definition for {service.canonical_name}")
-            sys.exit()
+            raise ECSDeployError(
+                f"Could not find task definition for {service.canonical_name}"
+            )
 
-        template_head["Parameters"]["ECSTaskDefinition"] = {
-            "Type": "String",
-            "Description": "Task definition to start the ECS task",
-            "Default": task_definition_arn[0],
-        }
-        template_head.update(t.ECS_TEMPLATE)
+        template = template.add_parameter(
+            "ECSTaskDefinition",
+            {
+                "Type": "String",
+                "Description": "Task definition to start the ECS task",
+                "Default": task_definition_arn,
+            },
+        ).add(t.ECS_TEMPLATE)
 
     elif build.value == ECSBuilds.BOTH.value:
         task_definition_template = t.get_task_definition_template(
             service=service,
             parameters=task_parameters,
             secrets=task_secrets,
+            secret_names=discovered["secret_names"],
         )
-        template_head["Resources"] = task_definition_template["Resources"]
-        template_head["Resources"].update(t.ECS_TEMPLATE["Resources"])
-        # template_head["Outputs"] = {}
-        template_head["Outputs"] = task_definition_template["Outputs"]
-        template_head["Outputs"].update(t.ECS_TEMPLATE["Outputs"])
+        template = template.add(task_definition_template).add(t.ECS_TEMPLATE)
 
     else:
         raise ValueError(f"Invalid build type: {build}")
 
-    rich.print("\nCloudform template:")
-    rich.print(template_head)
+    return template.render()
+
+
+def main_create_ens(
+    service: ECSService,
+    alb_name: Optional[str] = None,
+    build: Literal[
+        ECSBuilds.ECS, ECSBuilds.TASK_DEFINITION, ECSBuilds.BOTH
+    ] = ECSBuilds.BOTH,
+    verbose: bool = False,
+    dry_run: bool = False,
+    stack_sufix: Optional[str] = None,
+    show_template: bool = True,
+    check_image: bool = True,
+) -> dict[str, Any]:
+    template = build_ecs_template(service, alb_name, build, verbose, check_image)
+
+    if show_template:
+        rich.print("\nCloudform template:")
+        rich.print(template)
 
     if dry_run:
-        return {}
+        return {"Template": template}
 
     return create_stack(
         stack_name=service.stack_name(suffix=stack_sufix),
-        template=template_head,
+        template=template,
+    )
+
+
+def main_update_ens(
+    service: ECSService,
+    alb_name: Optional[str] = None,
+    build: Literal[
+        ECSBuilds.ECS, ECSBuilds.TASK_DEFINITION, ECSBuilds.BOTH
+    ] = ECSBuilds.BOTH,
+    verbose: bool = False,
+    dry_run: bool = False,
+    stack_sufix: Optional[str] = None,
+    check_image: bool = True,
+) -> ChangeSetResult:
+    """
+    Update the ECS stack through a change set, rendered exactly like `create`.
+
+    Empty change sets are deleted instead of executed, and `dry_run` only
+    describes the changes.
+    """
+    template = build_ecs_template(service, alb_name, build, verbose, check_image)
+
+    if verbose:
+        rich.print("\nCloudform template:")
+        rich.print(template)
+
+    return update_stack(
+        stack_name=service.stack_name(suffix=stack_sufix),
+        template=template,
+        execute=not dry_run,
     )
@@ -0,0 +1,113 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Literal
+
+from loguru import logger
+from pydantic import BaseModel
+
+
+class DiscoveryStep:
+    """
+    A lookup in the discovery graph.
+
+    `func` receives the results of the steps named in `requires` as keyword
+    arguments. A failing `required` step aborts the whole discovery, an optional
+    one just yields None.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        requires: Iterable[str] = (),
+        required: bool = True,
+    ):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.required = required
+
+
+class StepTiming(BaseModel):
+    name: str
+    status: Literal["ok", "failed", "cancelled"]
+    seconds: float
+
+
+class DiscoveryError(Exception):
+    def __init__(self, step: str, cause: BaseException, timings: list[StepTiming]):
+        super().__init__(f"Discovery step '{step}' failed: {cause}")
+        self.step = step
+        self.cause = cause
+        self.timings = timings
+
+
+def _timed(step: DiscoveryStep, kwargs: dict[str, Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    try:
+        return step.func(**kwargs), time.perf_counter() - start
+    except Exception as e:
+        e.elapsed = time.perf_counter() - start
+        raise
+
+
+def run_discovery(
+    steps: list[DiscoveryStep], max_workers: int = 8
+) -> tuple[dict[str, Any], list[StepTiming]]:
+    """
+    Run the steps on a thread pool, each as soon as its requirements are done.
+
+    Returns the results by step name and the timing of every step. Raises
+    `DiscoveryError` on the first failing required step, cancelling what is left.
+    """
+    by_name = {step.name: step for step in steps}
+    for step in steps:
+        missing = set(step.requires) - set(by_name)
+        if missing:
+            raise ValueError(f"Step '{step.name}' requires unknown steps: {missing}")
+
+    results: dict[str, Any] = {}
+    timings: list[StepTiming] = []
+    pending = dict(by_name)
+    running: dict[Future, DiscoveryStep] = {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while pending or running:
+            for name, step in list(pending.items()):
+                if all(dep in results for dep in step.requires):
+                    kwargs = {dep: results[dep] for dep in step.requires}
+                    running[executor.submit(_timed, step, kwargs)] = step
+                    del pending[name]
+
+            if not running:
+                raise ValueError(f"Cyclic discovery steps: {list(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                try:
+                    results[step.name], elapsed = future.result()
+                    timings.append(
+                        StepTiming(name=step.name, status="ok", seconds=elapsed)
+                    )
+                except Exception as e:
+                    elapsed = getattr(e, "elapsed", 0.0)
+                    timings.append(
+                        StepTiming(name=step.name, status="failed", seconds=elapsed)
+                    )
+                    if step.required:
+                        for other in running.values():
+                            timings.append(
+                                StepTiming(
+                                    name=other.name, status="cancelled", seconds=0
+                                )
+                            )
+                        raise DiscoveryError(step.name, e, timings) from e
+                    logger.warning(f"Optional discovery step '{step.name}' failed: {e}")
+                    results[step.name] = None
+    finally:
+        # Fail fast: don't wait for lookups whose result is no longer needed
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, timings
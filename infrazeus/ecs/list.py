@@ -1,21 +1,67 @@
-import boto3
+from typing import Iterator, Literal, Optional
 
+from botocore.exceptions import ClientError
 
-def list_task_definition_by_name(task_name: str) -> list[str]:
+from ..aws.clients import get_client
+from ..inventory import inventoried
+
+
+def task_definition_family(task_definition_arn: str) -> str:
     """
-    List task definitions with the specified name.
+    Family of a task definition ARN (`...:task-definition/<family>:<revision>`).
+    """
+    return task_definition_arn.rsplit("/", 1)[-1].rsplit(":", 1)[0]
 
-    :param task_name: The name of the task definitions to list.
-    :return: A list of task definition ARNs.
+
+def iter_task_definitions(
+    family: str,
+    status: Literal["ACTIVE", "INACTIVE"] = "ACTIVE",
+    sort: Literal["ASC", "DESC"] = "DESC",
+    exact: bool = True,
+    region: Optional[str] = None,
+) -> Iterator[str]:
     """
-    ecs_client = boto3.client("ecs")
-    task_definitions = []
+    Yield the task definition ARNs of a family, newest first by default.
 
-    # Paginator can help with handling more than 100 results
+    Pages are requested as the caller iterates, so stopping early (e.g. with
+    `itertools.islice`) skips the remaining pages. `familyPrefix` also matches
+    other families starting with the same name; with `exact` they are skipped.
+    """
+    ecs_client = get_client("ecs", region=region)
     paginator = ecs_client.get_paginator("list_task_definitions")
-    for page in paginator.paginate(
-        familyPrefix=task_name, status="ACTIVE", sort="DESC"
-    ):
-        task_definitions.extend(page["taskDefinitionArns"])
+    for page in paginator.paginate(familyPrefix=family, status=status, sort=sort):
+        for task_definition_arn in page["taskDefinitionArns"]:
+            if exact and task_definition_family(task_definition_arn) != family:
+                continue
+            yield task_definition_arn
+
+
+@inventoried("task_definition_latest")
+def get_latest_task_definition(
+    family: str, region: Optional[str] = None
+) -> Optional[str]:
+    """
+    ARN of the latest ACTIVE revision of exactly this family, or None.
+
+    Describing a task definition by its bare family resolves the latest revision
+    server side, in a single call however many revisions there are.
+    """
+    ecs_client = get_client("ecs", region=region)
+    try:
+        response = ecs_client.describe_task_definition(taskDefinition=family)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == "ClientException":
+            return None
+        raise
+    return response["taskDefinition"]["taskDefinitionArn"]
 
-    return task_definitions
+
+@inventoried("task_definitions")
+def list_task_definition_by_name(task_name: str) -> list[str]:
+    """
+    List the ACTIVE task definitions of the family, newest first.
+
+    :param task_name: The family of the task definitions to list.
+    :return: A list of task definition ARNs.
+    """
+    return list(iter_task_definitions(task_name))
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from ..aws.clients import get_client
+from ..aws.throttle import TokenBucket, call_with_retries, throttled_client
+from ..inventory import invalidate_inventory
+from ..schema import ECSService
+from .list import iter_task_definitions
+
+# DeregisterTaskDefinition has a low per account and region quota, shared by
+# every family pruned in the same run
+ECS_DEREGISTER_TPS = float(os.getenv("INFRAZEUS_ECS_DEREGISTER_TPS", "5"))
+DEFAULT_KEEP = int(os.getenv("INFRAZEUS_PRUNE_KEEP", "10"))
+
+# describe_services accepts at most 10 services per call
+DESCRIBE_SERVICES_BATCH = 10
+
+
+class RevisionPruneResult(BaseModel):
+    task_definition_arn: str
+    status: Literal["deregistered", "dry-run", "failed"]
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class FamilyPruneReport(BaseModel):
+    family: str
+    region: Optional[str] = None
+    kept: list[str] = []
+    in_use: list[str] = []
+    results: list[RevisionPruneResult] = []
+    error: Optional[str] = None
+
+    @property
+    def deregistered(self) -> list[RevisionPruneResult]:
+        return [result for result in self.results if result.status == "deregistered"]
+
+    @property
+    def failed(self) -> list[RevisionPruneResult]:
+        return [result for result in self.results if result.status == "failed"]
+
+
+def revision_number(task_definition_arn: str) -> int:
+    return int(task_definition_arn.rsplit(":", 1)[-1])
+
+
+def task_definitions_in_use(cluster: Optional[str], region: Optional[str]) -> set[str]:
+    """
+    Task definitions of every service in the cluster, including those of
+    deployments still rolling out or back.
+    """
+    ecs_client = get_client("ecs", region=region)
+    cluster = cluster or "default"
+
+    service_arns: list[str] = []
+    paginator = ecs_client.get_paginator("list_services")
+    for page in paginator.paginate(cluster=cluster):
+        service_arns.extend(page["serviceArns"])
+
+    in_use: set[str] = set()
+    for i in range(0, len(service_arns), DESCRIBE_SERVICES_BATCH):
+        response = ecs_client.describe_services(
+            cluster=cluster, services=service_arns[i : i + DESCRIBE_SERVICES_BATCH]
+        )
+        for service in response["services"]:
+            in_use.add(service["taskDefinition"])
+            for deployment in service.get("deployments", []):
+                in_use.add(deployment["taskDefinition"])
+    return in_use
+
+
+def list_clusters(region: Optional[str]) -> list[str]:
+    ecs_client = get_client("ecs", region=region)
+    cluster_arns: list[str] = []
+    for page in ecs_client.get_paginator("list_clusters").paginate():
+        cluster_arns.extend(page["clusterArns"])
+    return cluster_arns
+
+
+def plan_prune(
+    revisions: list[str], keep: int, in_use: set[str]
+) -> tuple[list[str], list[str], list[str]]:
+    """
+    Split the revisions of a family into kept (the newest `keep`), in use and
+    prunable ones.
+    """
+    revisions = sorted(revisions, key=revision_number, reverse=True)
+    kept = revisions[:keep]
+    protected = [arn for arn in revisions[keep:] if arn in in_use]
+    prunable = [arn for arn in revisions[keep:] if arn not in in_use]
+    return kept, protected, prunable
+
+
+def _deregister(
+    ecs_client, task_definition_arn: str, limiter: TokenBucket, dry_run: bool
+) -> RevisionPruneResult:
+    if dry_run:
+        return RevisionPruneResult(
+            task_definition_arn=task_definition_arn, status="dry-run"
+        )
+    try:
+        _, attempts = call_with_retries(
+            ecs_client.deregister_task_definition,
+            limiter=limiter,
+            taskDefinition=task_definition_arn,
+        )
+    except Exception as e:
+        return RevisionPruneResult(
+            task_definition_arn=task_definition_arn, status="failed", error=str(e)
+        )
+    return RevisionPruneResult(
+        task_definition_arn=task_definition_arn,
+        status="deregistered",
+        attempts=attempts,
+    )
+
+
+class _InUseCache:
+    """
+    In use task definitions per (cluster, region), looked up once per prune run.
+    """
+
+    def __init__(
+        self, clusters: Optional[list[str]] = None, all_clusters: bool = False
+    ):
+        self.clusters = clusters or []
+        self.all_clusters = all_clusters
+        self._lock = threading.Lock()
+        self._clusters: dict[tuple, set[str]] = {}
+        self._region_clusters: dict[Optional[str], list[str]] = {}
+
+    def _get(self, cluster: Optional[str], region: Optional[str]) -> set[str]:
+        key = (cluster or "default", region)
+        with self._lock:
+            if key not in self._clusters:
+                self._clusters[key] = task_definitions_in_use(cluster, region)
+            return self._clusters[key]
+
+    def get(self, cluster: Optional[str], region: Optional[str]) -> set[str]:
+        """
+        Task definitions used in the service cluster and the extra clusters.
+        """
+        clusters = [cluster or "default", *self.clusters]
+        if self.all_clusters:
+            with self._lock:
+                if region not in self._region_clusters:
+                    self._region_clusters[region] = list_clusters(region)
+                clusters = self._region_clusters[region]
+        in_use: set[str] = set()
+        for name in dict.fromkeys(clusters):
+            in_use |= self._get(name, region)
+        return in_use
+
+
+def prune_task_definitions(
+    services: list[ECSService],
+    keep: int = DEFAULT_KEEP,
+    dry_run: bool = False,
+    tps: float = ECS_DEREGISTER_TPS,
+    max_workers: int = 8,
+    clusters: Optional[list[str]] = None,
+    all_clusters: bool = False,
+) -> list[FamilyPruneReport]:
+    """
+    Deregister old task definition revisions of each service family.
+
+    The newest `keep` revisions, and any revision used by a service of the
+    service cluster, of `clusters` or, with `all_clusters`, of every cluster in
+    the region, are kept. Revisions only used by standalone tasks (`RunTask`,
+    scheduled tasks) or by services in other regions or accounts are not seen.
+    Deregistrations of all families run through one worker pool and share a
+    token bucket of `tps` calls per second; throttled calls are retried with
+    jitter.
+    """
+    if keep < 1:
+        raise ValueError(f"At least one revision must be kept, got {keep}")
+
+    limiter = TokenBucket(rate=tps)
+    in_use_cache = _InUseCache(clusters, all_clusters)
+    reports: list[FamilyPruneReport] = []
+    pending = []
+    seen: set[tuple] = set()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for service in services:
+            family = service.canonical_name
+            # Several specs (e.g. a fleet with stack suffixes) can share a family
+            if (family, service.region) in seen:
+                continue
+            seen.add((family, service.region))
+            report = FamilyPruneReport(family=family, region=service.region)
+            reports.append(report)
+            try:
+                revisions = list(iter_task_definitions(family, region=service.region))
+                in_use = in_use_cache.get(service.cluster, service.region)
+            except Exception as e:
+                logger.error(f"{family}: {e}")
+                report.error = str(e)
+                continue
+
+            report.kept, report.in_use, prunable = plan_prune(revisions, keep, in_use)
+            logger.info(
+                f"{family}: {len(revisions)} active revisions, "
+                f"{len(prunable)} to deregister"
+            )
+            ecs_client = throttled_client("ecs", region=service.region)
+            pending.append(
+                (
+                    report,
+                    [
+                        executor.submit(_deregister, ecs_client, arn, limiter, dry_run)
+                        for arn in prunable
+                    ],
+                )
+            )
+
+        for report, futures in pending:
+            report.results = [future.result() for future in futures]
+
+    if not dry_run and any(report.deregistered for report in reports):
+        invalidate_inventory("task_definitions")
+        invalidate_inventory("task_definition_latest")
+    logger.info(f"Prune finished in {time.perf_counter() - start:.1f}s")
+    return reports
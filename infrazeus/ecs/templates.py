@@ -1,6 +1,7 @@
 from typing import Any, Optional
 
 from ..schema import ECSService
+from ..template_builder import freeze
 
 
 # %%
@@ -79,7 +80,13 @@ def get_task_definition_template(
     service: ECSService,
     secrets: Optional[dict[str, Any]] = None,
     parameters: Optional[dict[str, Any]] = None,
+    secret_names: Optional[dict[str, str]] = None,
 ):
+    """
+    Task definition fragment. Each secret is read from the secret named in
+    `secret_names` (its shard), the service secret by default.
+    """
+    secret_names = secret_names or {}
     container_definitions = {
         "Name": {"Ref": "ServiceName"},
         "Image": {"Ref": "ECRImage"},
@@ -118,7 +125,8 @@ def get_task_definition_template(
                 "Name": key,
                 "ValueFrom": (
                     f"arn:aws:secretsmanager:{service.region}:"
-                    f"{service.account_id}:secret:{service.canonical_name}:{key}::"
+                    f"{service.account_id}:secret:"
+                    f"{secret_names.get(key, service.canonical_name)}:{key}::"
                 ),
             }
             for key in secrets.keys()
@@ -150,50 +158,53 @@ def get_task_definition_template(
     return task_definition_template
 
 
-ECS_TEMPLATE = {
-    "Resources": {
-        "ECSService": {
-            "Type": "AWS::ECS::Service",
-            "Properties": {
-                "ServiceName": {"Ref": "ServiceName"},
-                "Cluster": {"Ref": "ClusterName"},
-                "TaskDefinition": {"Ref": "ECSTaskDefinition"},
-                "DesiredCount": 1,  # Adjust as needed
-                "LaunchType": "FARGATE",
-                "SchedulingStrategy": "REPLICA",
-                "NetworkConfiguration": {
-                    "AwsvpcConfiguration": {
-                        "AssignPublicIp": "ENABLED",
-                        "SecurityGroups": {"Ref": "SecurityGroup"},
-                        "Subnets": {"Ref": "Subnets"},
-                    }
-                },
-                "LoadBalancers": [
-                    {
-                        "ContainerName": {"Ref": "ServiceName"},
-                        "ContainerPort": {"Ref": "ContainerPort"},
-                        "TargetGroupArn": {
-                            "Ref": "TargetGroup"
-                        },  # This should be a parameter or a resource reference
-                    }
-                ],
-                "PlatformVersion": "LATEST",
-                "DeploymentConfiguration": {
-                    "MaximumPercent": 200,
-                    "MinimumHealthyPercent": 100,
-                    "DeploymentCircuitBreaker": {"Enable": True, "Rollback": True},
+# Shared by every rendered service, hence read-only
+ECS_TEMPLATE = freeze(
+    {
+        "Resources": {
+            "ECSService": {
+                "Type": "AWS::ECS::Service",
+                "Properties": {
+                    "ServiceName": {"Ref": "ServiceName"},
+                    "Cluster": {"Ref": "ClusterName"},
+                    "TaskDefinition": {"Ref": "ECSTaskDefinition"},
+                    "DesiredCount": 1,  # Adjust as needed
+                    "LaunchType": "FARGATE",
+                    "SchedulingStrategy": "REPLICA",
+                    "NetworkConfiguration": {
+                        "AwsvpcConfiguration": {
+                            "AssignPublicIp": "ENABLED",
+                            "SecurityGroups": {"Ref": "SecurityGroup"},
+                            "Subnets": {"Ref": "Subnets"},
+                        }
+                    },
+                    "LoadBalancers": [
+                        {
+                            "ContainerName": {"Ref": "ServiceName"},
+                            "ContainerPort": {"Ref": "ContainerPort"},
+                            "TargetGroupArn": {
+                                "Ref": "TargetGroup"
+                            },  # This should be a parameter or a resource reference
+                        }
+                    ],
+                    "PlatformVersion": "LATEST",
+                    "DeploymentConfiguration": {
+                        "MaximumPercent": 200,
+                        "MinimumHealthyPercent": 100,
+                        "DeploymentCircuitBreaker": {"Enable": True, "Rollback": True},
+                    },
+                    "DeploymentController": {"Type": "ECS"},
+                    "ServiceConnectConfiguration": {"Enabled": False},
+                    "Tags": [],
+                    "EnableECSManagedTags": False,
                 },
-                "DeploymentController": {"Type": "ECS"},
-                "ServiceConnectConfiguration": {"Enabled": False},
-                "Tags": [],
-                "EnableECSManagedTags": False,
             },
         },
-    },
-    "Outputs": {
-        "ServiceName": {
-            "Description": "The name of the ECS service",
-            "Value": {"Ref": "ECSService"},
+        "Outputs": {
+            "ServiceName": {
+                "Description": "The name of the ECS service",
+                "Value": {"Ref": "ECSService"},
+            },
         },
-    },
-}
+    }
+)
@@ -0,0 +1,190 @@
+import glob
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from .ecs.builds import ECSBuilds
+from .schema import ECSService
+
+
+class FleetResult(BaseModel):
+    spec: str
+    service: Optional[str] = None
+    stack_name: Optional[str] = None
+    status: Literal["deployed", "unchanged", "complete", "dry-run", "failed"]
+    seconds: float = 0.0
+    stack_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+def find_specs(target: str) -> list[Path]:
+    """
+    Service specs from a directory (`*.json` inside it), a glob or a single file.
+    """
+    path = Path(target)
+    if path.is_dir():
+        return sorted(path.glob("*.json"))
+    if path.is_file():
+        return [path]
+    return sorted(Path(match) for match in glob.glob(target, recursive=True))
+
+
+def load_fleet(
+    paths: list[Path],
+) -> tuple[list[tuple[Path, ECSService]], list[FleetResult]]:
+    """
+    Parse every spec up front so invalid ones are reported before anything deploys.
+    """
+    services, failures = [], []
+    for path in paths:
+        try:
+            services.append((path, ECSService.from_path(path)))
+        except Exception as e:
+            failures.append(FleetResult(spec=str(path), status="failed", error=str(e)))
+    return services, failures
+
+
+def _deploy_one(
+    path: Path,
+    service: ECSService,
+    build: ECSBuilds,
+    dry_run: bool,
+    stack_suffix: Optional[str],
+    verbose: bool,
+) -> FleetResult:
+    from .ecs.create import main_create_ens
+
+    stack_name = service.stack_name(suffix=stack_suffix)
+    start = time.perf_counter()
+    try:
+        response = main_create_ens(
+            service=service,
+            build=build,
+            verbose=verbose,
+            dry_run=dry_run,
+            stack_sufix=stack_suffix,
+            show_template=verbose,
+            # Checked for the whole fleet at once by `preflight_images`
+            check_image=False,
+        )
+    except Exception as e:
+        logger.error(f"{service.canonical_name}: {e}")
+        return FleetResult(
+            spec=str(path),
+            service=service.canonical_name,
+            stack_name=stack_name,
+            status="failed",
+            seconds=time.perf_counter() - start,
+            error=str(e),
+        )
+    status = "deployed"
+    if dry_run:
+        status = "dry-run"
+    elif (response or {}).get("Unchanged"):
+        status = "unchanged"
+    return FleetResult(
+        spec=str(path),
+        service=service.canonical_name,
+        stack_name=stack_name,
+        status=status,
+        seconds=time.perf_counter() - start,
+        stack_id=(response or {}).get("StackId"),
+    )
+
+
+def deploy_fleet(
+    services: list[tuple[Path, ECSService]],
+    build: ECSBuilds = ECSBuilds.BOTH,
+    concurrency: int = 8,
+    dry_run: bool = False,
+    stack_suffix: Optional[str] = None,
+    verbose: bool = False,
+    wait: bool = False,
+    on_event: Optional[Callable[[str, dict], None]] = None,
+    check_images: bool = True,
+) -> list[FleetResult]:
+    """
+    Deploy the ECS stacks of many services, at most `concurrency` at a time.
+
+    All deploys run in this process, so they share the AWS clients, the cached
+    identity and the memoized ALB, VPC and certificate lookups. With `wait`, every
+    created stack is then watched from a single polling loop.
+
+    Unless `check_images` is False, the image tags of every service are checked
+    first, with one ECR call per repository, and services without their image
+    fail before any stack is touched.
+    """
+    failures: list[FleetResult] = []
+    if check_images and build.value != ECSBuilds.ECS.value:
+        services, failures = preflight_images(services)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(
+                _deploy_one, path, service, build, dry_run, stack_suffix, verbose
+            )
+            for path, service in services
+        ]
+        results = [future.result() for future in futures]
+
+    if wait:
+        wait_for_fleet(results, on_event=on_event)
+    return failures + results
+
+
+def preflight_images(
+    services: list[tuple[Path, ECSService]],
+) -> tuple[list[tuple[Path, ECSService]], list[FleetResult]]:
+    """
+    Split the services into those whose image exists and failed results for the
+    others.
+    """
+    from .ecr.images import check_image_tags
+
+    checks = check_image_tags([service for _, service in services])
+    ready, failures = [], []
+    for (path, service), check in zip(services, checks):
+        if check.ok:
+            ready.append((path, service))
+            continue
+        error = f"Image {check.image} is not available ({check.status})"
+        logger.error(f"{service.canonical_name}: {error}")
+        failures.append(
+            FleetResult(
+                spec=str(path),
+                service=service.canonical_name,
+                status="failed",
+                error=f"{error}: {check.error}" if check.error else error,
+            )
+        )
+    return ready, failures
+
+
+def wait_for_fleet(
+    results: list[FleetResult],
+    on_event: Optional[Callable[[str, dict], None]] = None,
+):
+    """
+    Wait for the deployed stacks, updating their results in place.
+    """
+    from .aws.waiter import StackWatch, wait_for_stacks
+
+    deployed = [r for r in results if r.status == "deployed" and r.stack_id]
+    stack_results = wait_for_stacks(
+        [StackWatch(result.stack_id) for result in deployed], on_event=on_event
+    )
+    for result, stack_result in zip(deployed, stack_results):
+        result.seconds += stack_result.seconds
+        if stack_result.succeeded:
+            result.status = "complete"
+            continue
+        result.status = "failed"
+        failed = stack_result.failed_resource
+        result.error = (
+            f"{stack_result.status}{f' ({failed})' if failed else ''}: "
+            f"{stack_result.reason}"
+        )
@@ -0,0 +1,270 @@
+import functools
+import importlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from .paths import user_cache_dir
+
+INVENTORY_FILE = "inventory.sqlite3"
+
+# Seconds an inventoried lookup is served from the local cache, per resource type
+DEFAULT_TTLS = {
+    "certificates": 6 * 60 * 60,
+    "vpc_networks": 60 * 60,
+    "load_balancers": 10 * 60,
+    "ecr_repositories": 10 * 60,
+    "task_definitions": 5 * 60,
+    "task_definition_latest": 5 * 60,
+    "stacks": 30,
+}
+
+# Modules whose lookups are decorated with `inventoried`, imported on refresh
+LOADER_MODULES = [
+    "infrazeus.aws.helper",
+    "infrazeus.aws.vpc",
+    "infrazeus.alb.resolver",
+    "infrazeus.ecr.controller",
+    "infrazeus.ecs.list",
+]
+
+_enabled = os.getenv("INFRAZEUS_INVENTORY", "0") == "1"
+_loaders: dict[str, Callable[..., Any]] = {}
+
+DATETIME_KEY = "__datetime__"
+
+
+def _encode(value: Any) -> Any:
+    # Datetimes (e.g. CreationTime) are tagged so they come back as datetimes,
+    # anything else JSON can't hold is stored as its string
+    if isinstance(value, datetime):
+        return {DATETIME_KEY: value.isoformat()}
+    return str(value)
+
+
+def _decode(value: dict[str, Any]) -> Any:
+    if len(value) == 1 and DATETIME_KEY in value:
+        return datetime.fromisoformat(value[DATETIME_KEY])
+    return value
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode)
+
+
+def loads(payload: str) -> Any:
+    return json.loads(payload, object_hook=_decode)
+
+
+class Inventory:
+    """
+    Local SQLite store of AWS lookups, keyed by resource type and call arguments.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttls: Optional[dict] = None):
+        self.path = path or user_cache_dir() / INVENTORY_FILE
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS resources ("
+                " kind TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " args TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (kind, key))"
+            )
+        return self._connection
+
+    def ttl(self, kind: str) -> float:
+        return self.ttls.get(kind, 0)
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT payload, fetched_at FROM resources WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl(kind):
+            return None
+        return loads(row[0])
+
+    def put(self, kind: str, key: str, args: str, payload: Any):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?)",
+                (kind, key, args, dumps(payload), time.time()),
+            )
+
+    def entries(self, kinds: Optional[list[str]] = None) -> list[tuple]:
+        query = "SELECT kind, key, args, fetched_at FROM resources"
+        params: list[str] = []
+        if kinds:
+            query += f" WHERE kind IN ({', '.join('?' * len(kinds))})"
+            params = kinds
+        with self._lock:
+            return self.connection.execute(query, params).fetchall()
+
+    def invalidate(self, kind: Optional[str] = None, key: Optional[str] = None):
+        query, params = "DELETE FROM resources", []
+        if kind:
+            query, params = query + " WHERE kind = ?", [kind]
+            if key:
+                query, params = query + " AND key = ?", [kind, key]
+        with self._lock, self.connection:
+            self.connection.execute(query, params)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        now = time.time()
+        stats: dict[str, dict[str, Any]] = {}
+        for kind, _, _, fetched_at in self.entries():
+            kind_stats = stats.setdefault(
+                kind, {"entries": 0, "stale": 0, "oldest_seconds": 0.0}
+            )
+            age = now - fetched_at
+            kind_stats["entries"] += 1
+            kind_stats["stale"] += age > self.ttl(kind)
+            kind_stats["oldest_seconds"] = max(kind_stats["oldest_seconds"], age)
+        return stats
+
+
+_inventory: Optional[Inventory] = None
+
+
+def get_inventory() -> Inventory:
+    global _inventory
+    if _inventory is None:
+        _inventory = Inventory()
+    return _inventory
+
+
+def enable_inventory(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+
+def inventory_enabled() -> bool:
+    return _enabled
+
+
+def inventory_exists() -> bool:
+    return (user_cache_dir() / INVENTORY_FILE).exists()
+
+
+def invalidate_inventory(kind: Optional[str] = None, key: Optional[str] = None):
+    """
+    Drop stored lookups after a write to AWS.
+
+    Nothing is created when the inventory is disabled and was never used. Errors
+    are only logged: the AWS write they follow already succeeded.
+    """
+    if not (_enabled or inventory_exists()):
+        return
+    try:
+        get_inventory().invalidate(kind, key)
+    except sqlite3.Error as e:
+        logger.warning(f"Could not invalidate the {kind or 'whole'} inventory: {e}")
+
+
+def _call_context() -> list[Optional[str]]:
+    from .aws.clients import default_profile, get_session
+
+    # The default region/profile are part of the key: they change what a call returns
+    return [default_profile(), get_session().region_name]
+
+
+def _call_key(args: tuple, kwargs: dict) -> str:
+    return json.dumps([_call_context(), args, kwargs], sort_keys=True, default=str)
+
+
+def inventoried(kind: str):
+    """
+    Serve the decorated lookup from the inventory while it is fresh.
+
+    The lookup must take JSON-serializable arguments and return JSON-serializable
+    data; datetimes are kept, other values are stored as strings. Nothing is read
+    or stored unless the inventory is enabled. Entries are keyed by kind and
+    arguments only, so each kind belongs to a single lookup.
+    """
+
+    def decorator(func):
+        loader = _loaders.get(kind)
+        if loader is not None and (loader.__module__, loader.__qualname__) != (
+            func.__module__,
+            func.__qualname__,
+        ):
+            raise ValueError(
+                f"Inventory kind {kind} is already used by "
+                f"{loader.__module__}.{loader.__qualname__}"
+            )
+        _loaders[kind] = func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            key = _call_key(args, kwargs)
+            cached = get_inventory().get(kind, key)
+            if cached is not None:
+                return cached
+
+            value = func(*args, **kwargs)
+            get_inventory().put(
+                kind, key, json.dumps([args, kwargs], default=str), value
+            )
+            # Return exactly what a cache hit would return
+            return loads(dumps(value))
+
+        return wrapper
+
+    return decorator
+
+
+def refresh_inventory(
+    kinds: Optional[list[str]] = None, only_stale: bool = True
+) -> dict[str, int]:
+    """
+    Re-run the stored lookups (only the expired ones by default).
+
+    Returns how many entries were refreshed per resource type.
+    """
+    for module in LOADER_MODULES:
+        importlib.import_module(module)
+
+    inventory = get_inventory()
+    refreshed: dict[str, int] = {}
+    context = _call_context()
+    now = time.time()
+    for kind, key, stored_args, fetched_at in inventory.entries(kinds):
+        if only_stale and now - fetched_at <= inventory.ttl(kind):
+            continue
+        # Entries stored under another profile/region can't be reloaded from here
+        if json.loads(key)[0] != context:
+            continue
+        loader = _loaders.get(kind)
+        if loader is None:
+            continue
+        args, kwargs = json.loads(stored_args)
+        try:
+            value = loader(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Could not refresh {kind} {args} {kwargs}: {e}")
+            inventory.invalidate(kind, key)
+            continue
+        inventory.put(kind, key, stored_args, value)
+        refreshed[kind] = refreshed.get(kind, 0) + 1
+    return refreshed
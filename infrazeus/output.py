@@ -0,0 +1,158 @@
+import json
+import sys
+from enum import Enum
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Optional, TextIO
+
+# pydantic and rich are imported on first use: this module is loaded by the CLI
+# entrypoint, before any command runs.
+
+
+class OutputFormat(str, Enum):
+    TEXT = "text"
+    JSON = "json"
+    YAML = "yaml"
+
+
+def to_plain(value: Any) -> Any:
+    """
+    JSON-compatible version of a result (models, datetimes, frozen templates...).
+    """
+    from pydantic_core import to_jsonable_python
+
+    from .template_builder import thaw
+
+    return to_jsonable_python(thaw(value), fallback=str)
+
+
+class OutputWriter:
+    """
+    Writes command results straight to a stream, without building rich renderables.
+
+    Every result is wrapped in the same envelope: `{"command", "ok", "result"}`.
+    JSON results are written one envelope per line and YAML results as one
+    document each, so commands that emit several results stay parseable.
+    """
+
+    def __init__(
+        self,
+        output_format: OutputFormat = OutputFormat.TEXT,
+        stream: Optional[TextIO] = None,
+        quiet: bool = False,
+        owns_stream: bool = False,
+    ):
+        self.output_format = output_format
+        self.stream = stream or sys.stdout
+        self.quiet = quiet
+        self._owns_stream = owns_stream
+        self._console = None
+
+    @property
+    def machine(self) -> bool:
+        return self.output_format != OutputFormat.TEXT
+
+    @property
+    def to_stdout(self) -> bool:
+        return self.stream is sys.stdout
+
+    def emit(self, command: str, result: Any, ok: bool = True):
+        if self.output_format == OutputFormat.TEXT:
+            # Rich already showed the result, unless it is silenced or redirected
+            if self.quiet or not self.to_stdout:
+                self._write_text(result)
+        else:
+            envelope = {"command": command, "ok": ok, "result": result}
+            if self.output_format == OutputFormat.JSON:
+                self._write_json(envelope)
+            else:
+                self._write_yaml(envelope)
+        self.stream.flush()
+
+    def _write_json(self, envelope: dict[str, Any]):
+        # json.dump writes the encoder chunks as they are produced
+        json.dump(envelope, self.stream, default=_json_default)
+        self.stream.write("\n")
+
+    def _write_yaml(self, envelope: dict[str, Any]):
+        try:
+            import yaml
+        except ImportError as e:
+            raise RuntimeError(
+                "YAML output requires PyYAML: pip install 'infrazeus[yaml]'"
+            ) from e
+
+        yaml.safe_dump(
+            to_plain(envelope), self.stream, explicit_start=True, sort_keys=False
+        )
+
+    def _write_text(self, result: Any):
+        # One line per key or item; nested values as compact JSON
+        result = to_plain(result)
+        if isinstance(result, dict):
+            lines = [f"{key}: {_text(value)}" for key, value in result.items()]
+        elif isinstance(result, list):
+            lines = [_text(item) for item in result]
+        else:
+            lines = [_text(result)]
+        for line in lines:
+            self.stream.write(f"{line}\n")
+
+    @property
+    def console(self):
+        """
+        Rich console for human output: stderr when results go to stdout as
+        JSON/YAML, a sink in quiet mode.
+        """
+        if self._console is None:
+            from rich.console import Console
+
+            if self.quiet:
+                self._console = Console(quiet=True)
+            elif self.machine and self.to_stdout:
+                self._console = Console(stderr=True)
+            else:
+                self._console = Console()
+        return self._console
+
+    def close(self):
+        if self._owns_stream:
+            self.stream.close()
+
+
+def _json_default(value: Any) -> Any:
+    from pydantic_core import to_jsonable_python
+
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    return to_jsonable_python(value, fallback=str)
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return str(value)
+
+
+_writer = OutputWriter()
+
+
+def configure_output(
+    output_format: OutputFormat = OutputFormat.TEXT,
+    out_file: Optional[Path] = None,
+    quiet: bool = False,
+) -> OutputWriter:
+    global _writer
+    stream = open(out_file, "w", encoding="utf-8") if out_file else None
+    _writer = OutputWriter(
+        output_format, stream=stream, quiet=quiet, owns_stream=stream is not None
+    )
+    return _writer
+
+
+def get_writer() -> OutputWriter:
+    return _writer
+
+
+def emit(command: str, result: Any, ok: bool = True):
+    _writer.emit(command, result, ok=ok)
@@ -1,86 +1,220 @@
 import json
-from typing import Any, Dict, Optional
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Literal, Optional
 
-import boto3
+from loguru import logger
+from pydantic import BaseModel
 
+from ..aws.clients import get_client
+from ..aws.throttle import TokenBucket, call_with_retries, throttled_client
 from ..schema import Service
+from .classifier import get_classifier
+from .secrets_cache import get_secrets_cache
+from .shards import (
+    SHARD_MANIFEST_KEY,
+    plan_shards,
+    read_manifest,
+    shard_manifest,
+    shard_name,
+)
+
+# Default PutParameter throughput quota; raise it for accounts with higher throughput
+SSM_PUT_TPS = float(os.getenv("INFRAZEUS_SSM_PUT_TPS", "3"))
 
 
 def detect_secrets_with_ai(service_variables: dict[str, str]):
-    secret_keywords = ["mongodb_uri", "password", "api_key", "secret", "token", "key"]
-    secret_dict = {
-        key: value
-        for key, value in service_variables.items()
-        if any(keyword in key.lower() for keyword in secret_keywords)
-    }
-    return secret_dict
+    # Names, known value formats and entropy; see `SecretClassifier`
+    return get_classifier().secrets(service_variables)
 
 
-# %%
-def create_secret(
-    service: Service, service_variables: Dict[str, str]
-) -> Optional[dict[str, Any]]:
-    # Create a Secrets Manager client
-    client = boto3.client("secretsmanager", region_name=service.region)
+def split_secret_vars(
+    env_vars: dict[str, str], secrets: Optional[list[str]] = None
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Split env vars into (secrets, non-secrets), auto-detecting secrets if none given.
+    """
+    if not secrets:
+        secret_vars = detect_secrets_with_ai(env_vars)
+    else:
+        secret_vars = {
+            secret: f"{env_vars[secret]}" for secret in secrets if secret in env_vars
+        }
+        missing_secrets = set(secrets) - set(secret_vars)
+        if missing_secrets:
+            logger.warning(f"Secrets informed not found in env vars: {missing_secrets}")
 
-    # Construct the secret name
-    secret_name = service.canonical_name
+    not_secret_vars = {var: env_vars[var] for var in env_vars if var not in secret_vars}
+    return secret_vars, not_secret_vars
 
-    # Convert the service_variables dictionary to a JSON string
-    secret_string = json.dumps(service_variables)
 
+def _put_secret(
+    client, service: Service, secret_name: str, secret_string: str
+) -> dict[str, Any]:
     try:
         # Create the secret
-        response = client.create_secret(
+        return client.create_secret(
             Name=secret_name,
             Description=f"Secrets for {service.normalized_name} in {service.environment} environment [imported from .env with infrazeus].",
             SecretString=secret_string,
         )
-        return response
     except client.exceptions.ResourceExistsException:
-        response = client.update_secret(
+        return client.update_secret(
             Description=f"Secrets for {service.normalized_name} in {service.environment} environment (imported from .env with infrazeus)",
             SecretId=secret_name,
             SecretString=secret_string,
         )
-        return response
+    finally:
+        # Any cached value is stale once we write
+        get_secrets_cache().invalidate(secret_name)
+
+
+def _current_manifest(client, secret_name: str) -> Optional[dict[str, Any]]:
+    # Read past the cache: the layout must be the one that is stored right now
+    try:
+        response = client.get_secret_value(SecretId=secret_name)
+    except client.exceptions.ResourceNotFoundException:
+        return None
+    return read_manifest(json.loads(response.get("SecretString") or "{}"))
+
+
+# %%
+def create_secret(
+    service: Service, service_variables: Dict[str, str], max_workers: int = 8
+) -> Optional[dict[str, Any]]:
+    """
+    Store the secrets as JSON in the `canonical_name` secret.
+
+    When they do not fit in one secret they are split into shards named
+    `<canonical_name>-0`, `-1`, ... written concurrently, and the base secret only
+    holds the manifest of which shard has each key. Keys stay in the shard the
+    current manifest assigns them (see `plan_shards`), so task definitions keep
+    finding them. The manifest is written last, so readers never see it point at
+    a shard that is not there yet.
+    """
+    # Create a Secrets Manager client
+    client = get_client("secretsmanager", region=service.region)
+
+    # Construct the secret name
+    secret_name = service.canonical_name
+
+    try:
+        manifest = _current_manifest(client, secret_name)
+        shards = plan_shards(service_variables, manifest=manifest)
+        if manifest is None and len(shards) == 1:
+            # Convert the service_variables dictionary to a JSON string
+            return _put_secret(
+                client, service, secret_name, json.dumps(service_variables)
+            )
+
+        new_manifest = shard_manifest(shards)
+        if manifest:
+            moved = {
+                key
+                for key, index in new_manifest[SHARD_MANIFEST_KEY]["keys"].items()
+                if manifest["keys"].get(key, index) != index
+            }
+            if moved:
+                logger.warning(
+                    f"Secrets moved to another shard, redeploy the tasks using "
+                    f"them: {sorted(moved)}"
+                )
+
+        logger.info(f"Storing {secret_name} secrets in {len(shards)} shards")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _put_secret,
+                    client,
+                    service,
+                    shard_name(secret_name, index),
+                    json.dumps(shard),
+                )
+                for index, shard in enumerate(shards)
+            ]
+            for future in futures:
+                future.result()
+        return _put_secret(client, service, secret_name, json.dumps(new_manifest))
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+
+
+class ParameterWriteResult(BaseModel):
+    key: str
+    name: str
+    status: Literal["written", "failed"]
+    version: Optional[int] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class ParameterWriteReport(BaseModel):
+    results: list[ParameterWriteResult] = []
+    elapsed: float = 0.0
+
+    @property
+    def written(self) -> list[ParameterWriteResult]:
+        return [result for result in self.results if result.status == "written"]
+
+    @property
+    def failed(self) -> list[ParameterWriteResult]:
+        return [result for result in self.results if result.status == "failed"]
+
+
+def parameter_name(service: Service, key: str) -> str:
+    return f"/{service.environment}/{service.normalized_name}/{key}"
+
+
+def _put_parameter(
+    client, service: Service, key: str, value: str, limiter: TokenBucket
+) -> ParameterWriteResult:
+    # Construct the parameter name for each key-value pair
+    name = parameter_name(service, key)
+    try:
+        # Create or update the parameter
+        response, attempts = call_with_retries(
+            client.put_parameter,
+            limiter=limiter,
+            Name=name,
+            Description=f"{key} for {service.normalized_name} in {service.environment} environment",
+            Value=value,
+            Type="String",  # You can choose 'String', 'StringList', or 'SecureString'
+            Overwrite=True,  # Overwrite existing parameters instead of failing
+        )
     except Exception as e:
-        print(f"An error occurred: {e}")
+        return ParameterWriteResult(key=key, name=name, status="failed", error=str(e))
+    return ParameterWriteResult(
+        key=key,
+        name=name,
+        status="written",
+        version=response.get("Version"),
+        attempts=attempts,
+    )
 
 
 def create_parameters(
-    service: Service, service_variables: Dict[str, str]
-) -> Optional[Dict[str, Any]]:
+    service: Service,
+    service_variables: Dict[str, str],
+    tps: float = SSM_PUT_TPS,
+    max_workers: int = 8,
+) -> ParameterWriteReport:
+    """
+    Write every variable to SSM through a bounded worker pool.
+
+    Calls share a token bucket of `tps` requests per second (SSM's PutParameter
+    quota is per account and region) and throttled calls are retried with jitter.
+    """
     # Create a Systems Manager client
-    client = boto3.client("ssm", region_name=service.region)
-
-    responses = {}
-
-    for key, value in service_variables.items():
-        # Construct the parameter name for each key-value pair
-        parameter_name = f"/{service.environment}/{service.normalized_name}/{key}"
-
-        try:
-            # Create or update the parameter
-            response = client.put_parameter(
-                Name=parameter_name,
-                Description=f"{key} for {service.normalized_name} in {service.environment} environment",
-                Value=value,
-                Type="String",  # You can choose 'String', 'StringList', or 'SecureString'
-                Overwrite=True,  # Set to True if you want to overwrite an existing parameter
-            )
-            responses[key] = response
-        except client.exceptions.ParameterAlreadyExists:
-            print(f"Parameter {parameter_name} already exists. Updating instead.")
-            response = client.put_parameter(
-                Name=parameter_name,
-                Description=f"{key} for {service.normalized_name} in {service.environment} environment",
-                Value=value,
-                Type="String",  # You can choose 'String', 'StringList', or 'SecureString'
-                Overwrite=True,  # Set to True if you want to overwrite an existing parameter
-            )
-            responses[key] = response
-        except Exception as e:
-            print(f"An error occurred while creating/updating parameter {key}: {e}")
+    client = throttled_client("ssm", region=service.region)
+    limiter = TokenBucket(rate=tps)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_put_parameter, client, service, key, value, limiter)
+            for key, value in service_variables.items()
+        ]
+        results = [future.result() for future in futures]
 
-    return responses
+    return ParameterWriteReport(results=results, elapsed=time.perf_counter() - start)
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+from loguru import logger
+
 
 def load_env_to_dict(env_file_path: Path) -> dict[str, str]:
     """
@@ -29,7 +31,7 @@ def load_env_to_dict(env_file_path: Path) -> dict[str, str]:
                     key, value = line.split("=", 1)
                     env_vars[key] = value.strip('"')
                 except ValueError:
-                    print(f"Warning: Ignoring malformed line: {line}")
+                    logger.warning(f"Ignoring malformed line: {line}")
     return env_vars
 
 
@@ -1,69 +1,191 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
-import boto3
+from loguru import logger
 
+from ..aws.clients import get_client
 from ..schema import Service
 from .env_handler import load_env_to_dict
+from .secrets_cache import get_secrets_cache
+from .shards import MissingShardError, read_manifest, shard_name
+
+
+def _load_secret(client, secret_name: str) -> Optional[dict[str, Any]]:
+    # Retrieve the secret value (shared in-process cache)
+    get_secret_value_response = get_secrets_cache().get_secret_value(
+        client, secret_name
+    )
+    if "SecretString" in get_secret_value_response:
+        return json.loads(get_secret_value_response["SecretString"])
+    return None
+
+
+def _load_shards(
+    client, secret_name: str, manifest: dict[str, Any], max_workers: int
+) -> dict[str, Any]:
+    def load_shard(name: str) -> Optional[dict[str, Any]]:
+        try:
+            return _load_secret(client, name)
+        except client.exceptions.ResourceNotFoundException:
+            raise MissingShardError(
+                f"Shard {name} of secret {secret_name} is missing (its manifest "
+                f"lists {manifest['shards']} shards)"
+            ) from None
+
+    names = [shard_name(secret_name, index) for index in range(manifest["shards"])]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        shards = list(executor.map(load_shard, names))
+    secret_dict: dict[str, Any] = {}
+    for shard in shards:
+        secret_dict.update(shard or {})
+    return secret_dict
+
+
+def read_secrets(service: Service, max_workers: int = 8) -> Optional[dict[str, Any]]:
+    """
+    Secrets of the service with their values, merged from every shard when they
+    are sharded (the shards are fetched concurrently).
+
+    Returns None only when the secret does not exist; a shard listed in its
+    manifest that does not exist raises `MissingShardError`, and any other error
+    (access denied, throttling...) is raised too.
+    """
+    client = get_client("secretsmanager", region=service.region)
+    secret_name = service.canonical_name
+    try:
+        secret_dict = _load_secret(client, secret_name)
+    except client.exceptions.ResourceNotFoundException:
+        return None
+    if secret_dict is None:
+        raise ValueError(f"Secret {secret_name} has no SecretString")
+    manifest = read_manifest(secret_dict)
+    if manifest is not None:
+        secret_dict = _load_shards(client, secret_name, manifest, max_workers)
+    return secret_dict
 
 
 # Assuming the Service class and its subclasses are already defined as provided earlier.
 def list_secrets(
-    service: Service, show_values: bool = False
+    service: Service, show_values: bool = False, max_workers: int = 8
 ) -> Optional[dict[str, Any]]:
-    # Create a Secrets Manager client
-    client = boto3.client("secretsmanager", region_name=service.region)
-
+    """
+    Secrets of the service (see `read_secrets`), None when they can't be read.
+    """
     # Construct the secret name
     secret_name = (
         service.canonical_name
     )  # Assuming normalized_name is the correct attribute
 
     try:
-        # Retrieve the secret value
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-        if "SecretString" in get_secret_value_response:
-            secret = get_secret_value_response["SecretString"]
-            secret_dict = json.loads(secret)
-            if not show_values:
-                secret_dict = {key: "@SecretValue" for key in secret_dict.keys()}
-            return secret_dict
-        return None
-    except client.exceptions.ResourceNotFoundException:
-        print(f"Secret {secret_name} not found.")
-        return None
+        secret_dict = read_secrets(service, max_workers=max_workers)
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
         return None
+    if secret_dict is None:
+        logger.warning(f"Secret {secret_name} not found.")
+        return None
+    if not show_values:
+        secret_dict = {key: "@SecretValue" for key in secret_dict.keys()}
+    return secret_dict
+
 
+def secret_locations(service: Service) -> dict[str, str]:
+    """
+    Name of the secret holding each key: the base secret, or its shard.
+    """
+    client = get_client("secretsmanager", region=service.region)
+    secret_name = service.canonical_name
+    try:
+        secret_dict = _load_secret(client, secret_name) or {}
+    except client.exceptions.ResourceNotFoundException:
+        return {}
+    manifest = read_manifest(secret_dict)
+    if manifest is None:
+        return {key: secret_name for key in secret_dict}
+    return {
+        key: shard_name(secret_name, index) for key, index in manifest["keys"].items()
+    }
 
-def list_parameters(service: Service) -> Optional[dict[str, Any]]:
+
+# SSM limits: GetParameters takes up to 10 names, DescribeParameters returns up to 50
+GET_PARAMETERS_BATCH = 10
+DESCRIBE_PARAMETERS_PAGE = 50
+
+
+def _fetch_parameters_by_path(client, parameter_prefix: str) -> dict[str, Any]:
+    parameter_content = {}
+    kwargs = {"Path": parameter_prefix, "Recursive": True, "WithDecryption": True}
+    while True:
+        page = client.get_parameters_by_path(**kwargs)
+        for param in page["Parameters"]:
+            _, _, key = param["Name"].rpartition("/")
+            parameter_content[key] = param["Value"]
+        if not page.get("NextToken"):
+            return parameter_content
+        kwargs["NextToken"] = page["NextToken"]
+
+
+def _fetch_parameters_batched(
+    client, parameter_prefix: str, max_workers: int
+) -> dict[str, Any]:
+    kwargs = {
+        "ParameterFilters": [
+            {"Key": "Name", "Option": "BeginsWith", "Values": [parameter_prefix]}
+        ],
+        "MaxResults": DESCRIBE_PARAMETERS_PAGE,
+    }
+    batches = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Value batches are fetched while the next page of names is being described
+        while True:
+            page = client.describe_parameters(**kwargs)
+            names = [param["Name"] for param in page["Parameters"]]
+            for i in range(0, len(names), GET_PARAMETERS_BATCH):
+                batches.append(
+                    executor.submit(
+                        client.get_parameters,
+                        Names=names[i : i + GET_PARAMETERS_BATCH],
+                        WithDecryption=True,
+                    )
+                )
+            if not page.get("NextToken"):
+                break
+            kwargs["NextToken"] = page["NextToken"]
+
+        parameter_content = {}
+        for batch in batches:
+            for param in batch.result()["Parameters"]:
+                # Extract the parameter key from the full name
+                _, _, key = param["Name"].rpartition("/")
+                parameter_content[key] = param["Value"]
+    return parameter_content
+
+
+def list_parameters(
+    service: Service,
+    strategy: Literal["batch", "path"] = "batch",
+    max_workers: int = 4,
+    client=None,
+) -> Optional[dict[str, Any]]:
+    """
+    Values of every parameter under `/{environment}/{normalized_name}/`.
+
+    `batch` describes the names 50 at a time and fetches their values with
+    concurrent `get_parameters` calls of 10 names; `path` walks
+    `get_parameters_by_path`, which returns names and values in the same page.
+    """
     # Create a Systems Manager client
-    client = boto3.client("ssm", region_name=service.region)
+    client = client or get_client("ssm", region=service.region)
 
     # Construct the parameter name prefix
     parameter_prefix = f"/{service.environment}/{service.normalized_name}/"
 
     try:
-        # Retrieve the parameters with the specified prefix
-        paginator = client.get_paginator("describe_parameters")
-        page_iterator = paginator.paginate(
-            ParameterFilters=[
-                {"Key": "Name", "Option": "BeginsWith", "Values": [parameter_prefix]}
-            ]
-        )
-        parameter_content = {}
-        for page in page_iterator:
-            for param in page["Parameters"]:
-                # Extract the parameter key from the full name
-                _, _, key = param["Name"].rpartition("/")
-                # Retrieve the parameter value
-                parameter_value_response = client.get_parameter(
-                    Name=param["Name"], WithDecryption=True
-                )
-                parameter_content[key] = parameter_value_response["Parameter"]["Value"]
-        return parameter_content
+        if strategy == "path":
+            return _fetch_parameters_by_path(client, parameter_prefix)
+        return _fetch_parameters_batched(client, parameter_prefix, max_workers)
     except Exception as e:
-        print(f"An error occurred: {e}")
+        logger.error(f"An error occurred: {e}")
         return None
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Optional
+
+SECRETS_CACHE_TTL = float(os.getenv("INFRAZEUS_SECRETS_TTL", "300"))
+SECRETS_CACHE_SIZE = int(os.getenv("INFRAZEUS_SECRETS_CACHE_SIZE", "128"))
+
+
+class _Entry:
+    __slots__ = ("secret", "version_id", "fetched_at")
+
+    def __init__(self, secret: dict[str, Any]):
+        self.secret = secret
+        self.version_id = secret.get("VersionId")
+        self.fetched_at = time.monotonic()
+
+
+class SecretsCache:
+    """
+    Size-bounded LRU cache of `get_secret_value` responses with a TTL.
+
+    Entries are keyed by (region, secret id, version stage). Once an entry expires
+    it is revalidated with `describe_secret`, which is cheaper than fetching the
+    value again and only costs a `get_secret_value` when the stage moved to a new
+    version.
+    """
+
+    def __init__(
+        self,
+        ttl: float = SECRETS_CACHE_TTL,
+        max_size: int = SECRETS_CACHE_SIZE,
+        revalidate: bool = True,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.revalidate = revalidate
+        self.stats: Counter = Counter()
+        self._entries: OrderedDict[tuple[str, str, str], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _current_version(self, client, secret_id: str, version_stage: str):
+        described = client.describe_secret(SecretId=secret_id)
+        for version_id, stages in described.get("VersionIdsToStages", {}).items():
+            if version_stage in stages:
+                return version_id
+        return None
+
+    def _store(self, key: tuple[str, str, str], secret: dict[str, Any]):
+        self._entries[key] = _Entry(secret)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_secret_value(
+        self, client, secret_id: str, version_stage: str = "AWSCURRENT"
+    ) -> dict[str, Any]:
+        key = (client.meta.region_name, secret_id, version_stage)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if time.monotonic() - entry.fetched_at <= self.ttl:
+                    self.stats["hits"] += 1
+                    return entry.secret
+
+        # AWS calls happen outside the lock so different secrets load concurrently
+        if entry is not None and self.revalidate and entry.version_id:
+            version_id = self._current_version(client, secret_id, version_stage)
+            if version_id == entry.version_id:
+                with self._lock:
+                    self.stats["revalidations"] += 1
+                    entry.fetched_at = time.monotonic()
+                return entry.secret
+
+        response = client.get_secret_value(
+            SecretId=secret_id, VersionStage=version_stage
+        )
+        secret = {k: v for k, v in response.items() if k != "ResponseMetadata"}
+        with self._lock:
+            self.stats["misses"] += 1
+            self._store(key, secret)
+        return secret
+
+    def invalidate(self, secret_id: Optional[str] = None):
+        """
+        Drop every cached version of `secret_id`, or the whole cache if None.
+        """
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[1] == secret_id]:
+                del self._entries[key]
+
+
+_default_cache = SecretsCache()
+
+
+def get_secrets_cache() -> SecretsCache:
+    """
+    Process-wide cache shared by every command that reads Secrets Manager.
+    """
+    return _default_cache
@@ -0,0 +1,110 @@
+import json
+import os
+from typing import Any, Optional
+
+# Secrets Manager rejects a SecretString over 65,536 bytes; shards are filled up
+# to this budget, leaving room for the JSON envelope
+SECRET_VALUE_BYTES = 65536
+SECRET_SHARD_BYTES = int(os.getenv("INFRAZEUS_SECRET_SHARD_BYTES", "60000"))
+
+# Key of the manifest in the base secret of a sharded service
+SHARD_MANIFEST_KEY = "__infrazeus_shards__"
+
+
+class SecretTooLargeError(ValueError):
+    pass
+
+
+class MissingShardError(LookupError):
+    pass
+
+
+def shard_name(secret_name: str, index: int) -> str:
+    return f"{secret_name}-{index}"
+
+
+def _entry_size(key: str, value: Any) -> int:
+    # `{"key": "value"}`: the braces count for the `, ` separating entries
+    return len(json.dumps({key: value}).encode())
+
+
+def plan_shards(
+    variables: dict[str, Any],
+    limit: int = SECRET_SHARD_BYTES,
+    manifest: Optional[dict[str, Any]] = None,
+) -> list[dict[str, Any]]:
+    """
+    Split the variables into shards of at most `limit` bytes of JSON.
+
+    With the `manifest` of the current layout, keys stay in the shard it assigns
+    them and the shards are never fewer than before, so task definitions pointing
+    at `<shard>:KEY` keep working; keys only move out of a shard that can no
+    longer hold them all, biggest first. New (or moved) keys go, in sorted order,
+    to the first shard with room, or to a new one. Variables that fit in a single
+    secret and were not sharded before give a single shard.
+    """
+    if manifest is None and len(json.dumps(variables).encode()) <= limit:
+        return [variables]
+
+    count = manifest["shards"] if manifest else 0
+    assigned = manifest["keys"] if manifest else {}
+    shards: list[dict[str, Any]] = [{} for _ in range(count)]
+    sizes = [2] * count  # `{}`
+    entry_sizes = {}
+    for key in sorted(variables):
+        entry_sizes[key] = _entry_size(key, variables[key])
+        if entry_sizes[key] + 2 > limit:
+            raise SecretTooLargeError(
+                f"Secret {key} has {entry_sizes[key]} bytes, over the {limit} bytes "
+                "a secret shard holds"
+            )
+
+    # Smallest first, so a shard that overflows moves out its biggest keys
+    pending = []
+    for key in sorted(variables, key=lambda key: (entry_sizes[key], key)):
+        index = assigned.get(key)
+        if index is not None and index < count:
+            if sizes[index] + entry_sizes[key] <= limit:
+                shards[index][key] = variables[key]
+                sizes[index] += entry_sizes[key]
+                continue
+        pending.append(key)
+
+    for key in sorted(pending):
+        entry_size = entry_sizes[key]
+        index = next(
+            (i for i, size in enumerate(sizes) if size + entry_size <= limit), None
+        )
+        if index is None:
+            shards.append({})
+            sizes.append(2)
+            index = len(shards) - 1
+        shards[index][key] = variables[key]
+        sizes[index] += entry_size
+    return shards
+
+
+def shard_manifest(shards: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Base secret content of a sharded service: which shard holds each key.
+    """
+    manifest = {
+        SHARD_MANIFEST_KEY: {
+            "shards": len(shards),
+            "keys": {key: index for index, shard in enumerate(shards) for key in shard},
+        }
+    }
+    size = len(json.dumps(manifest).encode())
+    if size > SECRET_VALUE_BYTES:
+        raise SecretTooLargeError(
+            f"The shard manifest has {size} bytes, over the {SECRET_VALUE_BYTES} "
+            "bytes of a secret"
+        )
+    return manifest
+
+
+def read_manifest(secret: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    The shard manifest of a base secret, None for a single (unsharded) secret.
+    """
+    return secret.get(SHARD_MANIFEST_KEY)
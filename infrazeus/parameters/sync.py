@@ -0,0 +1,161 @@
+import hashlib
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ..aws.throttle import call_with_retries, throttled_client
+from ..schema import Service
+from .create import (
+    SSM_PUT_TPS,
+    ParameterWriteReport,
+    create_parameters,
+    create_secret,
+    parameter_name,
+    split_secret_vars,
+)
+from .list import list_parameters, read_secrets
+
+# SSM DeleteParameters takes up to 10 names per call
+DELETE_PARAMETERS_BATCH = 10
+
+
+class SyncError(RuntimeError):
+    pass
+
+
+def value_digest(value: str) -> str:
+    return hashlib.sha256(f"{value}".encode()).hexdigest()
+
+
+class KeyDiff(BaseModel):
+    added: list[str] = []
+    changed: list[str] = []
+    removed: list[str] = []
+    unchanged: list[str] = []
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def diff_values(desired: dict[str, str], current: dict[str, str]) -> KeyDiff:
+    """
+    Compare two key/value mappings by the sha256 digest of their values.
+    """
+    desired_digests = {key: value_digest(value) for key, value in desired.items()}
+    current_digests = {key: value_digest(value) for key, value in current.items()}
+
+    diff = KeyDiff()
+    for key, digest in desired_digests.items():
+        if key not in current_digests:
+            diff.added.append(key)
+        elif current_digests[key] != digest:
+            diff.changed.append(key)
+        else:
+            diff.unchanged.append(key)
+    diff.removed = [key for key in current_digests if key not in desired_digests]
+    return diff
+
+
+class SyncPlan(BaseModel):
+    parameters: KeyDiff
+    secrets: KeyDiff
+    desired_parameters: dict[str, str]
+    desired_secrets: dict[str, str]
+
+    @property
+    def has_changes(self) -> bool:
+        return self.parameters.has_changes or self.secrets.has_changes
+
+
+class SyncResult(BaseModel):
+    parameters: Optional[ParameterWriteReport] = None
+    deleted_parameters: list[str] = []
+    failed_deletes: dict[str, str] = {}
+    secret_written: bool = False
+
+
+def plan_sync(
+    service: Service, env_vars: dict[str, str], secrets: Optional[list[str]] = None
+) -> SyncPlan:
+    """
+    Diff the `.env` content against what is currently stored in SSM/Secrets Manager.
+
+    Only reads from AWS. Keys already stored as secrets stay secrets even when
+    `secrets` is not informed, so a sync never moves them to plain parameters.
+    Raises `SyncError` when the current values can't be read.
+    """
+    current_parameters = list_parameters(service)
+    if current_parameters is None:
+        raise SyncError(f"Could not read the parameters of {service.canonical_name}")
+    # Only a missing secret is empty: a failed read would rewrite it from scratch
+    try:
+        current_secrets = read_secrets(service) or {}
+    except Exception as e:
+        raise SyncError(
+            f"Could not read the secrets of {service.canonical_name}: {e}"
+        ) from e
+
+    secret_keys = list(secrets or [])
+    if not secret_keys:
+        detected, _ = split_secret_vars(env_vars)
+        secret_keys = [*detected, *(key for key in current_secrets if key in env_vars)]
+    desired_secrets, desired_parameters = split_secret_vars(env_vars, secret_keys)
+
+    return SyncPlan(
+        parameters=diff_values(desired_parameters, current_parameters),
+        secrets=diff_values(desired_secrets, current_secrets),
+        desired_parameters=desired_parameters,
+        desired_secrets=desired_secrets,
+    )
+
+
+def _delete_parameters(
+    service: Service, keys: list[str], result: SyncResult
+) -> SyncResult:
+    client = throttled_client("ssm", region=service.region)
+    names = {parameter_name(service, key): key for key in keys}
+    batch_names = list(names)
+    for i in range(0, len(batch_names), DELETE_PARAMETERS_BATCH):
+        batch = batch_names[i : i + DELETE_PARAMETERS_BATCH]
+        try:
+            response, _ = call_with_retries(client.delete_parameters, Names=batch)
+        except Exception as e:
+            result.failed_deletes.update({names[name]: str(e) for name in batch})
+            continue
+        result.deleted_parameters += [
+            names[name] for name in response["DeletedParameters"]
+        ]
+        result.failed_deletes.update(
+            {names[name]: "Invalid parameter" for name in response["InvalidParameters"]}
+        )
+    return result
+
+
+def apply_sync(
+    service: Service, plan: SyncPlan, tps: float = SSM_PUT_TPS
+) -> SyncResult:
+    """
+    Issue only the writes and deletes needed to reach `plan`.
+    """
+    result = SyncResult()
+
+    to_write = plan.parameters.added + plan.parameters.changed
+    if to_write:
+        result.parameters = create_parameters(
+            service=service,
+            service_variables={key: plan.desired_parameters[key] for key in to_write},
+            tps=tps,
+        )
+
+    if plan.parameters.removed:
+        _delete_parameters(service, plan.parameters.removed, result)
+
+    # The secret is a single JSON document: rewrite it once, only if it changed
+    if plan.secrets.has_changes:
+        result.secret_written = (
+            create_secret(service=service, service_variables=plan.desired_secrets)
+            is not None
+        )
+
+    return result
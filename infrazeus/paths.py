@@ -0,0 +1,18 @@
+import os
+from pathlib import Path
+
+
+def user_cache_dir() -> Path:
+    """
+    Directory where infrazeus keeps its local caches (created on demand).
+
+    Honors `INFRAZEUS_CACHE_DIR`, then `XDG_CACHE_HOME`, then `~/.cache`.
+    """
+    base = os.getenv("INFRAZEUS_CACHE_DIR")
+    if base:
+        path = Path(base)
+    else:
+        xdg = os.getenv("XDG_CACHE_HOME")
+        path = Path(xdg) / "infrazeus" if xdg else Path.home() / ".cache" / "infrazeus"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
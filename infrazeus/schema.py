@@ -2,20 +2,21 @@ import json
 from pathlib import Path
 from typing import Literal, Optional
 
-import boto3
 from pydantic import BaseModel, Field
 
 
 def get_account_id():
-    # Assuming you have the AWS credentials configured in your environment or config file
-    sts_client = boto3.client("sts")
-    account_id = sts_client.get_caller_identity()["Account"]
-    return account_id
+    from .aws.identity import resolve_identity
+
+    # Cached on disk per credentials, so STS is only called once per TTL
+    return resolve_identity().account_id
 
 
 def get_default_region():
+    from .aws.identity import default_region
+
     # This will retrieve the default region name from the AWS config or environment variable
-    return boto3.session.Session().region_name or "us-east-1"
+    return default_region()
 
 
 class Service(BaseModel):
@@ -25,6 +26,11 @@ class Service(BaseModel):
     docker_tag: Optional[str] = None
     name_for_human: Optional[str] = None
     region: str = Field(default_factory=get_default_region)
+    # ECR repository settings, left untouched when not set
+    ecr_replication_regions: Optional[list[str]] = None
+    ecr_keep_tagged_images: Optional[int] = Field(default=None, ge=1)
+    ecr_expire_untagged_days: Optional[int] = Field(default=None, ge=1)
+    ecr_scan_on_push: Optional[bool] = None
 
     @property
     def normalized_name(self) -> str:
@@ -0,0 +1,153 @@
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+FORMAT_VERSION = "2010-09-09"
+
+HEADER_KEYS = ("AWSTemplateFormatVersion", "Description")
+# Rendered in this order, after the header
+SECTIONS = ("Parameters", "Mappings", "Conditions", "Resources", "Outputs")
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class TemplateCollisionError(ValueError):
+    pass
+
+
+def freeze(value: Any) -> Any:
+    """
+    Read-only view of a JSON-like value: dicts become mapping proxies and lists
+    tuples. Already frozen values are returned as is, so they are shared.
+    """
+    # Exact type checks: isinstance against the Mapping ABC dominates bulk renders
+    kind = type(value)
+    if kind is dict:
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if kind is list:
+        return tuple([freeze(item) for item in value])
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    Plain (mutable, JSON-serializable) copy of a frozen value.
+    """
+    kind = type(value)
+    if kind is MappingProxyType or kind is dict:
+        return {key: thaw(item) for key, item in value.items()}
+    if kind is tuple or kind is list:
+        return [thaw(item) for item in value]
+    return value
+
+
+def _same_body(existing: Any, body: Any) -> bool:
+    if existing is body or existing == body:
+        return True
+    # A frozen body never equals its plain twin (tuples are not lists)
+    return thaw(existing) == thaw(body)
+
+
+class Template:
+    """
+    Immutable CloudFormation template built from fragments.
+
+    Fragments are dicts with any of the template sections (`Resources`,
+    `Outputs`, ...). Adding one returns a new template that shares every entry
+    with the previous one; only the changed section maps are new. A logical id
+    defined twice with different bodies raises `TemplateCollisionError`.
+
+    Entries are kept by reference, not copied: fragments shared between
+    templates (like `ECS_TEMPLATE`) must be frozen, and they are thawed into fresh
+    dicts on `render`. Plain fragments belong to the template once added.
+    """
+
+    __slots__ = ("_header", "_sections")
+
+    def __init__(
+        self, description: Optional[str] = None, format_version: str = FORMAT_VERSION
+    ):
+        header = {"AWSTemplateFormatVersion": format_version}
+        if description is not None:
+            header["Description"] = description
+        self._header: Mapping[str, Any] = MappingProxyType(header)
+        self._sections: Mapping[str, Mapping[str, Any]] = _EMPTY
+
+    @classmethod
+    def _from_parts(
+        cls, header: Mapping[str, Any], sections: Mapping[str, Mapping[str, Any]]
+    ) -> "Template":
+        template = cls.__new__(cls)
+        template._header = header
+        template._sections = sections
+        return template
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        return self._sections.get(name, _EMPTY)
+
+    def add(self, fragment: Mapping[str, Any], replace: bool = False) -> "Template":
+        """
+        New template with the fragment merged in. With `replace`, entries of the
+        fragment win over existing ones instead of colliding.
+        """
+        header = self._header
+        sections = dict(self._sections)
+        for key, value in fragment.items():
+            if key in HEADER_KEYS:
+                if not replace and header.get(key, value) != value:
+                    raise TemplateCollisionError(
+                        f"Template {key} is already {header[key]!r}, got {value!r}"
+                    )
+                header = MappingProxyType({**header, key: value})
+                continue
+            if key not in SECTIONS:
+                raise ValueError(f"Unknown template section: {key}")
+
+            current = self.section(key)
+            merged = dict(current)
+            for logical_id, body in value.items():
+                existing = current.get(logical_id)
+                if (
+                    not replace
+                    and existing is not None
+                    and not _same_body(existing, body)
+                ):
+                    raise TemplateCollisionError(
+                        f"{key} already defines a different {logical_id!r}"
+                    )
+                merged[logical_id] = body
+            sections[key] = MappingProxyType(merged)
+        return Template._from_parts(header, MappingProxyType(sections))
+
+    def add_parameter(
+        self, name: str, spec: Mapping[str, Any], replace: bool = False
+    ) -> "Template":
+        return self.add({"Parameters": {name: spec}}, replace=replace)
+
+    def render(self) -> dict[str, Any]:
+        """
+        Plain dict of the template, ready to serialize. Frozen entries are copied,
+        so mutating the result never reaches a shared fragment.
+        """
+        rendered = dict(self._header)
+        for name in SECTIONS:
+            section = self._sections.get(name)
+            if section is None:
+                continue
+            rendered[name] = {
+                logical_id: (
+                    thaw(body)
+                    if type(body) is MappingProxyType or type(body) is tuple
+                    else body
+                )
+                for logical_id, body in section.items()
+            }
+        return rendered
+
+
+def compose(
+    *fragments: Mapping[str, Any], description: Optional[str] = None
+) -> Template:
+    template = Template(description=description)
+    for fragment in fragments:
+        template = template.add(fragment)
+    return template
@@ -0,0 +1,74 @@
+import pytest
+import rich
+
+from infrazeus import inventory, output
+from infrazeus.aws import clients
+from infrazeus.parameters.secrets_cache import get_secrets_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    # Identity, inventory and template caches go to a per-test directory
+    monkeypatch.setenv("INFRAZEUS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(inventory, "_enabled", False)
+    monkeypatch.setattr(inventory, "_inventory", None)
+
+
+@pytest.fixture(autouse=True)
+def restore_cli_globals(monkeypatch):
+    # The CLI callback replaces rich.print and the output writer
+    monkeypatch.setattr(rich, "print", rich.print)
+    monkeypatch.setattr(output, "_writer", output.get_writer())
+
+
+@pytest.fixture
+def service():
+    from infrazeus.schema import Service
+
+    return Service(
+        account_id="123456789012",
+        service_name="api",
+        environment="beta",
+        region="us-east-1",
+    )
+
+
+@pytest.fixture
+def ecs_spec() -> dict:
+    """
+    Content of an ECS service spec file.
+    """
+    return {
+        "account_id": "123456789012",
+        "service_name": "api",
+        "environment": "beta",
+        "region": "us-east-1",
+        "cluster": "main",
+        "vpc": "vpc-1",
+        "protocol": "HTTP",
+        "container_port": 80,
+        "memory": 512,
+        "cpu": 256,
+    }
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """
+    Mocked AWS account in us-east-1, with a fresh client registry.
+    """
+    moto = pytest.importorskip("moto")
+    for name, value in {
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_SESSION_TOKEN": "testing",
+        "AWS_DEFAULT_REGION": "us-east-1",
+    }.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    clients.reset()
+    get_secrets_cache().invalidate()
+    with moto.mock_aws():
+        yield
+    clients.reset()
+    get_secrets_cache().invalidate()
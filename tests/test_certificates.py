@@ -0,0 +1,55 @@
+import pytest
+
+from infrazeus.aws import certificates
+from infrazeus.aws.certificates import (
+    CertificateIndex,
+    CertificateNotFoundError,
+    normalize_domain,
+    resolve_certificate,
+)
+from infrazeus.aws.clients import get_client
+from infrazeus.aws.helper import CERTIFICATE_KEY_TYPES
+from infrazeus.inventory import enable_inventory
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(certificates, "_indexes", {})
+
+
+def test_normalize_domain():
+    assert normalize_domain("https://API.example.com:443/path") == "api.example.com"
+    assert normalize_domain("api.example.com.") == "api.example.com"
+
+
+def test_exact_certificates_win_over_wildcards():
+    index = CertificateIndex("us-east-1")
+    wildcard = {"DomainName": "*.example.com", "Status": "ISSUED"}
+    exact = {"DomainName": "api.example.com", "Status": "ISSUED"}
+    index._summaries = iter([wildcard, exact])
+
+    assert index.resolve("api.example.com") is exact
+    assert index.resolve("www.example.com") is wildcard
+
+
+@pytest.mark.parametrize("inventory", [False, True])
+def test_every_key_type_is_listed(aws, inventory):
+    acm_client = get_client("acm")
+    acm_client.request_certificate(
+        DomainName="api.example.com", KeyAlgorithm="EC_prime256v1"
+    )
+    requests = []
+    acm_client.meta.events.register(
+        "provide-client-params.acm.ListCertificates",
+        lambda params, **kwargs: requests.append(params),
+    )
+    enable_inventory(inventory)
+
+    certificate = resolve_certificate("api.example.com")
+    assert certificate["DomainName"] == "api.example.com"
+    assert requests == [{"Includes": {"keyTypes": CERTIFICATE_KEY_TYPES}}]
+
+
+def test_missing_certificates_raise(aws):
+    with pytest.raises(CertificateNotFoundError):
+        resolve_certificate("nothing.example.com")
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrazeus.aws import changesets
+from infrazeus.aws.changesets import ChangeSetError, update_stack
+from infrazeus.aws.clients import get_client
+from infrazeus.aws.fingerprint import FINGERPRINT_TAG, template_fingerprint
+from infrazeus.aws.helper import create_stack
+
+
+def topic_template(*names: str) -> dict:
+    return {
+        "Resources": {name: {"Type": "AWS::SNS::Topic"} for name in names},
+    }
+
+
+@pytest.fixture
+def stack(aws):
+    create_stack(topic_template("Topic"), "app")
+    return "app"
+
+
+def change_sets(stack_name: str) -> list:
+    cf_client = get_client("cloudformation")
+    return cf_client.list_change_sets(StackName=stack_name)["Summaries"]
+
+
+def test_same_template_is_up_to_date(stack):
+    result = update_stack(topic_template("Topic"), stack)
+    assert result.up_to_date
+    assert not result.executed
+
+
+def test_empty_change_sets_are_deleted(stack, monkeypatch):
+    cf_client = get_client("cloudformation")
+    # Same template, but the stack lost track of it: only a change set can tell
+    cf_client.update_stack(
+        StackName=stack,
+        TemplateBody=json.dumps(topic_template("Topic")),
+        Tags=[{"Key": FINGERPRINT_TAG, "Value": "stale"}],
+    )
+    executed = []
+    monkeypatch.setattr(
+        cf_client, "execute_change_set", lambda **kwargs: executed.append(kwargs)
+    )
+
+    result = update_stack(topic_template("Topic"), stack)
+
+    assert result.change_set_name
+    assert not result.up_to_date
+    assert not result.has_changes
+    assert not result.executed
+    assert executed == []
+    assert change_sets(stack) == []
+
+
+def test_changes_are_executed(stack):
+    result = update_stack(topic_template("Topic", "Other"), stack)
+    assert result.executed
+    assert result.has_changes
+
+
+def test_missing_stacks_raise(aws):
+    with pytest.raises(ChangeSetError, match="does not exist"):
+        update_stack(topic_template("Topic"), "missing")
+
+
+def test_create_change_set_errors_are_change_set_errors(stack, monkeypatch):
+    cf_client = get_client("cloudformation")
+
+    def in_progress(**kwargs):
+        raise ClientError(
+            {
+                "Error": {
+                    "Code": "ValidationError",
+                    "Message": "Stack app is in UPDATE_IN_PROGRESS state",
+                }
+            },
+            "CreateChangeSet",
+        )
+
+    monkeypatch.setattr(cf_client, "create_change_set", in_progress)
+    with pytest.raises(ChangeSetError, match="UPDATE_IN_PROGRESS"):
+        update_stack(topic_template("Topic", "Other"), stack)
+
+
+def test_timed_out_change_sets_are_deleted(stack, monkeypatch):
+    def timeout(cf_client, stack_name, change_set_name, timeout=300):
+        raise TimeoutError(f"Change set {change_set_name} still CREATE_PENDING")
+
+    monkeypatch.setattr(changesets, "_wait_change_set", timeout)
+    with pytest.raises(ChangeSetError, match="CREATE_PENDING"):
+        update_stack(topic_template("Topic", "Other"), stack)
+    assert change_sets(stack) == []
+
+
+def test_ecs_update_reports_failures(stack, ecs_spec, monkeypatch, tmp_path):
+    from typer.testing import CliRunner
+
+    from infrazeus.__main__ import app
+    from infrazeus.ecs import create
+
+    def failing_update(**kwargs):
+        raise ChangeSetError("Stack app is in ROLLBACK_COMPLETE state")
+
+    monkeypatch.setattr(create, "main_update_ens", failing_update)
+    spec = tmp_path / "service.json"
+    spec.write_text(json.dumps(ecs_spec))
+    result = CliRunner().invoke(
+        app, ["--output", "json", "ecs", "update", "-f", str(spec)]
+    )
+    assert result.exit_code == 1
+    envelope = json.loads(result.stdout.strip().splitlines()[-1])
+    assert envelope["ok"] is False
+    assert "ROLLBACK_COMPLETE" in envelope["result"]["error"]
+
+
+def test_updates_keep_the_stack_tags(stack, monkeypatch):
+    cf_client = get_client("cloudformation")
+    cf_client.update_stack(
+        StackName=stack,
+        TemplateBody=json.dumps(topic_template("Topic")),
+        Tags=[
+            {"Key": "team", "Value": "payments"},
+            {"Key": FINGERPRINT_TAG, "Value": "stale"},
+        ],
+    )
+    sent = []
+    create_change_set = cf_client.create_change_set
+
+    def recording_create_change_set(**kwargs):
+        sent.append(kwargs["Tags"])
+        return create_change_set(**kwargs)
+
+    monkeypatch.setattr(cf_client, "create_change_set", recording_create_change_set)
+
+    update_stack(topic_template("Topic", "Other"), stack)
+
+    # Tags replace the whole tag set of the stack
+    (tags,) = sent
+    assert {"Key": "team", "Value": "payments"} in tags
+    assert [tag for tag in tags if tag["Key"] == FINGERPRINT_TAG] == [
+        {
+            "Key": FINGERPRINT_TAG,
+            "Value": template_fingerprint(topic_template("Topic", "Other")),
+        }
+    ]
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from infrazeus.__main__ import app
+
+
+def test_callback_decorates_rich_print_once():
+    runner = CliRunner()
+    outputs = [runner.invoke(app, ["cache", "stats"]).output for _ in range(3)]
+
+    # Every run decorates the original rich.print, not the previous decorator
+    assert "⚡ Welcome to Infrazeus!" in outputs[0]
+    assert "⚡ ⚡" not in "".join(outputs)
+
+
+def test_help_does_not_import_boto3():
+    code = (
+        "import sys\n"
+        "from typer.testing import CliRunner\n"
+        "from infrazeus.__main__ import app\n"
+        "CliRunner().invoke(app, ['ecs', 'create', '--help'])\n"
+        "sys.exit('boto3' in sys.modules)\n"
+    )
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
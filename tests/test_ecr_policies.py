@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from infrazeus.__main__ import app
+from infrazeus.aws.clients import get_client
+from infrazeus.ecr.policies import configure_ecr, lifecycle_policy
+from infrazeus.schema import Service
+
+
+def spec(**settings) -> Service:
+    return Service(
+        account_id="123456789012",
+        service_name="api",
+        environment="beta",
+        region="us-east-1",
+        **settings,
+    )
+
+
+def test_lifecycle_policy_rules():
+    assert lifecycle_policy(spec()) is None
+    policy = lifecycle_policy(
+        spec(ecr_expire_untagged_days=7, ecr_keep_tagged_images=30)
+    )
+    assert [rule["rulePriority"] for rule in policy["rules"]] == [1, 2]
+    assert policy["rules"][0]["selection"]["tagStatus"] == "untagged"
+    assert policy["rules"][1]["selection"]["countNumber"] == 30
+
+
+@pytest.fixture
+def repository(aws):
+    get_client("ecr").create_repository(repositoryName="api-beta")
+
+
+def test_configure_is_idempotent(repository):
+    service = spec(
+        ecr_scan_on_push=True,
+        ecr_expire_untagged_days=7,
+        ecr_replication_regions=["us-west-2"],
+    )
+    first = configure_ecr(service)
+    assert (first.scan_on_push, first.lifecycle_policy, first.replication) == (
+        "updated",
+        "updated",
+        "updated",
+    )
+    second = configure_ecr(service)
+    assert (second.scan_on_push, second.lifecycle_policy, second.replication) == (
+        "unchanged",
+        "unchanged",
+        "unchanged",
+    )
+
+
+def test_unset_settings_are_left_alone(repository):
+    result = configure_ecr(spec())
+    assert result.replication == result.lifecycle_policy == "unmanaged"
+
+
+def test_prefix_matches_are_reported(repository):
+    get_client("ecr").create_repository(repositoryName="api-beta-worker")
+    result = configure_ecr(spec(ecr_replication_regions=["us-west-2"]))
+    assert result.replicated_with == ["api-beta-worker"]
+
+
+def test_ecr_create_accepts_an_existing_repository(aws, tmp_path):
+    path = tmp_path / "service.json"
+    path.write_text(json.dumps({**spec(ecr_scan_on_push=True).model_dump()}))
+    runner = CliRunner()
+
+    envelopes = []
+    for _ in range(2):
+        result = runner.invoke(app, ["--output", "json", "ecr", "create", "-f", path])
+        assert result.exit_code == 0
+        envelopes.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    assert [envelope["result"]["status"] for envelope in envelopes] == [
+        "created",
+        "exists",
+    ]
+    assert all(envelope["ok"] for envelope in envelopes)
+    assert envelopes[1]["result"]["settings"]["scan_on_push"] == "unchanged"
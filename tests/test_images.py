@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from infrazeus.aws.clients import get_client
+from infrazeus.ecr.images import ImagePreflightError, check_image_tags, require_image
+from infrazeus.schema import Service
+
+MANIFEST = json.dumps(
+    {
+        "schemaVersion": 2,
+        "mediaType": "application/vnd.docker.distribution.manifest.v2+json",
+        "config": {
+            "mediaType": "application/vnd.docker.container.image.v1+json",
+            "size": 7023,
+            "digest": "sha256:" + "a" * 64,
+        },
+        "layers": [],
+    }
+)
+
+
+def spec(name: str, tag) -> Service:
+    return Service(
+        account_id="123456789012",
+        service_name=name,
+        environment="beta",
+        region="us-east-1",
+        docker_tag=tag,
+    )
+
+
+@pytest.fixture
+def repository(aws):
+    ecr_client = get_client("ecr")
+    ecr_client.create_repository(repositoryName="api-beta")
+    ecr_client.put_image(
+        repositoryName="api-beta", imageManifest=MANIFEST, imageTag="1"
+    )
+    return "api-beta"
+
+
+def test_check_image_tags(repository):
+    checks = check_image_tags(
+        [spec("api", "1"), spec("api", "2"), spec("web", "1"), spec("api", None)]
+    )
+    assert [check.status for check in checks] == [
+        "found",
+        "missing",
+        "no-repository",
+        "no-tag",
+    ]
+    assert checks[0].digest.startswith("sha256:")
+    assert checks[0].image.endswith("/api-beta:1")
+
+
+def test_tags_of_one_repository_share_a_call(repository):
+    from infrazeus.aws.clients import client_stats
+
+    check_image_tags([spec("api", "1"), spec("api", "2"), spec("api", "1")])
+    assert client_stats()["api_calls"]["ecr:BatchGetImage"] == 1
+
+
+def test_require_image(repository):
+    assert require_image(spec("api", "1")).ok
+    with pytest.raises(ImagePreflightError, match="missing"):
+        require_image(spec("api", "2"))
@@ -0,0 +1,134 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from infrazeus import inventory
+from infrazeus.aws.clients import get_client
+from infrazeus.inventory import (
+    INVENTORY_FILE,
+    enable_inventory,
+    get_inventory,
+    invalidate_inventory,
+    inventoried,
+)
+from infrazeus.paths import user_cache_dir
+
+CALLS = []
+
+
+@pytest.fixture(autouse=True)
+def test_lookups_ttl(monkeypatch):
+    monkeypatch.setitem(inventory.DEFAULT_TTLS, "test_lookups", 60)
+
+
+@inventoried("test_lookups")
+def lookup(name: str):
+    CALLS.append(name)
+    return {"name": name, "created": datetime(2024, 5, 1, 12, tzinfo=timezone.utc)}
+
+
+def test_lookups_are_only_stored_when_enabled(aws):
+    CALLS.clear()
+    lookup("a")
+    lookup("a")
+    assert CALLS == ["a", "a"]
+    assert not (user_cache_dir() / INVENTORY_FILE).exists()
+
+    enable_inventory()
+    first, second = lookup("a"), lookup("a")
+    assert CALLS == ["a", "a", "a"]
+    assert first == second
+
+
+def test_datetimes_keep_their_type(aws):
+    enable_inventory()
+    live = lookup("b")
+    cached = lookup("b")
+    assert cached["created"] == datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    assert live == cached
+
+
+def test_stack_listings_match_a_live_call(aws):
+    from infrazeus.aws.helper import list_stack
+
+    cf_client = get_client("cloudformation")
+    cf_client.create_stack(
+        StackName="app",
+        TemplateBody='{"Resources": {"Topic": {"Type": "AWS::SNS::Topic"}}}',
+    )
+    live = list_stack("app")
+    enable_inventory()
+    list_stack("app")
+    cached = list_stack("app")
+    assert isinstance(cached["Stacks"][0]["CreationTime"], datetime)
+    assert cached["Stacks"][0]["CreationTime"] == live["Stacks"][0]["CreationTime"]
+
+
+def test_invalidate_does_not_create_a_disabled_inventory():
+    invalidate_inventory("stacks")
+    assert not (user_cache_dir() / INVENTORY_FILE).exists()
+
+
+def test_invalidate_drops_entries_of_an_existing_inventory(aws):
+    enable_inventory()
+    lookup("c")
+    enable_inventory(False)
+    invalidate_inventory("test_lookups")
+    assert get_inventory().stats() == {}
+
+
+def test_invalidate_errors_are_not_raised(aws, monkeypatch):
+    enable_inventory()
+
+    def broken(*args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(inventory.Inventory, "invalidate", broken)
+    invalidate_inventory("stacks")
+
+
+def test_task_definition_lookups_do_not_share_entries(aws):
+    from infrazeus.ecs.list import (
+        get_latest_task_definition,
+        list_task_definition_by_name,
+    )
+    from infrazeus.inventory import refresh_inventory
+
+    ecs_client = get_client("ecs")
+    for _ in range(2):
+        ecs_client.register_task_definition(
+            family="api-beta",
+            containerDefinitions=[
+                {"name": "api", "image": "api:latest", "memory": 512}
+            ],
+        )
+
+    enable_inventory()
+    latest = get_latest_task_definition("api-beta")
+    revisions = list_task_definition_by_name("api-beta")
+    refresh_inventory(only_stale=False)
+
+    assert get_latest_task_definition("api-beta") == latest
+    assert latest.endswith("api-beta:2")
+    assert list_task_definition_by_name("api-beta") == revisions
+    assert len(revisions) == 2
+
+
+def test_a_kind_belongs_to_one_lookup():
+    with pytest.raises(ValueError, match="test_lookups"):
+
+        @inventoried("test_lookups")
+        def other_lookup(name: str):
+            return name
+
+
+def test_cache_commands_do_not_create_the_inventory():
+    from typer.testing import CliRunner
+
+    from infrazeus.__main__ import app
+
+    runner = CliRunner()
+    assert runner.invoke(app, ["cache", "stats"]).exit_code == 0
+    assert runner.invoke(app, ["cache", "clear"]).exit_code == 0
+    assert not (user_cache_dir() / INVENTORY_FILE).exists()
@@ -0,0 +1,104 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import rich
+
+from infrazeus.alb import controller
+from infrazeus.output import OutputFormat, OutputWriter, configure_output
+from infrazeus.schema import ALBService
+from infrazeus.template_builder import freeze
+
+
+def test_json_envelopes(tmp_path):
+    path = tmp_path / "out.json"
+    writer = configure_output(OutputFormat.JSON, path)
+    writer.emit("ecs create", {"status": "créé", "template": freeze({"a": [1]})})
+    writer.emit("stack wait", [], ok=False)
+    writer.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0]) == {
+        "command": "ecs create",
+        "ok": True,
+        "result": {"status": "créé", "template": {"a": [1]}},
+    }
+    assert json.loads(lines[1])["ok"] is False
+
+
+def test_yaml_documents(tmp_path):
+    yaml = pytest.importorskip("yaml")
+    path = tmp_path / "out.yaml"
+    writer = configure_output(OutputFormat.YAML, path)
+    writer.emit("ecr check", [{"image": "app:1", "status": "found"}])
+    writer.emit("ecr check", [])
+    writer.close()
+
+    documents = list(yaml.safe_load_all(path.read_text(encoding="utf-8")))
+    assert [document["result"] for document in documents] == [
+        [{"image": "app:1", "status": "found"}],
+        [],
+    ]
+
+
+def test_quiet_text_output_still_writes_results(capsys):
+    OutputWriter(quiet=True).emit("ecr list", ["app-beta"])
+    assert "app-beta" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("verbose", [False, True])
+def test_reuse_alb_only_prints_the_template_when_verbose(monkeypatch, verbose):
+    printed = []
+    monkeypatch.setattr(rich, "print", lambda *args, **kwargs: printed.append(args))
+    monkeypatch.setattr(
+        controller,
+        "resolve_certificate",
+        lambda domain, region: {"CertificateArn": "arn:aws:acm:cert"},
+    )
+    monkeypatch.setattr(
+        controller, "resolve_alb", lambda name: SimpleNamespace(arn="arn:aws:alb")
+    )
+    service = ALBService(
+        account_id="123456789012",
+        service_name="api",
+        environment="beta",
+        region="us-east-1",
+        cluster="default",
+        vpc="vpc-1",
+        domain="api.example.com",
+        protocol="HTTPS",
+    )
+
+    response = controller.reuse_alb("shared", service, dry_run=True, verbose=verbose)
+    assert "Resources" in response["Template"]
+    assert "based on existing shared ALB" in json.dumps(response["Template"])
+    assert bool(printed) is verbose
+
+
+def test_failed_ecs_create_writes_an_error_envelope(ecs_spec, monkeypatch, tmp_path):
+    from typer.testing import CliRunner
+
+    from infrazeus.__main__ import app
+    from infrazeus.ecs import create
+
+    def failing_create(**kwargs):
+        raise create.ECSDeployError("Image api:beta not found in ECR")
+
+    monkeypatch.setattr(create, "main_create_ens", failing_create)
+    spec = tmp_path / "service.json"
+    spec.write_text(json.dumps(ecs_spec))
+
+    result = CliRunner().invoke(
+        app, ["--output", "json", "ecs", "create", "-f", str(spec)]
+    )
+
+    assert result.exit_code == 1
+    envelope = json.loads(result.stdout.strip().splitlines()[-1])
+    assert envelope == {
+        "command": "ecs create",
+        "ok": False,
+        "result": {
+            "stack_name": "api-beta-ecs-stack",
+            "error": "Image api:beta not found in ECR",
+        },
+    }
@@ -0,0 +1,84 @@
+import pytest
+
+from infrazeus.aws.clients import get_client
+from infrazeus.ecs.prune import plan_prune, prune_task_definitions
+from infrazeus.schema import ECSService
+
+ARN = "arn:aws:ecs:us-east-1:123456789012:task-definition/api-beta:{}"
+
+
+def test_plan_prune_keeps_the_newest_and_those_in_use():
+    revisions = [ARN.format(n) for n in [3, 10, 1, 2, 8, 9, 4]]
+    kept, in_use, prunable = plan_prune(revisions, keep=3, in_use={ARN.format(2)})
+
+    assert kept == [ARN.format(n) for n in [10, 9, 8]]
+    assert in_use == [ARN.format(2)]
+    assert prunable == [ARN.format(n) for n in [4, 3, 1]]
+
+
+def test_plan_prune_with_fewer_revisions_than_keep():
+    kept, in_use, prunable = plan_prune([ARN.format(1)], keep=10, in_use=set())
+    assert (kept, in_use, prunable) == ([ARN.format(1)], [], [])
+
+
+@pytest.fixture
+def ecs_service(aws, ecs_spec):
+    ecs_client = get_client("ecs")
+    arns = {}
+    for family in ["api-beta", "api-beta-worker"]:
+        for _ in range(8):
+            arn = ecs_client.register_task_definition(
+                family=family,
+                containerDefinitions=[{"name": "app", "image": "app", "memory": 128}],
+            )["taskDefinition"]["taskDefinitionArn"]
+            arns.setdefault(family, []).append(arn)
+    for cluster, revision in [("main", 1), ("batch", 2)]:
+        ecs_client.create_cluster(clusterName=cluster)
+        ecs_client.create_service(
+            cluster=cluster,
+            serviceName="api",
+            taskDefinition=arns["api-beta"][revision - 1],
+            desiredCount=0,
+        )
+    return ECSService(**ecs_spec), arns
+
+
+def active(family: str) -> list[int]:
+    ecs_client = get_client("ecs")
+    arns = ecs_client.list_task_definitions(familyPrefix=family, status="ACTIVE")[
+        "taskDefinitionArns"
+    ]
+    return sorted(
+        int(arn.rsplit(":", 1)[-1])
+        for arn in arns
+        if arn.rsplit("/", 1)[-1].rsplit(":", 1)[0] == family
+    )
+
+
+def test_prune_keeps_the_revisions_of_the_service_cluster(ecs_service):
+    spec, _ = ecs_service
+    [report] = prune_task_definitions([spec], keep=3, tps=1000)
+
+    assert report.error is None
+    assert len(report.deregistered) == 4
+    assert active("api-beta") == [1, 6, 7, 8]
+    assert active("api-beta-worker") == list(range(1, 9))
+
+
+def test_prune_keeps_the_revisions_of_other_clusters(ecs_service):
+    spec, _ = ecs_service
+    prune_task_definitions([spec], keep=3, tps=1000, clusters=["batch"])
+    assert active("api-beta") == [1, 2, 6, 7, 8]
+
+
+def test_prune_can_scan_every_cluster(ecs_service):
+    spec, _ = ecs_service
+    prune_task_definitions([spec], keep=3, tps=1000, all_clusters=True)
+    assert active("api-beta") == [1, 2, 6, 7, 8]
+
+
+def test_dry_run_deregisters_nothing(ecs_service):
+    spec, _ = ecs_service
+    [report] = prune_task_definitions([spec], keep=3, dry_run=True)
+    assert {result.status for result in report.results} == {"dry-run"}
+    assert active("api-beta") == list(range(1, 9))
@@ -0,0 +1,58 @@
+from infrazeus.aws.clients import get_client
+from infrazeus.parameters import secrets_cache
+from infrazeus.parameters.secrets_cache import SecretsCache
+
+
+def test_hits_until_the_ttl_expires(aws):
+    client = get_client("secretsmanager")
+    client.create_secret(Name="app", SecretString="v1")
+    cache = SecretsCache(ttl=60)
+
+    assert cache.get_secret_value(client, "app")["SecretString"] == "v1"
+    assert cache.get_secret_value(client, "app")["SecretString"] == "v1"
+    assert cache.stats == {"misses": 1, "hits": 1}
+
+
+def test_expired_entries_are_revalidated(aws, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(secrets_cache.time, "monotonic", lambda: clock[0])
+    client = get_client("secretsmanager")
+    client.create_secret(Name="app", SecretString="v1")
+    cache = SecretsCache(ttl=10)
+    cache.get_secret_value(client, "app")
+
+    # Same version: describe_secret is enough
+    clock[0] = 20
+    assert cache.get_secret_value(client, "app")["SecretString"] == "v1"
+    assert cache.stats["revalidations"] == 1
+
+    # New version: fetched again
+    client.put_secret_value(SecretId="app", SecretString="v2")
+    clock[0] = 40
+    assert cache.get_secret_value(client, "app")["SecretString"] == "v2"
+    assert cache.stats["misses"] == 2
+
+
+def test_least_recently_used_entries_are_evicted(aws):
+    client = get_client("secretsmanager")
+    for name in ["a", "b", "c"]:
+        client.create_secret(Name=name, SecretString=name)
+    cache = SecretsCache(max_size=2)
+    cache.get_secret_value(client, "a")
+    cache.get_secret_value(client, "b")
+    cache.get_secret_value(client, "a")
+    cache.get_secret_value(client, "c")
+
+    assert cache.stats["evictions"] == 1
+    assert [key[1] for key in cache._entries] == ["a", "c"]
+
+
+def test_invalidate(aws):
+    client = get_client("secretsmanager")
+    client.create_secret(Name="app", SecretString="v1")
+    cache = SecretsCache()
+    cache.get_secret_value(client, "app")
+    client.put_secret_value(SecretId="app", SecretString="v2")
+
+    cache.invalidate("app")
+    assert cache.get_secret_value(client, "app")["SecretString"] == "v2"
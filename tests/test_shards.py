@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from infrazeus.aws.clients import get_client
+from infrazeus.parameters.create import create_secret
+from infrazeus.parameters.list import read_secrets, secret_locations
+from infrazeus.parameters.shards import (
+    SHARD_MANIFEST_KEY,
+    MissingShardError,
+    SecretTooLargeError,
+    plan_shards,
+    shard_manifest,
+)
+
+
+def _manifest(shards):
+    return shard_manifest(shards)[SHARD_MANIFEST_KEY]
+
+
+def _value(size: int) -> str:
+    return "x" * size
+
+
+def test_plan_shards_keeps_small_secrets_in_one_shard():
+    assert plan_shards({"A": "1", "B": "2"}, limit=100) == [{"A": "1", "B": "2"}]
+
+
+def test_plan_shards_splits_over_the_limit():
+    variables = {key: _value(30) for key in "ABCD"}
+    shards = plan_shards(variables, limit=100)
+    assert len(shards) == 2
+    assert all(len(json.dumps(shard)) <= 100 for shard in shards)
+    assert {key: value for shard in shards for key, value in shard.items()} == (
+        variables
+    )
+
+
+def test_plan_shards_keeps_keys_where_the_manifest_puts_them():
+    variables = {key: _value(30) for key in "BCDE"}
+    manifest = _manifest(plan_shards(variables, limit=100))
+
+    # A key sorting before every other one would shift a plain packing
+    shards = plan_shards({"A": _value(30), **variables}, limit=100, manifest=manifest)
+
+    new_manifest = _manifest(shards)
+    assert {key: new_manifest["keys"][key] for key in variables} == manifest["keys"]
+    assert new_manifest["shards"] == 3
+
+
+def test_plan_shards_never_drops_shards_of_the_manifest():
+    variables = {key: _value(30) for key in "ABCD"}
+    manifest = _manifest(plan_shards(variables, limit=100))
+
+    shards = plan_shards({"A": _value(30)}, limit=100, manifest=manifest)
+
+    assert len(shards) == 2
+    assert shards[manifest["keys"]["A"]] == {"A": _value(30)}
+
+
+def test_plan_shards_only_moves_the_key_that_outgrew_its_shard():
+    variables = {key: _value(30) for key in "ABCD"}
+    manifest = _manifest(plan_shards(variables, limit=100))
+
+    shards = plan_shards({**variables, "A": _value(60)}, limit=100, manifest=manifest)
+
+    new_manifest = _manifest(shards)
+    moved = {
+        key
+        for key, index in new_manifest["keys"].items()
+        if manifest["keys"][key] != index
+    }
+    assert moved == {"A"}
+
+
+def test_plan_shards_rejects_an_entry_over_the_limit():
+    with pytest.raises(SecretTooLargeError, match="BIG"):
+        plan_shards({"BIG": _value(200), "SMALL": "1"}, limit=100)
+
+
+def test_shard_manifest_rejects_a_manifest_over_the_secret_limit():
+    shards = [{f"KEY_{i:05}": "1"} for i in range(5000)]
+    with pytest.raises(SecretTooLargeError, match="manifest"):
+        shard_manifest(shards)
+
+
+# Three entries of ~25 KB need two shards of the default 60000 bytes
+BIG = {key: _value(25000) for key in ("A", "B", "C")}
+
+
+def test_sharded_secret_round_trip(aws, service):
+    create_secret(service, BIG)
+
+    assert read_secrets(service) == BIG
+    locations = secret_locations(service)
+    assert set(locations) == set(BIG)
+    assert set(locations.values()) == {"api-beta-0", "api-beta-1"}
+
+
+def test_create_secret_keeps_the_shard_of_existing_keys(aws, service):
+    create_secret(service, BIG)
+    before = secret_locations(service)
+
+    create_secret(service, {"0_FIRST": _value(25000), **BIG})
+
+    after = secret_locations(service)
+    assert {key: after[key] for key in BIG} == before
+    assert read_secrets(service)["0_FIRST"] == _value(25000)
+
+
+def test_missing_shard_is_reported(aws, service):
+    create_secret(service, BIG)
+    get_client("secretsmanager").delete_secret(
+        SecretId="api-beta-1", ForceDeleteWithoutRecovery=True
+    )
+
+    with pytest.raises(MissingShardError, match="api-beta-1"):
+        read_secrets(service)
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrazeus.aws.clients import get_client
+from infrazeus.parameters.create import create_parameters, create_secret
+from infrazeus.parameters.secrets_cache import SecretsCache
+from infrazeus.parameters.sync import SyncError, apply_sync, diff_values, plan_sync
+
+
+def test_diff_values():
+    diff = diff_values(
+        {"A": "1", "B": "2", "C": "3"},
+        {"A": "1", "B": "changed", "D": "4"},
+    )
+    assert diff.added == ["C"]
+    assert diff.changed == ["B"]
+    assert diff.removed == ["D"]
+    assert diff.unchanged == ["A"]
+    assert diff.has_changes
+
+
+def test_diff_values_compares_values_as_strings():
+    assert not diff_values({"PORT": 80}, {"PORT": "80"}).has_changes
+
+
+@pytest.fixture
+def stored(aws, service):
+    create_parameters(service, {"LOG_LEVEL": "info", "PORT": "80"}, tps=1000)
+    create_secret(service, {"DB_PASSWORD": "hunter2"})
+    return service
+
+
+def test_plan_sync_only_reports_the_delta(stored):
+    plan = plan_sync(
+        stored,
+        {"LOG_LEVEL": "debug", "PORT": "80", "DB_PASSWORD": "hunter2"},
+    )
+    assert plan.parameters.changed == ["LOG_LEVEL"]
+    assert plan.parameters.unchanged == ["PORT"]
+    assert not plan.secrets.has_changes
+
+    result = apply_sync(stored, plan, tps=1000)
+    assert [r.key for r in result.parameters.written] == ["LOG_LEVEL"]
+    assert not result.secret_written
+
+
+def test_plan_sync_treats_a_missing_secret_as_empty(aws, service):
+    plan = plan_sync(service, {"DB_PASSWORD": "hunter2"})
+    assert plan.secrets.added == ["DB_PASSWORD"]
+
+
+def test_plan_sync_aborts_when_the_secret_cannot_be_read(stored, monkeypatch):
+    def access_denied(self, client, secret_id, version_stage="AWSCURRENT"):
+        raise ClientError(
+            {"Error": {"Code": "AccessDeniedException", "Message": "denied"}},
+            "GetSecretValue",
+        )
+
+    with monkeypatch.context() as patched:
+        patched.setattr(SecretsCache, "get_secret_value", access_denied)
+        with pytest.raises(SyncError, match="AccessDeniedException"):
+            plan_sync(stored, {"DB_PASSWORD": "hunter2"})
+
+    # The stored secret was not rewritten
+    secret = get_client("secretsmanager").get_secret_value(SecretId="api-beta")
+    assert json.loads(secret["SecretString"]) == {"DB_PASSWORD": "hunter2"}
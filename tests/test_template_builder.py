@@ -0,0 +1,72 @@
+from types import MappingProxyType
+
+import pytest
+
+from infrazeus.template_builder import (
+    Template,
+    TemplateCollisionError,
+    compose,
+    freeze,
+    thaw,
+)
+
+BUCKET = {"Type": "AWS::S3::Bucket", "Properties": {"Tags": [{"Key": "a"}]}}
+
+
+def test_freeze_and_thaw_round_trip():
+    frozen = freeze(BUCKET)
+    assert type(frozen) is MappingProxyType
+    assert type(frozen["Properties"]["Tags"]) is tuple
+    with pytest.raises(TypeError):
+        frozen["Type"] = "other"
+    assert thaw(frozen) == BUCKET
+    assert freeze(frozen) is frozen
+
+
+def test_add_returns_a_new_template():
+    base = Template(description="base")
+    extended = base.add({"Resources": {"Bucket": BUCKET}})
+    assert base.render() == {
+        "AWSTemplateFormatVersion": "2010-09-09",
+        "Description": "base",
+    }
+    assert extended.render()["Resources"] == {"Bucket": BUCKET}
+
+
+def test_sections_render_in_template_order():
+    template = compose(
+        {"Outputs": {"Name": {"Value": "x"}}},
+        {"Resources": {"Bucket": BUCKET}},
+        {"Parameters": {"Env": {"Type": "String"}}},
+    )
+    assert list(template.render()) == [
+        "AWSTemplateFormatVersion",
+        "Parameters",
+        "Resources",
+        "Outputs",
+    ]
+
+
+def test_collisions():
+    template = compose({"Resources": {"Bucket": BUCKET}})
+    # The same body, frozen or not, is not a collision
+    template.add({"Resources": {"Bucket": freeze(BUCKET)}})
+    with pytest.raises(TemplateCollisionError):
+        template.add({"Resources": {"Bucket": {"Type": "AWS::SNS::Topic"}}})
+    replaced = template.add(
+        {"Resources": {"Bucket": {"Type": "AWS::SNS::Topic"}}}, replace=True
+    )
+    assert replaced.render()["Resources"]["Bucket"]["Type"] == "AWS::SNS::Topic"
+
+
+def test_unknown_sections_are_rejected():
+    with pytest.raises(ValueError):
+        Template().add({"Resource": {}})
+
+
+def test_rendering_never_mutates_shared_fragments():
+    shared = freeze({"Resources": {"Bucket": BUCKET}})
+    rendered = Template().add(shared).render()
+    rendered["Resources"]["Bucket"]["Properties"]["Tags"].append({"Key": "b"})
+    assert thaw(shared)["Resources"]["Bucket"] == BUCKET
+    assert Template().add(shared).render()["Resources"]["Bucket"] == BUCKET
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrazeus.aws import throttle
+from infrazeus.aws.throttle import (
+    TokenBucket,
+    call_with_retries,
+    is_throttling_error,
+    throttled_client,
+)
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "PutParameter")
+
+
+class Flaky:
+    def __init__(self, errors: list[str]):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise client_error(self.errors.pop(0))
+        return kwargs
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(throttle.time, "sleep", lambda seconds: None)
+
+
+def test_token_bucket_rejects_non_positive_rates():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_token_bucket_allows_the_burst_then_waits(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+    monkeypatch.setattr(throttle.time, "monotonic", lambda: clock[0])
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(throttle.time, "sleep", sleep)
+    bucket = TokenBucket(rate=2, burst=2)
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two calls from the burst, then one every 1 / rate seconds
+    assert sleeps == pytest.approx([0.5, 0.5])
+
+
+def test_is_throttling_error():
+    assert is_throttling_error(client_error("ThrottlingException"))
+    assert not is_throttling_error(client_error("AccessDeniedException"))
+    assert not is_throttling_error(RuntimeError("Throttling"))
+
+
+def test_call_with_retries_counts_the_attempts():
+    func = Flaky(["ThrottlingException", "TooManyUpdates"])
+    result, attempts = call_with_retries(func, limiter=TokenBucket(rate=1000), a=1)
+    assert result == {"a": 1}
+    assert attempts == func.calls == 3
+
+
+def test_call_with_retries_raises_other_errors_right_away():
+    func = Flaky(["AccessDeniedException"])
+    with pytest.raises(ClientError):
+        call_with_retries(func)
+    assert func.calls == 1
+
+
+def test_call_with_retries_gives_up_after_max_attempts():
+    func = Flaky(["ThrottlingException"] * 10)
+    with pytest.raises(ClientError):
+        call_with_retries(func, max_attempts=3)
+    assert func.calls == 3
+
+
+def test_throttled_client_disables_botocore_retries(aws):
+    client = throttled_client("ssm")
+    assert client.meta.config.retries["total_max_attempts"] == 1
+    assert client is throttled_client("ssm")
+
+
+def test_parameter_writes_report_one_attempt_per_call(aws, service):
+    from infrazeus.aws.clients import client_stats
+    from infrazeus.parameters.create import create_parameters
+
+    report = create_parameters(service, {"A": "1", "B": "2"}, tps=1000)
+
+    assert [result.attempts for result in report.results] == [1, 1]
+    assert client_stats()["api_calls"]["ssm:PutParameter"] == 2
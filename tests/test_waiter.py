@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone
+
+from infrazeus.aws import waiter
+from infrazeus.aws.clients import get_client
+from infrazeus.aws.waiter import StackWatch, latest_event_id, wait_for_stacks
+
+TEMPLATE = '{"Resources": {"Topic": {"Type": "AWS::SNS::Topic"}}}'
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+def event(event_id: str, logical_id: str, status: str, seconds: int = 0, **extra):
+    return {
+        "EventId": event_id,
+        "LogicalResourceId": logical_id,
+        "ResourceType": (
+            "AWS::CloudFormation::Stack" if logical_id == "app" else "AWS::SNS::Topic"
+        ),
+        "ResourceStatus": status,
+        "Timestamp": START + timedelta(seconds=seconds),
+        **extra,
+    }
+
+
+def test_waits_for_a_created_stack(aws):
+    stack_id = get_client("cloudformation").create_stack(
+        StackName="app", TemplateBody=TEMPLATE
+    )["StackId"]
+    seen = []
+
+    [result] = wait_for_stacks(
+        [StackWatch(stack_id)], on_event=lambda name, e: seen.append(name)
+    )
+    assert result.succeeded
+    assert result.status == "CREATE_COMPLETE"
+    assert result.stack_name == "app"
+    assert seen and set(seen) == {"app"}
+
+
+def test_only_reads_events_after_the_last_one_seen(aws):
+    client = get_client("cloudformation")
+    client.create_stack(StackName="app", TemplateBody=TEMPLATE)
+    watch = StackWatch("app", last_event_id=latest_event_id("app"))
+    assert watch.poll() == []
+    assert watch.result is None
+
+
+def test_fails_fast_on_the_first_failed_resource(monkeypatch):
+    # Newest first, as describe_stack_events returns them
+    events = [
+        event("4", "app", "ROLLBACK_IN_PROGRESS", 3),
+        event("3", "Topic", "CREATE_FAILED", 2, ResourceStatusReason="denied"),
+        event("2", "Topic", "CREATE_IN_PROGRESS", 1),
+        event("1", "app", "CREATE_IN_PROGRESS", 0),
+    ]
+    monkeypatch.setattr(StackWatch, "_events_since_last", lambda self: iter(events))
+
+    watch = StackWatch("app")
+    watch.poll()
+    assert not watch.result.succeeded
+    assert watch.result.failed_resource == "Topic"
+    assert watch.result.reason == "denied"
+    assert watch.resources["Topic"].seconds == 1
+    assert watch.last_event_id == "4"
+
+
+def test_quiet_polls_back_off(monkeypatch):
+    monkeypatch.setattr(StackWatch, "_events_since_last", lambda self: iter([]))
+    watch = StackWatch("app")
+    watch.poll()
+    watch.poll()
+    assert watch.delay == waiter.MIN_POLL_DELAY * waiter.BACKOFF**2
+
+
+def test_times_out(monkeypatch):
+    monkeypatch.setattr(StackWatch, "_events_since_last", lambda self: iter([]))
+    [result] = wait_for_stacks([StackWatch("app")], timeout=0)
+    assert result.status == "TIMED_OUT"
+    assert not result.succeeded